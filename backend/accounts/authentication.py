@@ -0,0 +1,177 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from accounts.tokens import RefreshToken, ais_blacklisted, is_blacklisted
+
+# Seconds a resolved user is reused from the shared cache / this process.
+JWT_USER_CACHE_TTL = getattr(settings, "JWT_USER_CACHE_TTL", 60)
+JWT_USER_LOCAL_TTL = getattr(settings, "JWT_USER_LOCAL_TTL", 5)
+# Trust the token's claims and never load the user (no revocation until expiry).
+JWT_AUTH_STATELESS = getattr(settings, "JWT_AUTH_STATELESS", False)
+# Reject access tokens revoked on logout. Costs a blacklist lookup per
+# request, and requests fail with 503 while the blacklist store is down.
+JWT_CHECK_ACCESS_BLACKLIST = getattr(settings, "JWT_CHECK_ACCESS_BLACKLIST", False)
+
+USER_CACHE_KEY_PREFIX = "jwt_user"
+# Loaded on cache hits; everything else is deferred. The password hash is
+# never cached, only its md5 for CHECK_REVOKE_TOKEN.
+CACHED_USER_FIELDS = ("id", "email", "name", "is_active", "is_staff", "is_superuser")
+# Copied into every token so the stateless mode has something to trust.
+USER_CLAIMS = ("email", "name", "is_staff", "is_superuser")
+
+_local_users = {}
+_LOCAL_MAX_USERS = 10_000
+
+
+def tokens_for_user(user):
+    """
+    RefreshToken for `user` carrying USER_CLAIMS; access tokens minted from
+    it (including after rotation) inherit them.
+    """
+    refresh = RefreshToken.for_user(user)
+    for claim in USER_CLAIMS:
+        refresh[claim] = getattr(user, claim)
+    return refresh
+
+
+def user_cache_key(user_id):
+    return f"{USER_CACHE_KEY_PREFIX}:{user_id}"
+
+
+def forget_user(user_id):
+    """
+    Drop a user from the shared cache and this process. Other processes
+    keep their copy for at most JWT_USER_LOCAL_TTL seconds.
+    """
+    _local_users.pop(str(user_id), None)
+    cache.delete(user_cache_key(user_id))
+
+
+def _cache_entry(user):
+    entry = {field: getattr(user, field) for field in CACHED_USER_FIELDS}
+    entry["revoke"] = get_md5_hash_password(user.password)
+    return entry
+
+
+def _remember_locally(user_id, entry):
+    if len(_local_users) >= _LOCAL_MAX_USERS:
+        _local_users.clear()
+    _local_users[str(user_id)] = (time.monotonic() + JWT_USER_LOCAL_TTL, entry)
+
+
+def _local_entry(user_id):
+    cached = _local_users.get(str(user_id))
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+    return None
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that resolves the token's user from a short-lived
+    per-process copy, then the shared cache, and only then the database.
+    Entries are dropped on User save/delete (accounts.signals).
+
+    With JWT_AUTH_STATELESS the user is built from the token's claims and
+    no lookup happens at all.
+
+    With JWT_CHECK_ACCESS_BLACKLIST, access tokens revoked on logout are
+    rejected on every request; the blacklist lookup is never cached and
+    fails closed (accounts.tokens).
+    """
+
+    def get_validated_token(self, raw_token):
+        validated_token = super().get_validated_token(raw_token)
+        if JWT_CHECK_ACCESS_BLACKLIST:
+            self.check_blacklist(is_blacklisted(validated_token[api_settings.JTI_CLAIM]))
+        return validated_token
+
+    @staticmethod
+    def check_blacklist(blacklisted):
+        if blacklisted:
+            raise InvalidToken(_("Token is blacklisted"))
+
+    def get_user(self, validated_token):
+        if JWT_AUTH_STATELESS:
+            return self.get_token_user(validated_token)
+
+        user_id = self.get_user_id(validated_token)
+        entry = _local_entry(user_id) or cache.get(user_cache_key(user_id))
+        if entry is None:
+            try:
+                user = self.user_model.objects.get(**{api_settings.USER_ID_FIELD: user_id})
+            except self.user_model.DoesNotExist as e:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+            entry = _cache_entry(user)
+            cache.set(user_cache_key(user_id), entry, JWT_USER_CACHE_TTL)
+        _remember_locally(user_id, entry)
+        return self.check_user(entry, validated_token)
+
+    def get_token_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+        return api_settings.TOKEN_USER_CLASS(validated_token)
+
+    @staticmethod
+    def get_user_id(validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+    def check_user(self, entry, validated_token):
+        if api_settings.CHECK_USER_IS_ACTIVE and not entry["is_active"]:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != entry["revoke"]:
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        # from_db() expects values in concrete field order.
+        fields = [f.attname for f in self.user_model._meta.concrete_fields if f.attname in CACHED_USER_FIELDS]
+        return self.user_model.from_db(DEFAULT_DB_ALIAS, fields, [entry[field] for field in fields])
+
+
+class AsyncJWTAuthentication(CachedJWTAuthentication):
+    """
+    CachedJWTAuthentication for async views: the token is validated in
+    process and the user is resolved with the async cache and ORM.
+    """
+
+    async def aauthenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = JWTAuthentication.get_validated_token(self, raw_token)
+        if JWT_CHECK_ACCESS_BLACKLIST:
+            self.check_blacklist(await ais_blacklisted(validated_token[api_settings.JTI_CLAIM]))
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        if JWT_AUTH_STATELESS:
+            return self.get_token_user(validated_token)
+
+        user_id = self.get_user_id(validated_token)
+        entry = _local_entry(user_id) or await cache.aget(user_cache_key(user_id))
+        if entry is None:
+            try:
+                user = await self.user_model.objects.aget(**{api_settings.USER_ID_FIELD: user_id})
+            except self.user_model.DoesNotExist as e:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+            entry = _cache_entry(user)
+            await cache.aset(user_cache_key(user_id), entry, JWT_USER_CACHE_TTL)
+        _remember_locally(user_id, entry)
+        return self.check_user(entry, validated_token)
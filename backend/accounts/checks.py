@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+from accounts.tokens import TOKEN_BLACKLIST_CACHE
+
+
+@register(Tags.caches, Tags.security)
+def check_token_blacklist_cache(app_configs, **kwargs):
+    """
+    The revoked-token store must fail loudly and be safe from clearing the
+    default cache; otherwise revoked tokens come back.
+    """
+    config = settings.CACHES.get(TOKEN_BLACKLIST_CACHE)
+    if config is None:
+        return [Error(
+            f"CACHES has no '{TOKEN_BLACKLIST_CACHE}' alias for the token blacklist.",
+            id="accounts.E001",
+        )]
+    errors = []
+    if config.get("OPTIONS", {}).get("IGNORE_EXCEPTIONS"):
+        errors.append(Error(
+            f"CACHES['{TOKEN_BLACKLIST_CACHE}'] must not set IGNORE_EXCEPTIONS: "
+            "an unreachable blacklist would let revoked tokens through.",
+            id="accounts.E002",
+        ))
+    for alias, other in settings.CACHES.items():
+        if alias != TOKEN_BLACKLIST_CACHE and other.get("LOCATION") == config.get("LOCATION") \
+                and other.get("BACKEND") == config.get("BACKEND"):
+            errors.append(Error(
+                f"CACHES['{TOKEN_BLACKLIST_CACHE}'] shares its LOCATION with '{alias}': "
+                "clearing that cache would wipe the token blacklist.",
+                id="accounts.E003",
+            ))
+    return errors
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from accounts.tokens import blacklist_jti
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy unexpired rows of the simplejwt token_blacklist tables into the cache "
+        "blacklist (accounts.tokens). Run once after deploying; --prune then empties "
+        "the tables, which nothing writes to any more."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--prune", action="store_true", help="Delete all outstanding/blacklisted token rows afterwards.")
+
+    def handle(self, *args, **options):
+        rows = (
+            BlacklistedToken.objects.filter(token__expires_at__gt=timezone.now())
+            .values_list("token__jti", "token__expires_at")
+            .iterator(chunk_size=2000)
+        )
+        copied = sum(blacklist_jti(jti, expires_at.timestamp()) for jti, expires_at in rows)
+        self.stdout.write(f"Blacklisted {copied} unexpired token(s) in the cache.")
+
+        if options["prune"]:
+            with transaction.atomic():
+                blacklisted, _ = BlacklistedToken.objects.all().delete()
+                outstanding, _ = OutstandingToken.objects.all().delete()
+            self.stdout.write(f"Deleted {blacklisted} blacklisted and {outstanding} outstanding token row(s).")
@@ -1,6 +1,8 @@
 from rest_framework import serializers
 from accounts.models import User
 from django.contrib.auth import authenticate
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer as BaseTokenRefreshSerializer
+from accounts.tokens import RefreshToken
 
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
@@ -22,3 +24,9 @@ class LoginSerializer(serializers.Serializer):
         if not user.is_superuser:
             raise serializers.ValidationError("You are not authorized to log in")
         return user
+
+
+class TokenRefreshSerializer(BaseTokenRefreshSerializer):
+    # Rotation blacklists the old token in the cache instead of the
+    # token_blacklist tables.
+    token_class = RefreshToken
@@ -0,0 +1,16 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from accounts.authentication import forget_user
+from accounts.models import User
+
+
+@receiver(post_save, sender=User, dispatch_uid='forget_cached_jwt_user_on_save')
+@receiver(post_delete, sender=User, dispatch_uid='forget_cached_jwt_user_on_delete')
+def forget_cached_jwt_user(sender, instance, **kwargs):
+    """
+    Drop the cached copy CachedJWTAuthentication resolves tokens to, so
+    deactivation and password changes apply on the next request.
+    QuerySet.update() sends no signal; call forget_user() after one.
+    """
+    forget_user(instance.pk)
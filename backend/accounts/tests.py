@@ -1,3 +1,205 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.core.management.base import SystemCheckError
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from accounts import authentication
+from accounts.authentication import AsyncJWTAuthentication, CachedJWTAuthentication, tokens_for_user
+from accounts.models import User
+from accounts.tokens import TOKEN_BLACKLIST_CACHE
+from projects.tests import LOCMEM_CACHES
+from projects.utils.cache_utils import clear_all_cache
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class TokenBlacklistTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        caches[TOKEN_BLACKLIST_CACHE].clear()
+        User.objects.create_superuser('admin@example.com', 'admin', 'password')
+        self.client = APIClient()
+        self.tokens = self.login()
+
+    def login(self):
+        response = self.client.post(
+            '/api/auth/login/', {'email': 'admin@example.com', 'password': 'password'}, format='json'
+        )
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    def refresh(self, token):
+        return self.client.post('/api/auth/token/refresh/', {'refresh': token}, format='json')
+
+    def get_projects(self, access, url='/api/project/projects/'):
+        return self.client.get(url, HTTP_AUTHORIZATION=f'Bearer {access}')
+
+    def test_rotation_blacklists_the_old_refresh_token(self):
+        response = self.refresh(self.tokens['refresh'])
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertNotEqual(response.data['refresh'], self.tokens['refresh'])
+
+        self.assertEqual(self.refresh(self.tokens['refresh']).status_code, 401)
+        self.assertEqual(self.refresh(response.data['refresh']).status_code, 200)
+
+    def test_logout_revokes_refresh_and_access_tokens(self):
+        access = self.tokens['access']
+        self.assertEqual(self.get_projects(access).status_code, 200)
+
+        response = self.client.post(
+            '/api/auth/logout/', {'refresh': self.tokens['refresh']},
+            format='json', HTTP_AUTHORIZATION=f'Bearer {access}',
+        )
+        self.assertEqual(response.status_code, 205)
+        self.assertEqual(self.refresh(self.tokens['refresh']).status_code, 401)
+        # Access tokens run until they expire unless they are checked.
+        self.assertEqual(self.get_projects(access).status_code, 200)
+        with mock.patch('accounts.authentication.JWT_CHECK_ACCESS_BLACKLIST', True):
+            self.assertEqual(self.get_projects(access).status_code, 401)
+            self.assertEqual(self.get_projects(access, '/api/project/async/projects/').status_code, 401)
+            # Other sessions are unaffected.
+            self.assertEqual(self.get_projects(self.login()['access']).status_code, 200)
+
+    def test_logout_with_invalid_token(self):
+        response = self.client.post(
+            '/api/auth/logout/', {'refresh': 'garbage'},
+            format='json', HTTP_AUTHORIZATION=f"Bearer {self.tokens['access']}",
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_clear_all_cache_keeps_revocations(self):
+        self.refresh(self.tokens['refresh'])
+        clear_all_cache()
+        self.assertEqual(self.refresh(self.tokens['refresh']).status_code, 401)
+
+    def test_unreachable_store_fails_closed(self):
+        store = caches[TOKEN_BLACKLIST_CACHE]
+        with mock.patch.object(store, 'get', side_effect=ConnectionError), \
+                mock.patch.object(store, 'aget', side_effect=ConnectionError):
+            self.assertEqual(self.refresh(self.tokens['refresh']).status_code, 503)
+            # Reads don't depend on the blacklist store by default.
+            self.assertEqual(self.get_projects(self.tokens['access']).status_code, 200)
+            with mock.patch('accounts.authentication.JWT_CHECK_ACCESS_BLACKLIST', True):
+                self.assertEqual(self.get_projects(self.tokens['access']).status_code, 503)
+                self.assertEqual(
+                    self.get_projects(self.tokens['access'], '/api/project/async/projects/').status_code, 503
+                )
+        with mock.patch.object(store, 'set', side_effect=ConnectionError):
+            response = self.client.post(
+                '/api/auth/logout/', {'refresh': self.tokens['refresh']},
+                format='json', HTTP_AUTHORIZATION=f"Bearer {self.tokens['access']}",
+            )
+        self.assertEqual(response.status_code, 503)
+
+
+class TokenBlacklistCheckTests(TestCase):
+    def check_ids(self, caches_setting):
+        with override_settings(CACHES=caches_setting):
+            try:
+                call_command('check', tags=['caches'], stdout=mock.Mock(), stderr=mock.Mock())
+            except SystemCheckError as e:
+                return str(e)
+        return ''
+
+    def test_dedicated_store_passes(self):
+        self.assertEqual(self.check_ids(LOCMEM_CACHES), '')
+
+    def test_unsafe_stores_are_errors(self):
+        default = LOCMEM_CACHES['default']
+        self.assertIn('accounts.E001', self.check_ids({'default': default}))
+        self.assertIn('accounts.E002', self.check_ids({
+            'default': default,
+            TOKEN_BLACKLIST_CACHE: {**LOCMEM_CACHES[TOKEN_BLACKLIST_CACHE], 'OPTIONS': {'IGNORE_EXCEPTIONS': True}},
+        }))
+        self.assertIn('accounts.E003', self.check_ids({'default': default, TOKEN_BLACKLIST_CACHE: default}))
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class CachedUserTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        authentication._local_users.clear()
+        self.addCleanup(authentication._local_users.clear)
+        self.user = User.objects.create_user('dev@example.com', 'Dev', 'password')
+
+    def authenticate(self, user=None, authenticator=CachedJWTAuthentication):
+        access = tokens_for_user(user or self.user).access_token
+        request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {access}')
+        return authenticator().authenticate(request)[0]
+
+    def test_user_is_loaded_once(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.authenticate().name, 'Dev')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.authenticate().pk, self.user.pk)
+        # Another process has no local copy but shares the cache.
+        authentication._local_users.clear()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.authenticate().email, 'dev@example.com')
+
+    def test_async_lookup_shares_the_cache(self):
+        access = tokens_for_user(self.user).access_token
+        request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {access}')
+        self.authenticate()
+        with self.assertNumQueries(0):
+            user, _ = async_to_sync(AsyncJWTAuthentication().aauthenticate)(request)
+        self.assertEqual(user.pk, self.user.pk)
+
+    def test_save_invalidates(self):
+        self.authenticate()
+        self.user.name = 'Renamed'
+        self.user.save()
+        with self.assertNumQueries(1):
+            self.assertEqual(self.authenticate().name, 'Renamed')
+
+    def test_update_needs_forget_user(self):
+        self.authenticate()
+        User.objects.filter(pk=self.user.pk).update(name='Renamed')
+        self.assertEqual(self.authenticate().name, 'Dev')
+        authentication.forget_user(self.user.pk)
+        self.assertEqual(self.authenticate().name, 'Renamed')
+
+    def test_deactivation_applies_on_the_next_request(self):
+        access = tokens_for_user(self.user).access_token
+        request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {access}')
+        CachedJWTAuthentication().authenticate(request)
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed) as cm:
+            CachedJWTAuthentication().authenticate(request)
+        self.assertEqual(cm.exception.detail['code'], 'user_inactive')
+
+    @mock.patch.object(api_settings, 'CHECK_REVOKE_TOKEN', True)
+    def test_password_change_applies_on_the_next_request(self):
+        access = tokens_for_user(self.user).access_token
+        request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {access}')
+        CachedJWTAuthentication().authenticate(request)
+        self.user.set_password('changed')
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed) as cm:
+            CachedJWTAuthentication().authenticate(request)
+        self.assertEqual(cm.exception.detail['code'], 'password_changed')
+        # Tokens issued after the change carry the new hash.
+        self.assertEqual(self.authenticate().pk, self.user.pk)
+
+    @mock.patch('accounts.authentication.JWT_AUTH_STATELESS', True)
+    def test_stateless_mode_trusts_the_claims(self):
+        with self.assertNumQueries(0):
+            user = self.authenticate()
+        self.assertIsInstance(user, TokenUser)
+        self.assertEqual((user.id, user.email, user.name), (str(self.user.pk), 'dev@example.com', 'Dev'))
+        self.assertIsNone(cache.get(authentication.user_cache_key(self.user.pk)))
+
+        # Deactivation waits for the token to expire.
+        access = tokens_for_user(self.user).access_token
+        self.user.is_active = False
+        self.user.save()
+        request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {access}')
+        with self.assertNumQueries(0):
+            self.assertTrue(CachedJWTAuthentication().authenticate(request)[0].is_authenticated)
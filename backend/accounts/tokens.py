@@ -0,0 +1,116 @@
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken, Token
+
+BLACKLIST_KEY_PREFIX = "jwt_blacklist"
+# Cache alias holding revoked jtis. It must not ignore exceptions, evict
+# keys or share a Redis database with the default cache (accounts.checks).
+TOKEN_BLACKLIST_CACHE = getattr(settings, "TOKEN_BLACKLIST_CACHE", "token_blacklist")
+
+
+class BlacklistUnavailable(APIException):
+    """
+    The blacklist store could not be reached. Token checks fail closed:
+    the request is refused rather than a possibly revoked token accepted.
+    """
+
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = _("Token blacklist is unavailable, try again later.")
+    default_code = "blacklist_unavailable"
+
+
+def blacklist_cache():
+    return caches[TOKEN_BLACKLIST_CACHE]
+
+
+def blacklist_key(jti):
+    return f"{BLACKLIST_KEY_PREFIX}:{jti}"
+
+
+def blacklist_jti(jti, exp):
+    """
+    Blacklist `jti` until `exp` (epoch seconds), after which the token is
+    rejected as expired anyway and the key expires with it. Returns False
+    for tokens that have already expired.
+    """
+    ttl = int(exp - datetime.now(timezone.utc).timestamp()) + 1
+    if ttl <= 0:
+        return False
+    try:
+        blacklist_cache().set(blacklist_key(jti), True, ttl)
+    except Exception as e:
+        raise BlacklistUnavailable() from e
+    return True
+
+
+def blacklist_token(token):
+    return blacklist_jti(token[api_settings.JTI_CLAIM], token["exp"])
+
+
+def is_blacklisted(jti):
+    try:
+        return blacklist_cache().get(blacklist_key(jti)) is not None
+    except Exception as e:
+        raise BlacklistUnavailable() from e
+
+
+async def ais_blacklisted(jti):
+    try:
+        return await blacklist_cache().aget(blacklist_key(jti)) is not None
+    except Exception as e:
+        raise BlacklistUnavailable() from e
+
+
+class CacheBlacklistMixin:
+    """
+    Same API as simplejwt's BlacklistMixin, but the blacklist is one cache
+    key per jti with a TTL of the token's remaining lifetime. Nothing is
+    written when tokens are issued, so there is no outstanding token table
+    to prune.
+    """
+
+    def verify(self, *args, **kwargs):
+        self.check_blacklist()
+        super().verify(*args, **kwargs)
+
+    def check_blacklist(self):
+        if is_blacklisted(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        return blacklist_token(self.payload)
+
+    def outstand(self):
+        # Outstanding tokens are not tracked.
+        return None
+
+
+class RefreshToken(CacheBlacklistMixin, Token):
+    """
+    Drop-in for rest_framework_simplejwt.tokens.RefreshToken without the
+    OutstandingToken/BlacklistedToken tables.
+    """
+
+    token_type = "refresh"
+    lifetime = api_settings.REFRESH_TOKEN_LIFETIME
+    no_copy_claims = (api_settings.TOKEN_TYPE_CLAIM, "exp", api_settings.JTI_CLAIM, "jti", "iat")
+    access_token_class = AccessToken
+
+    @property
+    def access_token(self):
+        """
+        Access token sharing this token's claims and start time.
+        """
+        access = self.access_token_class()
+        access.set_exp(from_time=self.current_time)
+        for claim, value in self.payload.items():
+            if claim not in self.no_copy_claims:
+                access[claim] = value
+        return access
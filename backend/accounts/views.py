@@ -1,8 +1,10 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.exceptions import TokenError
+from accounts.authentication import tokens_for_user
 from accounts.serializers import LoginSerializer, UserSerializer
+from accounts.tokens import RefreshToken, blacklist_token
 
 
 class LoginView(APIView):
@@ -13,7 +15,7 @@ class LoginView(APIView):
         serializer.is_valid(raise_exception=True)
         user = serializer.validated_data
 
-        refresh = RefreshToken.for_user(user)
+        refresh = tokens_for_user(user)
         return Response({
             "access": str(refresh.access_token),
             "refresh": str(refresh),
@@ -24,9 +26,13 @@ class LoginView(APIView):
 class LogoutView(APIView):
     def post(self, request):
         try:
-            refresh_token = request.data["refresh"]
-            token = RefreshToken(refresh_token)
-            token.blacklist()
-            return Response({"message": "Logged out successfully"}, status=status.HTTP_205_RESET_CONTENT)
-        except Exception:
+            token = RefreshToken(request.data["refresh"])
+        except (KeyError, TokenError):
             return Response({"error": "Invalid token"}, status=status.HTTP_400_BAD_REQUEST)
+        # BlacklistUnavailable (503) propagates: logging out must not report
+        # success when the tokens stay valid.
+        token.blacklist()
+        # The access token used for this request is revoked as well.
+        if request.auth is not None:
+            blacklist_token(request.auth)
+        return Response({"message": "Logged out successfully"}, status=status.HTTP_205_RESET_CONTENT)
@@ -52,6 +52,8 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'rest_framework',
     'rest_framework_simplejwt',
+    # Only read by `manage.py migrate_token_blacklist`; the blacklist now
+    # lives in the cache (accounts.tokens).
     'rest_framework_simplejwt.token_blacklist',
     'corsheaders',
     'projects',
@@ -59,6 +61,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'projects.middleware.PerformanceMiddleware',
+    'projects.middleware.ReplicaRoutingMiddleware',
+    'projects.middleware.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware', 
@@ -92,13 +97,63 @@ WSGI_APPLICATION = 'backend.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# SQLite profiles. "tuned" (projects.sqlite_backend) is for several
+# gunicorn/celery writers: WAL so reads never wait for writes, fsync only
+# at checkpoints, a larger page cache and mmap, a 20s busy timeout,
+# BEGIN IMMEDIATE so writers wait instead of deadlocking on lock upgrades,
+# persistent connections, and write transactions queued per process.
+# "stock" is Django's default setup and the default here; deployments opt
+# in with SQLITE_PROFILE=tuned (see docker-compose.yml).
+SQLITE_PROFILES = {
+    'stock': {
+        'ENGINE': 'django.db.backends.sqlite3',
+    },
+    'tuned': {
+        'ENGINE': 'projects.sqlite_backend',
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'transaction_mode': 'IMMEDIATE',
+            'pragmas': {
+                'journal_mode': 'WAL',
+                'synchronous': 'NORMAL',
+                'busy_timeout': 20000,
+                'cache_size': -65536,
+                'mmap_size': 268435456,
+                'temp_store': 'MEMORY',
+            },
+            'serialize_writes': True,
+        },
+    },
+}
+SQLITE_PROFILE = os.environ.get('SQLITE_PROFILE', 'stock')
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        **SQLITE_PROFILES[SQLITE_PROFILE],
         'NAME': BASE_DIR / 'db.sqlite3',
     }
 }
 
+# Read replicas (projects.db_router): aliases in DATABASES that views with
+# ReplicaReadMixin read from. To try it with two SQLite files, snapshot the
+# primary with `sqlite3 db.sqlite3 ".backup db_replica.sqlite3"` and set
+# SQLITE_REPLICA=db_replica.sqlite3.
+DATABASE_ROUTERS = ['projects.db_router.ReplicaRouter']
+REPLICA_DATABASES = []
+if os.environ.get('SQLITE_REPLICA'):
+    DATABASES['replica'] = {
+        **SQLITE_PROFILES[SQLITE_PROFILE],
+        'NAME': BASE_DIR / os.environ['SQLITE_REPLICA'],
+        'TEST': {'MIRROR': 'default'},
+    }
+    REPLICA_DATABASES = ['replica']
+# Replicas further behind than this (seconds) are skipped, and a user's
+# reads stay on the primary this long after they write.
+REPLICA_MAX_LAG = 5
+REPLICA_PIN_SECONDS = REPLICA_MAX_LAG
+REPLICA_HEALTH_CHECK_INTERVAL = 10
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -144,11 +199,16 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    # orjson-backed, same output as rest_framework.renderers.JSONRenderer.
+    'DEFAULT_RENDERER_CLASSES': (
+        'projects.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
 
 }
 
@@ -161,8 +221,22 @@ SIMPLE_JWT = {
     'ALGORITHM': 'HS256',
     'SIGNING_KEY': SECRET_KEY,
     'AUTH_HEADER_TYPES': ('Bearer',),
+    # Blacklists rotated refresh tokens in the cache (accounts.tokens).
+    'TOKEN_REFRESH_SERIALIZER': 'accounts.serializers.TokenRefreshSerializer',
 }
 
+# accounts.authentication.CachedJWTAuthentication: seconds a token's user is
+# reused from the shared cache and from process memory. With the stateless
+# mode on, users come from token claims only and deactivation or password
+# changes take effect when the access token expires.
+JWT_USER_CACHE_TTL = 60
+JWT_USER_LOCAL_TTL = 5
+JWT_AUTH_STATELESS = False
+# Check every access token against the token blacklist, so logout revokes
+# it at once instead of at expiry. Off by default: the check puts the
+# blacklist Redis on every request's path, and it fails closed (503).
+JWT_CHECK_ACCESS_BLACKLIST = False
+
 
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = 'smtp.gmail.com'
@@ -181,10 +255,43 @@ CACHES = {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
             "IGNORE_EXCEPTIONS": True,  
         }
-    }
+    },
+    # Revoked JWTs (accounts.tokens). A separate Redis server configured with
+    # `maxmemory-policy noeviction` and persistence, so revocations are never
+    # evicted or cleared with the default cache. Errors are not ignored:
+    # when it is unreachable, token checks fail closed (accounts.checks).
+    "token_blacklist": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": os.environ.get("TOKEN_BLACKLIST_REDIS_URL", "redis://127.0.0.1:6380/0"),
+        "OPTIONS": {
+            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            "SOCKET_CONNECT_TIMEOUT": 1,
+            "SOCKET_TIMEOUT": 1,
+        }
+    },
 }
 
 CACHE_TTL = 60 * 5 
+# Per-object list fragments (projects.utils.fragment_cache). Keys carry the
+# object's updated_at, so this only bounds how long old versions linger.
+FRAGMENT_CACHE_TTL = 60 * 60
+
+# projects.middleware.CompressionMiddleware: JSON/NDJSON/CSV bodies from this
+# size up are sent brotli- (if the `brotli` package is installed) or
+# gzip-encoded, per Accept-Encoding. Streaming exports always are.
+COMPRESSION_MIN_SIZE = 1024
+COMPRESSION_BROTLI_QUALITY = 5
+
+# Backend for the `?search=` query parameter. Use
+# projects.search.PostgresSearchBackend on Postgres, or
+# projects.search.IContainsSearchBackend to search without an index.
+SEARCH_BACKEND = 'projects.search.SQLiteFTS5SearchBackend'
+
+# Share of requests that get Server-Timing headers and a performance log
+# line (projects.middleware.PerformanceMiddleware); 0 turns it off. Set
+# PERF_SAMPLE_RATE=1 in the environment to instrument every request.
+PERF_SAMPLE_RATE = float(os.environ.get('PERF_SAMPLE_RATE', 0.05))
+PERF_N_PLUS_ONE_THRESHOLD = 5
 
 
 # Use Redis as the broker and backend
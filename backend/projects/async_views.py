@@ -0,0 +1,235 @@
+"""
+Native async versions of the read-only list and dashboard endpoints, for
+ASGI deployments. Under ASGI every sync APIView pays a thread hop and
+competes for the sync thread; these views authenticate, read the cache and
+query with the async ORM (acount/aaggregate/aiterator/aget) so one worker
+can keep many slow clients in flight.
+
+They reuse the sync views' search/filter/ordering, sparse fieldsets,
+cache tags and ETags, and return the same JSON. Only page-number
+pagination is supported; `?cursor=` is a 400.
+"""
+import logging
+from datetime import date
+
+from django.http import Http404, HttpResponse
+from django.views import View
+from rest_framework import status
+from rest_framework.exceptions import APIException, MethodNotAllowed, NotAuthenticated, NotFound, ParseError
+from rest_framework.request import Request
+
+from accounts.authentication import AsyncJWTAuthentication
+from projects import views
+from projects.mixins import AsyncPageNumberPagination, ConditionalGetMixin, ReplicaReadMixin, SearchFilterOrderingMixin
+from projects.models import Project, Contributor, Task
+from projects.renderers import FastJSONRenderer
+from projects.serializers import (
+    ContributorSerializer, FragmentCacheMixin, ProjectSerializer, SparseFieldsetMixin, TaskSerializer,
+)
+from projects.utils.cache_utils import CACHE_TTL, agenerate_cache_key, aget_or_compute_single_flight
+from projects.utils.counters import annotate_progress
+from projects.utils.dashboard import aget_dashboard_summary
+from projects.utils.fragment_cache import aserialize_page, version_queryset
+from projects.utils.metrics import timer
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncAPIView(View):
+    """
+    Minimal async counterpart of APIView: JWT authentication (required),
+    JSON rendering and APIException handling.
+    """
+
+    http_method_names = ['get', 'head', 'options']
+    authentication_class = AsyncJWTAuthentication
+    renderer_class = FastJSONRenderer
+
+    async def dispatch(self, request, *args, **kwargs):
+        request = Request(request)
+        request.accepted_renderer = self.renderer_class()
+        request.accepted_media_type = self.renderer_class.media_type
+        self.request = request
+        try:
+            await self.ainitial(request)
+            if request.method.lower() not in self.http_method_names:
+                raise MethodNotAllowed(request.method)
+            response = getattr(self, request.method.lower())(request, *args, **kwargs)
+            return await response
+        except Http404:
+            return self.handle_exception(NotFound())
+        except APIException as exc:
+            return self.handle_exception(exc)
+
+    async def ainitial(self, request):
+        await self.authenticate(request)
+
+    async def authenticate(self, request):
+        authenticator = self.authentication_class()
+        result = await authenticator.aauthenticate(request)
+        if result is None:
+            raise NotAuthenticated()
+        request.user, request.auth = result
+
+    def handle_exception(self, exc):
+        data = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+        response = self.render(data, status=exc.status_code)
+        if exc.status_code == status.HTTP_401_UNAUTHORIZED:
+            response['WWW-Authenticate'] = self.authentication_class().authenticate_header(self.request)
+        return response
+
+    def render(self, data, status=status.HTTP_200_OK):
+        renderer = self.request.accepted_renderer
+        return HttpResponse(renderer.render(data), status=status, content_type=renderer.media_type)
+
+
+class AsyncListAPIView(ReplicaReadMixin, AsyncAPIView, SearchFilterOrderingMixin, ConditionalGetMixin):
+    """
+    Page-number pagination only: `?cursor=` is refused with a 400 rather
+    than silently answered with numbered pages.
+    """
+    pagination_class = AsyncPageNumberPagination
+    serializer_class = None
+
+    async def ainitial(self, request):
+        await super().ainitial(request)
+        if self.cursor_pagination_class.cursor_query_param in request.query_params:
+            raise ParseError("Cursor pagination is not supported by the async endpoints; use `page`.")
+
+    async def get(self, request):
+        try:
+            queryset = self.get_queryset()
+            queryset = await self.aapply_search_filter_ordering(queryset, request)
+            validators = await self.aget_list_validators(queryset)
+            response = self.get_not_modified_response(request, validators)
+            if response is None:
+                response = self.render(await self.apaginate(queryset, request))
+            return self.set_validators(response, validators)
+        except Exception as e:
+            return self.render({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    async def apaginate(self, queryset, request):
+        paginator = self.pagination_class()
+        fieldset = self.get_fieldset(request)
+        if issubclass(self.serializer_class, SparseFieldsetMixin):
+            self.serializer_class.validate_fieldset(**fieldset)
+        if issubclass(self.serializer_class, FragmentCacheMixin):
+            versions = version_queryset(self.serializer_class, queryset, **fieldset)
+            result_page = await paginator.apaginate_queryset(versions, request, view=self)
+            with timer('serialize'):
+                data = await aserialize_page(self.serializer_class, result_page, queryset, **fieldset)
+            return paginator.get_paginated_response(data).data
+
+        result_page = await paginator.apaginate_queryset(queryset, request, view=self)
+        serializer = self.serializer_class(result_page, many=True, **fieldset)
+        with timer('serialize'):
+            data = serializer.data
+        return paginator.get_paginated_response(data).data
+
+
+class AsyncProjectListAPIView(AsyncListAPIView):
+    search_fields = views.ProjectListCreateAPIView.search_fields
+    filter_fields = views.ProjectListCreateAPIView.filter_fields
+    range_filter_fields = views.ProjectListCreateAPIView.range_filter_fields
+    ordering_fields = views.ProjectListCreateAPIView.ordering_fields
+    etag_tags = views.ProjectListCreateAPIView.etag_tags
+    serializer_class = ProjectSerializer
+
+    def get_queryset(self):
+        return annotate_progress(Project.objects.all())
+
+
+class AsyncContributorListAPIView(AsyncListAPIView):
+    search_fields = views.ContributorListCreateAPIView.search_fields
+    filter_fields = views.ContributorListCreateAPIView.filter_fields
+    ordering_fields = views.ContributorListCreateAPIView.ordering_fields
+    etag_tags = views.ContributorListCreateAPIView.etag_tags
+    serializer_class = ContributorSerializer
+
+    def get_queryset(self):
+        return ContributorSerializer.setup_eager_loading(
+            Contributor.objects.all(), **self.get_fieldset(self.request)
+        )
+
+
+class AsyncTaskListAPIView(AsyncListAPIView):
+    search_fields = views.TaskListCreateAPIView.search_fields
+    filter_fields = views.TaskListCreateAPIView.filter_fields
+    ordering_fields = views.TaskListCreateAPIView.ordering_fields
+    etag_tags = views.TaskListCreateAPIView.etag_tags
+    serializer_class = TaskSerializer
+
+    def get_queryset(self):
+        return TaskSerializer.setup_eager_loading(Task.objects.all(), **self.get_fieldset(self.request))
+
+
+class AsyncDueTaskListAPIView(AsyncListAPIView):
+    search_fields = views.DueTaskListAPIView.search_fields
+    filter_fields = views.DueTaskListAPIView.filter_fields
+    ordering_fields = views.DueTaskListAPIView.ordering_fields
+    etag_tags = views.DueTaskListAPIView.etag_tags
+    serializer_class = TaskSerializer
+
+    def get_queryset(self):
+        return TaskSerializer.setup_eager_loading(
+            Task.objects.filter(is_completed=False, due_date__lte=date.today()),
+            **self.get_fieldset(self.request),
+        )
+
+
+class AsyncOverDueTaskListAPIView(AsyncListAPIView):
+    """
+    Cached like OverDueTaskListAPIView, under its own keys since the
+    paginated payload embeds this endpoint's next/previous links.
+    """
+    search_fields = views.OverDueTaskListAPIView.search_fields
+    filter_fields = views.OverDueTaskListAPIView.filter_fields
+    ordering_fields = views.OverDueTaskListAPIView.ordering_fields
+    CACHE_KEY_PREFIX = f"{views.OverDueTaskListAPIView.CACHE_KEY_PREFIX}:async"
+    cache_tags = views.OverDueTaskListAPIView.cache_tags
+    etag_tags = cache_tags
+    serializer_class = TaskSerializer
+
+    def get_queryset(self):
+        return TaskSerializer.setup_eager_loading(
+            Task.objects.filter(is_overdue=True), **self.get_fieldset(self.request)
+        )
+
+    async def get(self, request):
+        try:
+            cache_key = await agenerate_cache_key(self.CACHE_KEY_PREFIX, request, self.cache_tags)
+            stale_key = await agenerate_cache_key(f"{self.CACHE_KEY_PREFIX}:stale", request)
+
+            async def compute_page():
+                queryset = self.get_queryset()
+                queryset = await self.aapply_search_filter_ordering(queryset, request)
+                return {
+                    "validators": await self.aget_list_validators(queryset),
+                    "data": await self.apaginate(queryset, request),
+                }
+
+            page, source = await aget_or_compute_single_flight(
+                cache_key, compute_page, stale_key=stale_key, timeout=CACHE_TTL
+            )
+            logger.info(f"[AsyncOverDueTaskListAPIView] ******* From {source} *******")
+            response = self.get_not_modified_response(request, page["validators"]) or self.render(page["data"])
+            return self.set_validators(response, page["validators"])
+
+        except Exception as e:
+            return self.render({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class AsyncDashboardSummaryAPIView(ReplicaReadMixin, AsyncAPIView, ConditionalGetMixin):
+    async def get(self, request):
+        try:
+            data, age, stale = await aget_dashboard_summary()
+            validators = await self.abuild_validators(None, data)
+            response = self.get_not_modified_response(request, validators) or self.render(
+                {**data, "freshness": {"age": round(age, 1), "stale": stale}}
+            )
+            response = self.set_validators(response, validators)
+            response["Age"] = str(int(age))
+            return response
+
+        except Exception as e:
+            return self.render({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
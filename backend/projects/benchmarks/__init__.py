@@ -0,0 +1,5 @@
+"""
+Reproducible API benchmarks: a seeded dataset generator (dataset.py) and a
+harness that drives every route in projects.urls cold and warm
+(harness.py). Run with `python manage.py run_benchmarks`.
+"""
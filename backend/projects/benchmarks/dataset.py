@@ -0,0 +1,118 @@
+import random
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.utils import timezone
+
+from accounts.models import User
+from projects.models import Contributor, Project, ProjectStatus, Task
+from projects.search import get_search_backend
+from projects.utils.counters import apply_counter_deltas, counter_deltas
+
+DATASET_PREFIX = "bench"
+
+WORDS = (
+    "solar wind water soil forest river audit survey planting cleanup recycling "
+    "compost energy carbon report volunteer training outreach garden school "
+    "community harvest irrigation monitoring biodiversity workshop"
+).split()
+SKILLS = ["gis", "python", "botany", "logistics", "outreach", "first-aid", "carpentry", "design", "data", "teaching"]
+LOCATIONS = ["Kochi", "Pune", "Chennai", "Delhi", "Mysuru", "Shillong", "Bhopal", "Goa"]
+
+
+def zipf_weights(n, s=1.1):
+    """
+    Weights for a Zipf-like skew: a few items get most of the picks.
+    """
+    return [1 / (rank + 1) ** s for rank in range(n)]
+
+
+def generate_dataset(projects=100, tasks=10_000, contributors=300, seed=7, batch_size=2000):
+    """
+    Create a deterministic dataset and return a summary with sample ids.
+
+    Assignees follow a Zipf distribution (a few contributors carry most
+    tasks), due dates cluster around today with long tails either side
+    (~25% overdue, ~15% undated), and contributors get skills JSON.
+    bulk_create skips signals, so the search index is updated explicitly.
+    """
+    rng = random.Random(seed)
+    today = timezone.now().date()
+
+    def sentence(n):
+        return " ".join(rng.choice(WORDS) for _ in range(n))
+
+    password = make_password(None)
+    users = User.objects.bulk_create(
+        (User(email=f"{DATASET_PREFIX}-{i}@example.com", name=f"{DATASET_PREFIX} {sentence(2)} {i}", password=password)
+         for i in range(contributors)),
+        batch_size=batch_size,
+    )
+    contributor_objs = Contributor.objects.bulk_create(
+        (Contributor(
+            user=user,
+            skills={
+                "tags": rng.sample(SKILLS, rng.randint(1, 4)),
+                "level": rng.choice(["beginner", "intermediate", "expert"]),
+                "languages": rng.sample(["en", "hi", "ml", "ta", "kn"], rng.randint(1, 3)),
+            },
+            joined_on=timezone.now() - timedelta(days=rng.randint(0, 1500)),
+        ) for user in users),
+        batch_size=batch_size,
+    )
+    statuses = [ProjectStatus.ACTIVE] * 6 + [ProjectStatus.COMPLETED] * 3 + [ProjectStatus.ON_HOLD]
+    project_objs = Project.objects.bulk_create(
+        (Project(
+            name=f"{DATASET_PREFIX} {i} {sentence(2)}",
+            description=sentence(20),
+            location=rng.choice(LOCATIONS),
+            status=rng.choice(statuses),
+        ) for i in range(projects)),
+        batch_size=batch_size,
+    )
+
+    project_weights = zipf_weights(len(project_objs), s=0.8)
+    task_objs = []
+    for i in range(tasks):
+        roll = rng.random()
+        if roll < 0.15:
+            due_date = None
+        elif roll < 0.40:
+            due_date = today - timedelta(days=1 + int(rng.expovariate(1 / 20)))
+        else:
+            due_date = today + timedelta(days=int(rng.expovariate(1 / 30)))
+        is_completed = rng.random() < 0.35
+        task_objs.append(Task(
+            project=rng.choices(project_objs, project_weights)[0],
+            title=f"{sentence(4)} {i}",
+            description=sentence(25),
+            due_date=due_date,
+            is_completed=is_completed,
+            is_overdue=not is_completed and due_date is not None and due_date < today,
+        ))
+    task_objs = Task.objects.bulk_create(task_objs, batch_size=batch_size)
+    apply_counter_deltas(counter_deltas((None, task.get_counted_state()) for task in task_objs))
+
+    assignee_weights = zipf_weights(len(contributor_objs))
+    through = Task.assigned_to.through
+    rows = set()
+    for task in task_objs:
+        for contributor in rng.choices(contributor_objs, assignee_weights, k=rng.choice([0, 1, 1, 2, 3])):
+            rows.add((task.pk, contributor.pk))
+    through.objects.bulk_create(
+        [through(task_id=task_id, contributor_id=contributor_id) for task_id, contributor_id in sorted(rows)],
+        batch_size=batch_size,
+    )
+
+    backend = get_search_backend()
+    backend.index_objects(Project, [p.pk for p in project_objs])
+    backend.index_objects(Contributor, [c.pk for c in contributor_objs])
+    for start in range(0, len(task_objs), batch_size):
+        backend.index_objects(Task, [t.pk for t in task_objs[start:start + batch_size]])
+
+    return {
+        "projects": [p.pk for p in project_objs],
+        "contributors": [c.pk for c in contributor_objs],
+        "tasks": [t.pk for t in task_objs],
+        "params": {"projects": projects, "tasks": tasks, "contributors": contributors, "seed": seed},
+    }
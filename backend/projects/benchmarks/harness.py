@@ -0,0 +1,190 @@
+import json
+import time
+from itertools import cycle
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, get_resolver, reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.authentication import CachedJWTAuthentication
+from projects.utils.cache_utils import invalidate_cache_tags
+from projects.utils.dashboard import DASHBOARD_CACHE_KEY
+
+CACHE_TAGS = ("tasks", "projects", "contributors")
+
+LIST_MIXES = {
+    "projects": ["", "?search=river", "?status=ACTIVE&ordering=name", "?page=2&page_size=40", "?cursor=&ordering=-created_at"],
+    "contributors": ["", "?search=bench", "?ordering=user__email&page_size=50", "?expand=", "?fields=id,user.name"],
+    "tasks": [
+        "",
+        "?search=solar audit",
+        "?is_completed=false&ordering=due_date",
+        "?is_overdue=true&expand=project",
+        "?page=5&page_size=100",
+        "?cursor=&ordering=-due_date&page_size=50",
+        "?fields=id,title,project.name&expand=project",
+    ],
+    "due": ["", "?ordering=-due_date", "?search=river&page_size=50"],
+    "overdue": ["", "?page=2", "?ordering=title&page_size=50", "?search=water"],
+    "workload": ["", "?ordering=-overdue_tasks", "?search=bench&page_size=50", "?cursor=&ordering=-due_this_week"],
+}
+
+# Scenario: url name, how to fill its kwargs, and the query strings it
+# cycles through. Every route in projects.urls must appear here.
+SCENARIOS = [
+    {"name": "projects", "url": "project_list_create", "queries": LIST_MIXES["projects"]},
+    {"name": "project_export", "url": "project_export", "queries": ["", "?export_format=ndjson&status=ACTIVE"], "requests": 3},
+    {"name": "project_detail", "url": "project_detail", "pk": "projects", "queries": ["", "?fields=id,name"]},
+    {"name": "project_tasks", "url": "project_tasks", "project_id": "projects", "queries": ["", "?fields=id,title&expand="]},
+    {"name": "contributors", "url": "contributor_list_create", "queries": LIST_MIXES["contributors"]},
+    {"name": "contributor_export", "url": "contributor_export", "queries": [""], "requests": 3},
+    {"name": "contributor_workload", "url": "contributor_workload", "queries": LIST_MIXES["workload"]},
+    {"name": "contributor_detail", "url": "contributor_detail", "pk": "contributors", "queries": ["", "?expand="]},
+    {"name": "tasks", "url": "task_list_create", "queries": LIST_MIXES["tasks"]},
+    {"name": "task_export", "url": "task_export", "queries": ["?is_overdue=true", "?export_format=ndjson&is_completed=false"], "requests": 3},
+    {"name": "task_detail", "url": "task_detail", "pk": "tasks", "queries": ["", "?expand=project", "?fields=id,title"]},
+    {"name": "due", "url": "due_task_list", "queries": LIST_MIXES["due"]},
+    {"name": "overdue", "url": "over_due_task_list", "queries": LIST_MIXES["overdue"]},
+    {"name": "dashboard", "url": "dashboard_summary", "queries": [""]},
+    {"name": "async_projects", "url": "async_project_list", "queries": LIST_MIXES["projects"][:4]},
+    {"name": "async_contributors", "url": "async_contributor_list", "queries": LIST_MIXES["contributors"][:4]},
+    {"name": "async_tasks", "url": "async_task_list", "queries": [q for q in LIST_MIXES["tasks"] if "cursor" not in q]},
+    {"name": "async_due", "url": "async_due_task_list", "queries": LIST_MIXES["due"]},
+    {"name": "async_overdue", "url": "async_over_due_task_list", "queries": LIST_MIXES["overdue"]},
+    {"name": "async_dashboard", "url": "async_dashboard_summary", "queries": [""]},
+    # Writes last: they bump cache tags for everything that follows.
+    {"name": "task_bulk_patch", "url": "task_bulk", "method": "patch", "body": "bulk_patch", "phases": ["cold"]},
+]
+
+
+def percentile(values, pct):
+    """
+    Nearest-rank percentile of a non-empty sequence.
+    """
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def check_coverage(urlconf="projects.urls"):
+    """
+    Return the names of routes in `urlconf` that no scenario exercises.
+    """
+    covered = {scenario["url"] for scenario in SCENARIOS}
+    names = {p.name for p in get_resolver(urlconf).url_patterns if isinstance(p, URLPattern)}
+    return sorted(names - covered)
+
+
+def make_cold():
+    """
+    Orphan every tag-versioned cache entry and drop the dashboard summary.
+    """
+    invalidate_cache_tags(*CACHE_TAGS)
+    cache.delete(DASHBOARD_CACHE_KEY)
+
+
+class BenchmarkRunner:
+    def __init__(self, user, dataset, requests=30, cold_requests=10):
+        self.dataset = dataset
+        self.requests = requests
+        self.cold_requests = cold_requests
+        self.token = AccessToken.for_user(user)
+        self.client = Client(SERVER_NAME="localhost", HTTP_AUTHORIZATION=f"Bearer {self.token}")
+
+    def prime_auth(self):
+        """
+        Put the token's user in the JWT user caches (untimed). Otherwise
+        whether a phase pays for the user lookup depends on the scenarios
+        run before it and their duration, and `--only` runs count
+        different queries than full ones.
+        """
+        CachedJWTAuthentication().get_user(self.token)
+
+    def paths(self, scenario):
+        """
+        Endpoint URLs for a scenario, cycling query strings and sample ids.
+        """
+        kwarg = next((key for key in ("pk", "project_id") if key in scenario), None)
+        ids = cycle(self.dataset[scenario[kwarg]][::97] or self.dataset[scenario[kwarg]]) if kwarg else None
+        for query in cycle(scenario.get("queries") or [""]):
+            kwargs = {kwarg: next(ids)} if kwarg else {}
+            yield reverse(scenario["url"], kwargs=kwargs) + query
+
+    def body(self, scenario, index):
+        if scenario.get("body") == "bulk_patch":
+            tasks = self.dataset["tasks"]
+            start = (index * 50) % max(1, len(tasks) - 50)
+            return [{"id": pk, "title": f"bench patched {index} {pk}"} for pk in tasks[start:start + 50]]
+        return None
+
+    def request(self, scenario, path, index):
+        method = scenario.get("method", "get")
+        body = self.body(scenario, index)
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            if body is None:
+                response = getattr(self.client, method)(path)
+            else:
+                response = getattr(self.client, method)(path, json.dumps(body), content_type="application/json")
+            if response.streaming:
+                b"".join(response.streaming_content)
+            elapsed = time.perf_counter() - started
+        return elapsed, len(queries), response.status_code
+
+    def run_scenario(self, scenario):
+        """
+        Yield one result row per phase ("cold": caches invalidated before
+        every request, "warm": after one untimed priming pass).
+        """
+        total = scenario.get("requests", self.requests)
+        for phase in scenario.get("phases", ["cold", "warm"]):
+            count = min(total, self.cold_requests) if phase == "cold" else total
+            paths = self.paths(scenario)
+            self.prime_auth()
+            if phase == "warm":
+                primed = self.paths(scenario)
+                for index in range(min(count, len(scenario.get("queries") or [""]))):
+                    self.request(scenario, next(primed), index)
+            latencies, query_counts, errors = [], [], 0
+            for index in range(count):
+                if phase == "cold":
+                    make_cold()
+                elapsed, queries, status_code = self.request(scenario, next(paths), index)
+                latencies.append(elapsed)
+                query_counts.append(queries)
+                errors += status_code >= 400
+            yield {
+                "scenario": scenario["name"],
+                "phase": phase,
+                "requests": count,
+                "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+                "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+                "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+                "queries": round(sum(query_counts) / count, 2),
+                "throughput": round(count / sum(latencies), 1),
+                "errors": errors,
+            }
+
+
+def compare_to_baseline(results, baseline, tolerance=0.5, slack_ms=5.0, metric="p50_ms"):
+    """
+    Return regression messages: `metric` above baseline * (1 + tolerance)
+    + slack_ms, more queries per request than the baseline, or new errors.
+    """
+    expected = {f"{row['scenario']}:{row['phase']}": row for row in baseline.get("results", [])}
+    regressions = []
+    for row in results:
+        key = f"{row['scenario']}:{row['phase']}"
+        base = expected.get(key)
+        if base is None:
+            continue
+        limit = base[metric] * (1 + tolerance) + slack_ms
+        if row[metric] > limit:
+            regressions.append(f"{key}: {metric} {row[metric]} > {limit:.1f} (baseline {base[metric]})")
+        if row["queries"] > base["queries"]:
+            regressions.append(f"{key}: {row['queries']} queries/request (baseline {base['queries']})")
+        if row["errors"] > base.get("errors", 0):
+            regressions.append(f"{key}: {row['errors']} errors (baseline {base.get('errors', 0)})")
+    return regressions
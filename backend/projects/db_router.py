@@ -0,0 +1,167 @@
+"""
+Read-replica routing.
+
+Every request gets a RoutingState (projects.middleware.ReplicaRoutingMiddleware).
+Reads go to a replica only when the view opted in (ReplicaReadMixin), the
+request is a safe one, nothing has been written yet in it, and the user
+has not written in the last REPLICA_PIN_SECONDS. Everything else,
+including Celery tasks and management commands, uses `default`.
+
+Replicas are health-checked at most every REPLICA_HEALTH_CHECK_INTERVAL
+seconds per process and skipped while unreachable or more than
+REPLICA_MAX_LAG seconds behind.
+"""
+import logging
+import random
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+REPLICA_DATABASES = list(getattr(settings, "REPLICA_DATABASES", []))
+REPLICA_MAX_LAG = getattr(settings, "REPLICA_MAX_LAG", 5)
+REPLICA_PIN_SECONDS = getattr(settings, "REPLICA_PIN_SECONDS", REPLICA_MAX_LAG)
+REPLICA_HEALTH_CHECK_INTERVAL = getattr(settings, "REPLICA_HEALTH_CHECK_INTERVAL", 10)
+
+PIN_KEY_PREFIX = "db_pin"
+
+_current = ContextVar("db_routing", default=None)
+_health = {}
+
+
+class RoutingState:
+    def __init__(self):
+        self.use_replica = False
+        self.replica = None
+        self.wrote = False
+        self.replica_failed = False
+        self.fell_back = False
+
+    def read_db(self):
+        if not self.use_replica or self.wrote or self.fell_back:
+            return None
+        if self.replica is None:
+            self.replica = choose_replica()
+            self.use_replica = self.replica is not None
+        return self.replica
+
+    def fall_back_to_primary(self):
+        self.use_replica = False
+        self.replica = None
+        self.replica_failed = False
+        self.fell_back = True
+
+
+def start_routing():
+    """
+    Bind a fresh RoutingState to the current context; returns (state, token).
+    """
+    state = RoutingState()
+    return state, _current.set(state)
+
+
+def stop_routing(token):
+    _current.reset(token)
+
+
+def current_routing():
+    return _current.get()
+
+
+def pin_key(user_id):
+    return f"{PIN_KEY_PREFIX}:{user_id}"
+
+
+def replica_lag(alias):
+    """
+    Seconds `alias` is behind its primary. Raises DatabaseError when it is
+    unreachable or has no schema (e.g. an empty SQLite file).
+    """
+    connection = connections[alias]
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM django_migrations LIMIT 1")
+        if connection.vendor != "postgresql":
+            return 0.0
+        cursor.execute(
+            "SELECT CASE WHEN pg_is_in_recovery() "
+            "THEN COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) ELSE 0 END"
+        )
+        return float(cursor.fetchone()[0])
+
+
+def replica_available(alias):
+    checked = _health.get(alias)
+    now = time.monotonic()
+    if checked and now - checked[0] < REPLICA_HEALTH_CHECK_INTERVAL:
+        return checked[1]
+    try:
+        lag = replica_lag(alias)
+    except DatabaseError as e:
+        logger.warning(f"[ReplicaRouter] Replica '{alias}' unavailable: {e}")
+        healthy = False
+    else:
+        healthy = lag <= REPLICA_MAX_LAG
+        if not healthy:
+            logger.warning(f"[ReplicaRouter] Replica '{alias}' is {lag:.1f}s behind, skipping it")
+    _health[alias] = (now, healthy)
+    return healthy
+
+
+def mark_replica_down(alias):
+    _health[alias] = (time.monotonic(), False)
+
+
+def choose_replica():
+    candidates = [alias for alias in REPLICA_DATABASES if replica_available(alias)]
+    return random.choice(candidates) if candidates else None
+
+
+def guard_replica(execute, sql, params, many, context):
+    """
+    execute_wrapper for replica connections: a failing query marks the
+    replica down so ReplicaReadMixin can retry the request on `default`.
+    """
+    try:
+        return execute(sql, params, many, context)
+    except DatabaseError:
+        alias = context["connection"].alias
+        mark_replica_down(alias)
+        state = _current.get()
+        if state is not None and state.replica == alias:
+            state.replica_failed = True
+        raise
+
+
+def install_replica_guard(connection, **kwargs):
+    if connection.alias in REPLICA_DATABASES and guard_replica not in connection.execute_wrappers:
+        connection.execute_wrappers.append(guard_replica)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _current.get()
+        return state.read_db() if state is not None else None
+
+    def db_for_write(self, model, **hints):
+        state = _current.get()
+        if state is not None:
+            state.wrote = True
+        # Objects read from a replica are saved to the primary; everything
+        # else keeps Django's default (the instance's database or `default`).
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db in REPLICA_DATABASES:
+            return DEFAULT_DB_ALIAS
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *REPLICA_DATABASES}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema from the primary.
+        return False if db in REPLICA_DATABASES else None
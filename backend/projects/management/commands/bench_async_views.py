@@ -0,0 +1,143 @@
+import asyncio
+import random
+import time
+from datetime import date, timedelta
+
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management.base import BaseCommand
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import User
+from projects.benchmarks.harness import percentile
+from projects.models import Contributor, Project, Task
+from projects.search import get_search_backend
+
+BENCH_PREFIX = "bench-async"
+
+# name -> (sync path, async path)
+ENDPOINTS = {
+    "tasks": ("/api/project/tasks/", "/api/project/async/tasks/"),
+    "tasks?search": ("/api/project/tasks/?search=river", "/api/project/async/tasks/?search=river"),
+    "overdue": ("/api/project/tasks/overdue/", "/api/project/async/tasks/overdue/"),
+    "dashboard": ("/api/project/dashboard/", "/api/project/async/dashboard/"),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the sync APIViews with their async variants under concurrency by "
+        "driving the ASGI application in process. Generated rows are deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tasks", type=int, default=5000)
+        parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint and concurrency level.")
+        parser.add_argument("--concurrency", default="1,10,50")
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        levels = [int(level) for level in options["concurrency"].split(",")]
+        user = self.populate(options["tasks"], random.Random(options["seed"]))
+        try:
+            asyncio.run(self.run(str(AccessToken.for_user(user)), options["requests"], levels))
+        finally:
+            self.cleanup()
+
+    def populate(self, n_tasks, rng):
+        user = User.objects.create_user(f"{BENCH_PREFIX}@example.com", BENCH_PREFIX, "bench")
+        contributors = [
+            Contributor.objects.create(user=User.objects.create_user(f"{BENCH_PREFIX}-{i}@example.com", f"c{i}", "bench"))
+            for i in range(20)
+        ]
+        projects = Project.objects.bulk_create(Project(name=f"{BENCH_PREFIX} {i}") for i in range(50))
+        today = date.today()
+        tasks = Task.objects.bulk_create(
+            (Task(
+                project=rng.choice(projects),
+                title=f"{BENCH_PREFIX} {rng.choice(['river', 'solar', 'forest'])} {i}",
+                due_date=today + timedelta(days=rng.randint(-30, 30)),
+                is_overdue=rng.random() < 0.3,
+            ) for i in range(n_tasks)),
+            batch_size=2000,
+        )
+        through = Task.assigned_to.through
+        through.objects.bulk_create(
+            [through(task_id=task.pk, contributor_id=rng.choice(contributors).pk) for task in tasks],
+            batch_size=2000,
+        )
+        get_search_backend().index_objects(Task, [task.pk for task in tasks])
+        return user
+
+    def cleanup(self):
+        Task.objects.filter(title__startswith=BENCH_PREFIX).delete()
+        Project.objects.filter(name__startswith=BENCH_PREFIX).delete()
+        User.objects.filter(email__startswith=BENCH_PREFIX).delete()
+
+    async def run(self, token, total, levels):
+        application = ASGIHandler()
+        self.stdout.write(
+            f"{'endpoint':<14}{'mode':<7}{'conc':>5}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'errors':>8}"
+        )
+        for name, paths in ENDPOINTS.items():
+            for level in levels:
+                for mode, path in zip(("sync", "async"), paths):
+                    latencies, errors, elapsed = await self.load(application, path, token, total, level)
+                    self.stdout.write(
+                        f"{name:<14}{mode:<7}{level:>5}{len(latencies) / elapsed:>9.0f}"
+                        f"{percentile(latencies, 50) * 1000:>9.1f}{percentile(latencies, 95) * 1000:>9.1f}"
+                        f"{errors:>8}"
+                    )
+
+    async def load(self, application, path, token, total, concurrency):
+        remaining = iter(range(total))
+        latencies, errors = [], 0
+
+        async def worker():
+            nonlocal errors
+            for _ in remaining:
+                started = time.perf_counter()
+                if await self.request(application, path, token) != 200:
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return latencies, errors, time.perf_counter() - started
+
+    @staticmethod
+    async def request(application, path, token):
+        path, _, query = path.partition("?")
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "root_path": "",
+            "headers": [(b"host", b"localhost"), (b"authorization", f"Bearer {token}".encode())],
+            "client": ("127.0.0.1", 0),
+            "server": ("localhost", 80),
+        }
+        received = False
+        disconnected = asyncio.Event()
+        response = {}
+
+        async def receive():
+            nonlocal received
+            if not received:
+                received = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            elif not message.get("more_body"):
+                disconnected.set()
+
+        await application(scope, receive, send)
+        return response.get("status")
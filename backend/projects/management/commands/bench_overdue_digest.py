@@ -0,0 +1,76 @@
+import random
+import time
+from datetime import timedelta
+
+from django.core import mail
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Prefetch
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from accounts.models import User
+from projects.models import Contributor, Project, Task
+from projects.tasks import send_overdue_digests
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure overdue digest throughput with the locmem email backend on a "
+        "generated dataset. Runs inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--contributors", type=int, default=2000)
+        parser.add_argument("--tasks", type=int, default=20000)
+        parser.add_argument("--max-assignees", type=int, default=3)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.populate(options, random.Random(options["seed"]))
+            self.run()
+            transaction.set_rollback(True)
+
+    def populate(self, options, rng):
+        users = User.objects.bulk_create(
+            User(email=f"bench{i}@example.com", name=f"Bench {i}", password="!")
+            for i in range(options["contributors"])
+        )
+        contributors = Contributor.objects.bulk_create(Contributor(user=user) for user in users)
+        project = Project.objects.create(name="bench digest project")
+        yesterday = timezone.now().date() - timedelta(days=1)
+        tasks = Task.objects.bulk_create(
+            (Task(project=project, title=f"task {i}", due_date=yesterday, is_overdue=True)
+             for i in range(options["tasks"])),
+            batch_size=5000,
+        )
+        through = Task.assigned_to.through
+        through.objects.bulk_create(
+            (through(task_id=task.pk, contributor_id=contributor.pk)
+             for task in tasks
+             for contributor in rng.sample(contributors, rng.randint(1, options["max_assignees"]))),
+            batch_size=5000,
+        )
+
+    def run(self):
+        mail.outbox = []
+        tasks = (
+            Task.objects.filter(is_overdue=True)
+            .prefetch_related(Prefetch("assigned_to", queryset=Contributor.objects.select_related("user")))
+            .select_related("project")
+            .order_by("due_date", "id")
+        )
+        backend = get_connection("django.core.mail.backends.locmem.EmailBackend")
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            sent, failed, _ = send_overdue_digests(tasks, connection=backend)
+            elapsed = time.perf_counter() - started
+
+        covered = sum(message.body.count("\n- ") for message in mail.outbox)
+        self.stdout.write(f"digests sent:      {sent} ({failed} failed)")
+        self.stdout.write(f"task lines:        {covered}")
+        self.stdout.write(f"queries:           {len(queries)}")
+        self.stdout.write(f"elapsed:           {elapsed:.3f}s")
+        self.stdout.write(f"throughput:        {sent / elapsed:.0f} digests/s")
@@ -0,0 +1,89 @@
+import json
+import time
+from statistics import median
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils.text import compress_string
+from rest_framework.renderers import JSONRenderer
+
+from projects.benchmarks.dataset import generate_dataset
+from projects.middleware import COMPRESSION_BROTLI_QUALITY, brotli
+from projects.models import Project, Task
+from projects.renderers import FastJSONRenderer, orjson
+from projects.serializers import ProjectSerializer, TaskSerializer
+from projects.utils.counters import annotate_progress
+from projects.views import TaskExportAPIView
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the stock JSONRenderer with FastJSONRenderer on task, project and "
+        "export payloads from a generated dataset: render time, body size and the "
+        "size/time of gzip (and brotli, if installed). Runs inside a transaction "
+        "that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tasks", type=int, default=5000, help="Tasks per payload.")
+        parser.add_argument("--projects", type=int, default=200)
+        parser.add_argument("--repeat", type=int, default=10)
+        parser.add_argument("--seed", type=int, default=7)
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stderr.write("orjson is not installed; FastJSONRenderer falls back to the stock encoder.")
+        with transaction.atomic():
+            generate_dataset(projects=options["projects"], tasks=options["tasks"], seed=options["seed"])
+            self.run(self.payloads(options["tasks"]), options["repeat"])
+            transaction.set_rollback(True)
+
+    def payloads(self, n_tasks):
+        tasks = TaskSerializer.setup_eager_loading(Task.objects.all())[:n_tasks]
+        export = TaskExportAPIView()
+        return {
+            # Serializer output: strings, ints, bools and nested dicts.
+            "tasks": TaskSerializer(tasks, many=True).data,
+            "projects": ProjectSerializer(annotate_progress(Project.objects.all()), many=True).data,
+            # Model values: dates and datetimes go through the encoder's default().
+            "export rows": [export.get_export_row(task) for task in export.get_export_queryset()[:n_tasks]],
+        }
+
+    def run(self, payloads, repeat):
+        renderers = {"stock": JSONRenderer(), "fast": FastJSONRenderer()}
+        codings = {"gzip": compress_string}
+        if brotli is not None:
+            codings["br"] = lambda content: brotli.compress(content, quality=COMPRESSION_BROTLI_QUALITY)
+
+        self.stdout.write(f"{'payload':<13}{'renderer':<10}{'ms':>9}{'KiB':>9}{'speedup':>9}{'same':>6}")
+        encoded = {}
+        for name, data in payloads.items():
+            bodies, times = {}, {}
+            for label, renderer in renderers.items():
+                samples = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    bodies[label] = renderer.render(data)
+                    samples.append(time.perf_counter() - started)
+                times[label] = median(samples)
+            same = json.loads(bodies["stock"]) == json.loads(bodies["fast"])
+            for label in renderers:
+                self.stdout.write(
+                    f"{name:<13}{label:<10}{times[label] * 1000:>9.2f}{len(bodies[label]) / 1024:>9.1f}"
+                    f"{times['stock'] / times[label]:>8.1f}x{'yes' if same else 'NO':>6}"
+                )
+            encoded[name] = bodies["fast"]
+
+        self.stdout.write("")
+        self.stdout.write(f"{'payload':<13}{'coding':<10}{'ms':>9}{'KiB':>9}{'ratio':>9}")
+        for name, body in encoded.items():
+            for coding, compress in codings.items():
+                samples = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    compressed = compress(body)
+                    samples.append(time.perf_counter() - started)
+                self.stdout.write(
+                    f"{name:<13}{coding:<10}{median(samples) * 1000:>9.2f}{len(compressed) / 1024:>9.1f}"
+                    f"{len(body) / len(compressed):>8.1f}x"
+                )
@@ -0,0 +1,73 @@
+import random
+import time
+from statistics import median
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from projects.models import Project, Task
+from projects.search import IContainsSearchBackend, get_full_text_backend
+
+WORDS = (
+    "solar wind water soil forest river audit survey planting cleanup recycling "
+    "compost energy carbon report volunteer training outreach garden school "
+    "community harvest irrigation monitoring biodiversity workshop"
+).split()
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the icontains search path against the full-text index on a "
+        "generated dataset. Runs inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tasks", type=int, default=100_000)
+        parser.add_argument("--projects", type=int, default=500)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.populate(options["projects"], options["tasks"], random.Random(options["seed"]))
+            self.run(options["repeat"])
+            transaction.set_rollback(True)
+
+    def populate(self, n_projects, n_tasks, rng):
+        def sentence(n):
+            return " ".join(rng.choice(WORDS) for _ in range(n))
+
+        projects = Project.objects.bulk_create(
+            Project(name=f"bench {i} {sentence(2)}", location=sentence(1)) for i in range(n_projects)
+        )
+        Task.objects.bulk_create(
+            (Task(project=rng.choice(projects), title=sentence(4), description=sentence(30))
+             for _ in range(n_tasks)),
+            batch_size=5000,
+        )
+        started = time.perf_counter()
+        indexed = get_full_text_backend(connection.vendor).rebuild(Task)
+        self.stdout.write(f"indexed {indexed} tasks in {time.perf_counter() - started:.2f}s")
+
+    def run(self, repeat):
+        fields = ["title", "description", "project__name"]
+        backends = {
+            "icontains": IContainsSearchBackend(),
+            "fulltext": get_full_text_backend(connection.vendor),
+        }
+        self.stdout.write(f"{'term':<14}{'backend':<11}{'matches':>9}{'count ms':>10}{'page ms':>10}")
+        for term in ["solar", "river audit", "bench 7", "biodiv"]:
+            for name, backend in backends.items():
+                count_times, page_times = [], []
+                for _ in range(repeat):
+                    queryset = backend.filter(Task.objects.select_related("project"), term, fields)
+                    started = time.perf_counter()
+                    matches = queryset.count()
+                    count_times.append(time.perf_counter() - started)
+                    started = time.perf_counter()
+                    list(queryset[:10])
+                    page_times.append(time.perf_counter() - started)
+                self.stdout.write(
+                    f"{term:<14}{name:<11}{matches:>9}"
+                    f"{median(count_times) * 1000:>10.1f}{median(page_times) * 1000:>10.1f}"
+                )
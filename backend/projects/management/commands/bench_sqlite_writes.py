@@ -0,0 +1,203 @@
+import multiprocessing
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections, transaction
+
+from projects.benchmarks.harness import percentile
+from projects.models import Project, Task
+
+BASE_ALIAS = "bench_sqlite_base"
+
+
+def configure_alias(alias, profile, path):
+    # configure_settings() fills in the defaults but insists on a `default` entry.
+    connections.settings[alias] = connections.configure_settings(
+        {DEFAULT_DB_ALIAS: connections.settings[DEFAULT_DB_ALIAS], alias: {**settings.SQLITE_PROFILES[profile], "NAME": path}}
+    )[alias]
+
+
+def write_ops(alias, writer, ops, project_id, max_task_id):
+    """
+    `ops` small read-then-write transactions (SELECT, INSERT, UPDATE), like
+    a DRF update loading its object first. Returns (latencies, errors).
+    """
+    latencies, errors = [], 0
+    try:
+        for op in range(ops):
+            started = time.perf_counter()
+            try:
+                with transaction.atomic(using=alias):
+                    pk = (writer * ops + op) % max_task_id + 1
+                    Task.objects.using(alias).filter(pk=pk).values_list("title", flat=True).first()
+                    Task.objects.using(alias).bulk_create([
+                        Task(project_id=project_id, title=f"writer {writer} op {op}", due_date=date.today())
+                    ])
+                    Task.objects.using(alias).filter(pk=pk).update(
+                        title=f"updated by {writer}"
+                    )
+            except OperationalError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+    finally:
+        connections[alias].close()
+    return latencies, errors
+
+
+def bulk_updates(alias, rounds):
+    """
+    Table-wide UPDATEs like mark_overdue_tasks.
+    """
+    latencies, errors = [], 0
+    try:
+        for round_ in range(rounds):
+            started = time.perf_counter()
+            try:
+                Task.objects.using(alias).filter(due_date__lt=date.today()).update(is_overdue=round_ % 2 == 0)
+            except OperationalError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+            time.sleep(0.05)
+    finally:
+        connections[alias].close()
+    return latencies, errors
+
+
+def read_ops(alias, ops):
+    latencies, errors = [], 0
+    try:
+        for _ in range(ops):
+            started = time.perf_counter()
+            try:
+                Task.objects.using(alias).filter(is_overdue=True).count()
+            except OperationalError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+    finally:
+        connections[alias].close()
+    return latencies, errors
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure concurrent writer throughput on a scratch copy of the schema under "
+        "each SQLite profile in settings.SQLITE_PROFILES (e.g. stock vs tuned), with a "
+        "mark_overdue_tasks-style bulk updater and readers running alongside."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--profiles", nargs="*", default=["stock", "tuned"])
+        parser.add_argument("--mode", choices=["threads", "processes"], default="threads")
+        parser.add_argument("--writers", type=int, default=8)
+        parser.add_argument("--ops", type=int, default=100, help="Transactions per writer.")
+        parser.add_argument("--readers", type=int, default=2)
+        parser.add_argument("--bulk-updates", type=int, default=10, help="Table-wide UPDATEs run alongside.")
+        parser.add_argument("--tasks", type=int, default=20_000, help="Rows seeded before the run.")
+
+    def handle(self, *args, **options):
+        unknown = set(options["profiles"]) - set(settings.SQLITE_PROFILES)
+        if unknown:
+            raise CommandError(f"Unknown profile(s): {', '.join(sorted(unknown))}")
+
+        workdir = tempfile.mkdtemp(prefix="bench_sqlite_")
+        try:
+            base_path = os.path.join(workdir, "base.sqlite3")
+            project_id = self.seed(base_path, options["tasks"])
+            self.stdout.write(
+                f"{'profile':<8}{'writes':>8}{'errors':>8}{'writes/s':>10}{'p50 ms':>9}{'p95 ms':>9}"
+                f"{'bulk p95':>10}{'read p95':>10}{'wall s':>8}"
+            )
+            for profile in options["profiles"]:
+                path = os.path.join(workdir, f"{profile}.sqlite3")
+                self.copy(base_path, path)
+                alias = f"bench_sqlite_{profile}"
+                configure_alias(alias, profile, path)
+                try:
+                    self.report(profile, self.run(alias, project_id, options))
+                finally:
+                    connections[alias].close()
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    def seed(self, path, tasks):
+        configure_alias(BASE_ALIAS, "stock", path)
+        # Only the two tables written to, created from the current models:
+        # running the migrations here would also run their data migrations.
+        with connections[BASE_ALIAS].schema_editor() as editor:
+            editor.create_model(Project)
+            editor.create_model(Task)
+        # bulk_create: no signals, so nothing is indexed or invalidated on `default`.
+        [project] = Project.objects.using(BASE_ALIAS).bulk_create([Project(name="bench sqlite")])
+        today = date.today()
+        Task.objects.using(BASE_ALIAS).bulk_create(
+            (
+                Task(project_id=project.pk, title=f"seed {i}", due_date=today + timedelta(days=i % 60 - 30))
+                for i in range(tasks)
+            ),
+            batch_size=2000,
+        )
+        connections[BASE_ALIAS].close()
+        return project.pk
+
+    @staticmethod
+    def copy(source, target):
+        # Each profile starts from the same rows in rollback-journal mode;
+        # the tuned profile switches its copy to WAL when it connects.
+        src, dst = sqlite3.connect(source), sqlite3.connect(target)
+        try:
+            src.backup(dst)
+            dst.execute("PRAGMA journal_mode = DELETE")
+        finally:
+            src.close()
+            dst.close()
+
+    def run(self, alias, project_id, options):
+        if options["mode"] == "threads":
+            executor = ThreadPoolExecutor(options["writers"] + options["readers"] + 1)
+        else:
+            executor = ProcessPoolExecutor(
+                options["writers"] + options["readers"] + 1, mp_context=multiprocessing.get_context("fork")
+            )
+        max_task_id = options["tasks"]
+        started = time.perf_counter()
+        with executor:
+            writers = [
+                executor.submit(write_ops, alias, writer, options["ops"], project_id, max_task_id)
+                for writer in range(options["writers"])
+            ]
+            bulk = executor.submit(bulk_updates, alias, options["bulk_updates"])
+            readers = [executor.submit(read_ops, alias, options["ops"]) for _ in range(options["readers"])]
+            write_results = [future.result() for future in writers]
+            bulk_result = bulk.result()
+            read_results = [future.result() for future in readers]
+        wall = time.perf_counter() - started
+
+        write_latencies = [latency for latencies, _ in write_results for latency in latencies]
+        return {
+            "writes": len(write_latencies),
+            "errors": sum(errors for _, errors in write_results) + bulk_result[1],
+            "wall": wall,
+            "write_latencies": write_latencies,
+            "bulk_latencies": bulk_result[0],
+            "read_latencies": [latency for latencies, _ in read_results for latency in latencies],
+        }
+
+    def report(self, profile, result):
+        def p(latencies, pct):
+            return percentile(latencies, pct) * 1000 if latencies else float("nan")
+
+        self.stdout.write(
+            f"{profile:<8}{result['writes']:>8}{result['errors']:>8}{result['writes'] / result['wall']:>10.1f}"
+            f"{p(result['write_latencies'], 50):>9.1f}{p(result['write_latencies'], 95):>9.1f}"
+            f"{p(result['bulk_latencies'], 95):>10.1f}{p(result['read_latencies'], 95):>10.1f}{result['wall']:>8.1f}"
+        )
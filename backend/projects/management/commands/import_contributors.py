@@ -0,0 +1,58 @@
+import csv
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from projects.utils.contributor_import import import_contributors
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk import contributors from a CSV (name,email,password,skills,joined_on), "
+        "JSON array or NDJSON file. Passwords are hashed in a process pool."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--workers", type=int, default=None, help="Hashing processes (default: CPU count).")
+        parser.add_argument("--chunk-size", type=int, default=500, help="Rows per transaction.")
+        parser.add_argument("--report", help="Write the per-row error report to this JSON file.")
+
+    def handle(self, *args, **options):
+        rows = self.read_rows(options["path"])
+        started = time.perf_counter()
+        result = import_contributors(rows, chunk_size=options["chunk_size"], workers=options["workers"])
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(
+            f"Created {result['created']} of {len(rows)} contributors in {elapsed:.1f}s, "
+            f"{len(result['errors'])} rows failed."
+        )
+        if options["report"]:
+            with open(options["report"], "w") as fh:
+                json.dump(result["errors"], fh, indent=2, default=str)
+        else:
+            for error in result["errors"]:
+                self.stderr.write(f"row {error['row']}: {json.dumps(error['errors'], default=str)}")
+
+    def read_rows(self, path):
+        try:
+            with open(path, newline="") as fh:
+                if path.endswith(".csv"):
+                    return [self.parse_csv_row(row) for row in csv.DictReader(fh)]
+                if path.endswith(".ndjson") or path.endswith(".jsonl"):
+                    return [json.loads(line) for line in fh if line.strip()]
+                return json.load(fh)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Could not read {path}: {e}")
+
+    @staticmethod
+    def parse_csv_row(row):
+        row = {key: value for key, value in row.items() if value not in (None, "")}
+        if "skills" in row:
+            try:
+                row["skills"] = json.loads(row["skills"])
+            except ValueError:
+                row["skills"] = [skill.strip() for skill in row["skills"].split(";") if skill.strip()]
+        return row
@@ -0,0 +1,201 @@
+from collections import defaultdict
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import BooleanField, DateField
+from django.test import RequestFactory
+from django.urls import URLPattern, get_resolver
+from rest_framework.request import Request
+
+from projects.mixins import SearchFilterOrderingMixin, StreamingExportMixin
+from projects.utils.query_plans import (
+    PLAN_PROBLEMS, equality_filters, index_definition, index_exists, plan_problems, redundant_indexes,
+    resolve_field, suggest_index,
+)
+
+
+def list_views(urlconf="projects.urls"):
+    """
+    (url name, URLPattern, view class) for every paginated list view;
+    exports read the whole result set by design and are left out.
+    """
+    for pattern in get_resolver(urlconf).url_patterns:
+        view_class = getattr(pattern.callback, "view_class", None)
+        if (
+            isinstance(pattern, URLPattern)
+            and view_class is not None
+            and issubclass(view_class, SearchFilterOrderingMixin)
+            and not issubclass(view_class, StreamingExportMixin)
+        ):
+            yield pattern.name, pattern, view_class
+
+
+def sample_values(model, path):
+    """
+    Query-string values to filter `path` with: both for booleans, else one.
+    """
+    field, _ = resolve_field(model, path)
+    if isinstance(field, BooleanField):
+        return ["true", "false"]
+    if field.is_relation:
+        return ["1"]
+    if field.choices:
+        return [str(field.choices[0][0])]
+    if isinstance(field, DateField):
+        return [date.today().isoformat()]
+    return ["x"]
+
+
+def merge_prefixes(suggestions):
+    """
+    Fold each suggested index into a longer one it is a prefix of (same
+    model and condition), which serves its combinations too.
+    """
+    merged = {}
+    for key, served in sorted(suggestions.items(), key=lambda item: -len(item[0][1])):
+        model, fields, condition = key
+        target = next(
+            (other for other in merged
+             if other[0] is model and other[2] == condition and other[1][:len(fields)] == fields),
+            key,
+        )
+        merged.setdefault(target, set()).update(served)
+    return merged
+
+
+class Command(BaseCommand):
+    help = (
+        "EXPLAIN the page query of every list view in projects/urls.py for each "
+        "filter_fields x ordering_fields combination, and report full scans, "
+        "temporary sorts, redundant indexes and composite/partial indexes that "
+        "would serve the combinations. Only reads the schema; no rows are needed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--views", nargs="*", help="URL names to check (default: all list views).")
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        self.verbosity = options["verbosity"]
+        connection = connections[options["database"]]
+        views = list(list_views())
+        if options["views"]:
+            unknown = set(options["views"]) - {name for name, _, _ in views}
+            if unknown:
+                raise CommandError(f"Unknown list view(s): {', '.join(sorted(unknown))}")
+            views = [view for view in views if view[0] in options["views"]]
+        if connection.vendor not in PLAN_PROBLEMS:
+            self.stderr.write(f"No plan analysis for {connection.vendor}; plans are printed as-is.")
+
+        self.factory = RequestFactory()
+        suggestions = defaultdict(set)
+        models, seen = set(), {}
+        for name, pattern, view_class in views:
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{name} ({view_class.__name__})"))
+            checked = flagged = 0
+            # Filters of the view's own queryset (e.g. is_completed=False on
+            # the due list) hold for every combination.
+            base_filters = equality_filters(self.build_queryset(pattern, view_class, {}))
+            for label, params in self.combinations(pattern, view_class, base_filters):
+                queryset = self.build_queryset(pattern, view_class, params).using(connection.alias)
+                models.add(queryset.model)
+                sql = str(queryset.query)
+                if sql in seen:
+                    if self.verbosity >= 2:
+                        self.stdout.write(f"  {label}: same query as {seen[sql]}")
+                    continue
+                seen[sql] = f"{name} {label}"
+                checked += 1
+
+                plan = queryset.explain()
+                problems = plan_problems(connection.vendor, plan)
+                flagged += bool(problems)
+                if problems or self.verbosity >= 2 or connection.vendor not in PLAN_PROBLEMS:
+                    found = ", ".join(sorted({problem for problem, _, _ in problems})) or "ok"
+                    self.stdout.write(f"  {label}: {found}")
+                if self.verbosity >= 2 or connection.vendor not in PLAN_PROBLEMS:
+                    self.stdout.write(f"    {sql}")
+                    self.stdout.write("    " + plan.replace("\n", "\n    "))
+
+                base_problems = [
+                    problem for problem, table, _ in problems
+                    if table in (None, queryset.model._meta.db_table)
+                ]
+                if base_problems:
+                    self.collect_suggestion(
+                        connection, queryset, view_class, params, base_filters, suggestions, name, label
+                    )
+            if not checked:
+                self.stdout.write("  same queries as the views above")
+            elif not flagged and self.verbosity < 2:
+                self.stdout.write(f"  {checked} combinations, no full scans or temp sorts")
+
+        self.report_redundant(connection, models)
+        self.report_suggestions(suggestions)
+
+    def combinations(self, pattern, view_class, base_filters):
+        """
+        (label, query params): no filter and each filter value, each with the
+        default ordering and every ordering field. Fields the base queryset
+        already fixes are not varied.
+        """
+        model = self.build_queryset(pattern, view_class, {}).model
+        filters = [("-", {})]
+        for field in view_class.filter_fields:
+            if field in base_filters:
+                continue
+            for value in sample_values(model, field):
+                filters.append((f"{field}={value}", {field: value}))
+        orderings = [("default", {})] + [(field, {"ordering": field}) for field in view_class.ordering_fields]
+        for filter_label, filter_params in filters:
+            for ordering_label, ordering_params in orderings:
+                yield f"filter {filter_label}, ordering {ordering_label}", {**filter_params, **ordering_params}
+
+    def build_queryset(self, pattern, view_class, params):
+        """
+        The queryset the view would paginate for `params`, sliced to a page.
+        """
+        kwargs = {name: 1 for name in pattern.pattern.converters}
+        request = Request(self.factory.get("/", params))
+        view = view_class()
+        view.setup(request._request, **kwargs)
+        view.request = request
+        queryset = view.apply_search_filter_ordering(view.get_queryset(), request)
+        return queryset[:view_class.pagination_class.page_size]
+
+    def collect_suggestion(self, connection, queryset, view_class, params, base_filters, suggestions, name, label):
+        model = queryset.model
+        filters = {
+            **base_filters,
+            **{
+                field: params[field] == "true" if params[field] in ("true", "false") else params[field]
+                for field in view_class.filter_fields if field in params
+            },
+        }
+        ordering = queryset.query.order_by or model._meta.ordering
+        suggestion = suggest_index(connection, model, filters, [item for item in ordering if isinstance(item, str)])
+        if suggestion is not None and not index_exists(connection, model, *suggestion):
+            suggestions[(model, *suggestion)].add(f"{name} {label}")
+
+    def report_redundant(self, connection, models):
+        self.stdout.write(self.style.MIGRATE_HEADING("Redundant indexes"))
+        found = False
+        for model in sorted(models, key=lambda model: model._meta.label):
+            for index, reason in redundant_indexes(connection, model):
+                found = True
+                self.stdout.write(f"  {model._meta.db_table}.{index}: {reason}")
+        if not found:
+            self.stdout.write("  none")
+
+    def report_suggestions(self, suggestions):
+        self.stdout.write(self.style.MIGRATE_HEADING("Suggested indexes"))
+        if not suggestions:
+            self.stdout.write("  none")
+        # Indexes serving the most combinations first.
+        for (model, fields, condition), served in sorted(
+            merge_prefixes(suggestions).items(),
+            key=lambda item: (-len(item[1]), item[0][0]._meta.label, item[0][1]),
+        ):
+            self.stdout.write(f"  {model._meta.label}: {index_definition(model, fields, condition)}")
+            self.stdout.write(f"    serves {len(served)} combination(s), e.g. {sorted(served)[0]}")
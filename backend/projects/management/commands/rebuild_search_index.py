@@ -0,0 +1,22 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from projects.search import SEARCH_DOCUMENTS, get_full_text_backend
+
+
+class Command(BaseCommand):
+    help = "Drop and repopulate the full-text search index for Task, Project and Contributor."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "models", nargs="*", choices=sorted(SEARCH_DOCUMENTS),
+            help="Model labels to rebuild (default: all indexed models).",
+        )
+
+    def handle(self, *args, **options):
+        backend = get_full_text_backend(connection.vendor)
+        for label in options["models"] or SEARCH_DOCUMENTS:
+            with transaction.atomic():
+                count = backend.rebuild(apps.get_model(label))
+            self.stdout.write(f"{label}: indexed {count} rows")
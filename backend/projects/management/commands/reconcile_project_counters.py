@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from projects.models import Project
+from projects.utils.counters import reconcile_project_counters
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount each project's total/completed/overdue tasks and repair counters that "
+        "drifted from the tasks table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("projects", nargs="*", type=int, help="Project ids (default: all projects).")
+        parser.add_argument("--dry-run", action="store_true", help="Report drift without fixing it.")
+
+    def handle(self, *args, **options):
+        queryset = Project.objects.all()
+        if options["projects"]:
+            queryset = queryset.filter(pk__in=options["projects"])
+
+        report = reconcile_project_counters(queryset, dry_run=options["dry_run"])
+        for project_id, changes in report:
+            drift = ", ".join(f"{field} {stored} -> {actual}" for field, (stored, actual) in changes.items())
+            self.stdout.write(f"project {project_id}: {drift}")
+
+        verb = "would be repaired" if options["dry_run"] else "repaired"
+        self.stdout.write(f"{len(report)} of {queryset.count()} projects {verb}.")
@@ -0,0 +1,168 @@
+import json
+import logging
+import os
+import platform
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from accounts.models import User
+from projects.benchmarks.dataset import DATASET_PREFIX, generate_dataset
+from projects.benchmarks.harness import SCENARIOS, BenchmarkRunner, check_coverage, compare_to_baseline, make_cold
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "benchmarks", "baselines.json")
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a seeded dataset, drive every projects route cold and warm, report "
+        "p50/p95/p99 latency, queries per request and throughput, and fail on regressions "
+        "against the stored baseline. Runs inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--projects", type=int, default=100)
+        parser.add_argument("--tasks", type=int, default=10_000)
+        parser.add_argument("--contributors", type=int, default=300)
+        parser.add_argument("--seed", type=int, default=7)
+        parser.add_argument("--requests", type=int, default=30, help="Timed warm requests per scenario.")
+        parser.add_argument("--cold-requests", type=int, default=10, help="Timed cold requests per scenario.")
+        parser.add_argument("--only", nargs="*", default=None, help="Scenario names to run.")
+        parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+        parser.add_argument(
+            "--update-baseline", action="store_true",
+            help="Store this run as the baseline; with --only, replace just those scenarios' entries.",
+        )
+        parser.add_argument(
+            "--metric", default="p50_ms", choices=["p50_ms", "p95_ms", "p99_ms"],
+            help="Latency compared against the baseline; tails need more --requests to be stable.",
+        )
+        parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed slowdown, as a fraction.")
+        parser.add_argument("--slack-ms", type=float, default=5.0, help="Absolute slack added to the tolerance.")
+        parser.add_argument("--output", help="Also write the results to this JSON file.")
+
+    def handle(self, *args, **options):
+        missing = check_coverage()
+        if missing:
+            raise CommandError(f"No benchmark scenario for route(s): {', '.join(missing)}")
+
+        unknown = set(options["only"] or []) - {s["name"] for s in SCENARIOS}
+        if unknown:
+            raise CommandError(f"Unknown scenario(s): {', '.join(sorted(unknown))}")
+        scenarios = [s for s in SCENARIOS if not options["only"] or s["name"] in options["only"]]
+        params = {key: options[key] for key in ("projects", "tasks", "contributors", "seed")}
+
+        # Per-request performance log lines would drown the report.
+        logging.disable(logging.WARNING)
+        try:
+            with transaction.atomic():
+                results = self.run(scenarios, params, options)
+                transaction.set_rollback(True)
+        finally:
+            logging.disable(logging.NOTSET)
+            # Cached pages now describe rolled-back rows.
+            make_cold()
+
+        report = {
+            "params": params,
+            "environment": {
+                "python": platform.python_version(),
+                "database": connection.vendor,
+                "cache": settings.CACHES["default"]["BACKEND"],
+            },
+            "results": results,
+        }
+        if options["output"]:
+            self.write_json(options["output"], report)
+        if options["update_baseline"]:
+            self.update_baseline(report, options)
+            return
+        self.check_baseline(report, options)
+
+    def run(self, scenarios, params, options):
+        started = time.perf_counter()
+        dataset = generate_dataset(**params)
+        user = User.objects.create_superuser(f"{DATASET_PREFIX}-runner@example.com", "bench runner", "bench")
+        self.stdout.write(
+            f"Generated {params['projects']} projects, {params['tasks']} tasks and "
+            f"{params['contributors']} contributors in {time.perf_counter() - started:.1f}s"
+        )
+
+        runner = BenchmarkRunner(user, dataset, options["requests"], options["cold_requests"])
+        self.stdout.write(
+            f"{'scenario':<22}{'phase':<6}{'n':>5}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+            f"{'queries':>9}{'req/s':>8}{'errors':>8}"
+        )
+        results = []
+        for scenario in scenarios:
+            for row in runner.run_scenario(scenario):
+                results.append(row)
+                self.stdout.write(
+                    f"{row['scenario']:<22}{row['phase']:<6}{row['requests']:>5}{row['p50_ms']:>9.1f}"
+                    f"{row['p95_ms']:>9.1f}{row['p99_ms']:>9.1f}{row['queries']:>9.1f}"
+                    f"{row['throughput']:>8.1f}{row['errors']:>8}"
+                )
+        return results
+
+    def update_baseline(self, report, options):
+        """
+        Write the run as the baseline. With --only, the stored baseline
+        keeps every other scenario's entries, so a change re-records just
+        the scenarios it affects.
+        """
+        if options["only"]:
+            baseline = self.load_baseline(options["baseline"])
+            if baseline is None:
+                raise CommandError(f"No baseline at {options['baseline']}; record a full one without --only first.")
+            if baseline.get("params") != report["params"]:
+                raise CommandError(
+                    f"Baseline was recorded with {baseline.get('params')}; re-record it in full to change the dataset."
+                )
+            if baseline.get("environment") != report["environment"]:
+                self.stdout.write(self.style.WARNING(
+                    f"Baseline was recorded under {baseline.get('environment')}; merging anyway."
+                ))
+            order = {scenario["name"]: index for index, scenario in enumerate(SCENARIOS)}
+            kept = [row for row in baseline["results"] if row["scenario"] not in options["only"]]
+            # Stable sort: phases stay in run order within a scenario.
+            results = sorted(kept + report["results"], key=lambda row: order.get(row["scenario"], len(order)))
+            report = {**baseline, "results": results}
+        self.write_json(options["baseline"], report)
+        updated = ", ".join(options["only"]) if options["only"] else "all scenarios"
+        self.stdout.write(f"Baseline for {updated} written to {options['baseline']}")
+
+    @staticmethod
+    def load_baseline(path):
+        try:
+            with open(path) as fh:
+                return json.load(fh)
+        except FileNotFoundError:
+            return None
+
+    def check_baseline(self, report, options):
+        baseline = self.load_baseline(options["baseline"])
+        if baseline is None:
+            self.stdout.write(f"No baseline at {options['baseline']}; run with --update-baseline to store one.")
+            return
+        if baseline.get("params") != report["params"]:
+            self.stdout.write(self.style.WARNING(
+                f"Baseline was recorded with {baseline.get('params')}; skipping the comparison."
+            ))
+            return
+
+        regressions = compare_to_baseline(
+            report["results"], baseline, options["tolerance"], options["slack_ms"], options["metric"]
+        )
+        for message in regressions:
+            self.stderr.write(message)
+        if regressions:
+            raise CommandError(f"{len(regressions)} regression(s) against {options['baseline']}")
+        self.stdout.write(self.style.SUCCESS("No regressions against the baseline."))
+
+    @staticmethod
+    def write_json(path, data):
+        with open(path, "w") as fh:
+            json.dump(data, fh, indent=2)
+            fh.write("\n")
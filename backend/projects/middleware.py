@@ -0,0 +1,268 @@
+import json
+import logging
+import random
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_sequence, compress_string
+
+from projects.db_router import REPLICA_DATABASES, REPLICA_PIN_SECONDS, pin_key, start_routing, stop_routing
+from projects.utils.metrics import install_sql_recorder, start_request_metrics, stop_request_metrics, timer
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Fraction of requests instrumented; 0 disables the middleware.
+PERF_SAMPLE_RATE = getattr(settings, "PERF_SAMPLE_RATE", 0.05)
+# Identical SQL shapes repeated this often within a request are logged as N+1.
+PERF_N_PLUS_ONE_THRESHOLD = getattr(settings, "PERF_N_PLUS_ONE_THRESHOLD", 5)
+# Bodies smaller than this are sent uncompressed; streaming bodies always qualify.
+COMPRESSION_MIN_SIZE = getattr(settings, "COMPRESSION_MIN_SIZE", 1024)
+COMPRESSION_BROTLI_QUALITY = getattr(settings, "COMPRESSION_BROTLI_QUALITY", 5)
+COMPRESSIBLE_CONTENT_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+
+class PerformanceMiddleware:
+    """
+    For a sample of requests, record SQL count/time (via an execute wrapper
+    on each connection), cache hits/misses per key prefix and serializer
+    time. Report them in a `Server-Timing` header and one structured log
+    line, and warn about repeated query shapes (N+1 patterns).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.sampled():
+            return self.get_response(request)
+
+        for connection in connections.all(initialized_only=True):
+            install_sql_recorder(connection)
+        metrics, token = start_request_metrics()
+        try:
+            response = self.get_response(request)
+        finally:
+            stop_request_metrics(token)
+        return self.report(request, response, metrics)
+
+    async def __acall__(self, request):
+        if not self.sampled():
+            return await self.get_response(request)
+
+        # Connections opened in the sync thread get the recorder through the
+        # connection_created signal (projects.signals).
+        metrics, token = start_request_metrics()
+        try:
+            response = await self.get_response(request)
+        finally:
+            stop_request_metrics(token)
+        return self.report(request, response, metrics)
+
+    @staticmethod
+    def sampled():
+        return PERF_SAMPLE_RATE >= 1 or random.random() < PERF_SAMPLE_RATE
+
+    def report(self, request, response, metrics):
+        total = metrics.elapsed
+        hits = sum(counts["hits"] for counts in metrics.cache.values())
+        misses = sum(counts["misses"] for counts in metrics.cache.values())
+        repeated = metrics.repeated_queries(PERF_N_PLUS_ONE_THRESHOLD)
+
+        server_timing = [
+            f'db;dur={metrics.query_time * 1000:.1f};desc="{metrics.query_count} queries"',
+            f'cache;desc="{hits} hits, {misses} misses"',
+        ]
+        server_timing += [f"{name};dur={value * 1000:.1f}" for name, value in metrics.timings.items()]
+        server_timing.append(f"total;dur={total * 1000:.1f}")
+        response["Server-Timing"] = ", ".join(server_timing)
+
+        payload = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "total_ms": round(total * 1000, 1),
+            "queries": metrics.query_count,
+            "db_ms": round(metrics.query_time * 1000, 1),
+            "cache": dict(metrics.cache),
+            **{f"{name}_ms": round(value * 1000, 1) for name, value in metrics.timings.items()},
+            "repeated_queries": len(repeated),
+        }
+        logger.info(f"[PerformanceMiddleware] {json.dumps(payload)}")
+        for shape, count in repeated:
+            logger.warning(
+                f"[PerformanceMiddleware] Possible N+1 on {request.method} {request.path}: "
+                f"{count}x {shape[:300]}"
+            )
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Give each request its own RoutingState (projects.db_router). After a
+    request that wrote, the user's reads stay on the primary for
+    REPLICA_PIN_SECONDS so they see their own changes.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state, token = start_routing()
+        try:
+            response = self.get_response(request)
+        finally:
+            stop_routing(token)
+        if state.wrote and (user_id := self.pinned_user_id(request)):
+            cache.set(pin_key(user_id), True, REPLICA_PIN_SECONDS)
+        return response
+
+    async def __acall__(self, request):
+        state, token = start_routing()
+        try:
+            response = await self.get_response(request)
+        finally:
+            stop_routing(token)
+        if state.wrote and (user_id := self.pinned_user_id(request)):
+            await cache.aset(pin_key(user_id), True, REPLICA_PIN_SECONDS)
+        return response
+
+    @staticmethod
+    def pinned_user_id(request):
+        if not REPLICA_DATABASES:
+            return None
+        # DRF copies the authenticated user onto the Django request.
+        user = getattr(request, "user", None)
+        return user.pk if user is not None and user.is_authenticated else None
+
+
+def accepted_encodings(header):
+    """
+    {content-coding: q} from an Accept-Encoding header.
+    """
+    accepted = {}
+    for item in header.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def brotli_sequence(sequence):
+    compressor = brotli.Compressor(quality=COMPRESSION_BROTLI_QUALITY)
+    for chunk in sequence:
+        data = compressor.process(chunk) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+class CompressionMiddleware:
+    """
+    Compress JSON, NDJSON and text bodies of at least COMPRESSION_MIN_SIZE
+    bytes with the best coding the client accepts: brotli when the `brotli`
+    package is installed, else gzip. Streaming exports are compressed chunk
+    by chunk. Like Django's GZipMiddleware, gzip output is padded with
+    random bytes against BREACH and strong ETags are made weak.
+    """
+
+    sync_capable = True
+    async_capable = True
+    codings = ("br", "gzip") if brotli is not None else ("gzip",)
+    max_random_bytes = 100
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.compress(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.compress(request, await self.get_response(request))
+
+    def negotiate(self, request):
+        accepted = accepted_encodings(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        best, best_q = None, 0
+        # Server preference breaks ties.
+        for coding in self.codings:
+            q = accepted.get(coding, accepted.get("*", 0))
+            if q > best_q:
+                best, best_q = coding, q
+        return best
+
+    def compress(self, request, response):
+        if response.has_header("Content-Encoding"):
+            return response
+        if not response.get("Content-Type", "").startswith(COMPRESSIBLE_CONTENT_TYPES):
+            return response
+        if response.streaming:
+            # Only sync iterators are wrapped; no view streams asynchronously.
+            if response.is_async:
+                return response
+        elif len(response.content) < COMPRESSION_MIN_SIZE:
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        coding = self.negotiate(request)
+        if coding is None:
+            return response
+
+        if response.streaming:
+            if coding == "br":
+                response.streaming_content = brotli_sequence(response.streaming_content)
+            else:
+                response.streaming_content = compress_sequence(
+                    response.streaming_content, max_random_bytes=self.max_random_bytes
+                )
+            del response["Content-Length"]
+        else:
+            with timer("compress"):
+                if coding == "br":
+                    content = brotli.compress(response.content, quality=COMPRESSION_BROTLI_QUALITY)
+                else:
+                    content = compress_string(response.content, max_random_bytes=self.max_random_bytes)
+            if len(content) >= len(response.content):
+                return response
+            response.content = content
+            response["Content-Length"] = str(len(content))
+
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = f"W/{etag}"
+        response["Content-Encoding"] = coding
+        return response
@@ -0,0 +1,26 @@
+from django.db import migrations
+
+from projects.search import SEARCH_DOCUMENTS, get_full_text_backend
+
+
+def create_search_index(apps, schema_editor):
+    backend = get_full_text_backend(schema_editor.connection.vendor)
+    for label in SEARCH_DOCUMENTS:
+        backend.rebuild(apps.get_model(label), schema_editor.connection)
+
+
+def drop_search_index(apps, schema_editor):
+    backend = get_full_text_backend(schema_editor.connection.vendor)
+    for label in SEARCH_DOCUMENTS:
+        backend.drop_index(apps.get_model(label), schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
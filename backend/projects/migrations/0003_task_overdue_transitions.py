@@ -0,0 +1,35 @@
+# Generated by Django 5.2.7 on 2026-10-18 15:47
+
+from django.db import migrations, models
+from django.db.models import F
+from django.utils import timezone
+
+
+def mark_existing_overdue_notified(apps, schema_editor):
+    # The previous job re-mailed every overdue task each run, so the
+    # current backlog has already been notified.
+    Task = apps.get_model('projects', 'Task')
+    Task.objects.using(schema_editor.connection.alias).filter(is_overdue=True).update(
+        overdue_since=F('due_date'), overdue_notified_at=timezone.now()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0002_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='overdue_notified_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='overdue_since',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.RunPython(mark_existing_overdue_notified, migrations.RunPython.noop),
+    ]
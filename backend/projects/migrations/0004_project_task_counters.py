@@ -0,0 +1,50 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:26
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_existing_tasks(apps, schema_editor):
+    Project = apps.get_model('projects', 'Project')
+    Task = apps.get_model('projects', 'Task')
+    alias = schema_editor.connection.alias
+
+    def task_count(**filters):
+        counts = (
+            Task.objects.using(alias).filter(project=OuterRef('pk'), **filters)
+            .order_by().values('project').annotate(n=Count('pk')).values('n')
+        )
+        return Coalesce(Subquery(counts), 0)
+
+    Project.objects.using(alias).update(
+        total_tasks=task_count(),
+        completed_tasks=task_count(is_completed=True),
+        overdue_tasks=task_count(is_overdue=True),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0003_task_overdue_transitions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='completed_tasks',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='overdue_tasks',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='total_tasks',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_existing_tasks, migrations.RunPython.noop),
+    ]
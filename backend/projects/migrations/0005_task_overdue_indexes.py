@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0004_project_task_counters'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='task',
+            name='projects_ta_title_d09e62_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='projects_ta_is_comp_0f4333_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='projects_ta_due_dat_4757e0_idx',
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_completed', False)), fields=['due_date'], name='task_open_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_overdue', True)), fields=['due_date'], name='task_overdue_due_idx'),
+        ),
+    ]
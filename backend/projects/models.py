@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Q
 from accounts.models import User
 
 
@@ -19,6 +20,11 @@ class Project(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Denormalized task counts, kept up to date by projects.utils.counters
+    # and repaired by `manage.py reconcile_project_counters`.
+    total_tasks = models.IntegerField(default=0, editable=False)
+    completed_tasks = models.IntegerField(default=0, editable=False)
+    overdue_tasks = models.IntegerField(default=0, editable=False)
 
     class Meta:
         ordering = ['-created_at']
@@ -48,6 +54,8 @@ class Task(models.Model):
     due_date = models.DateField(null=True, blank=True, db_index=True)
     is_completed = models.BooleanField(default=False, db_index=True)
     is_overdue = models.BooleanField(default=False, db_index=True)
+    overdue_since = models.DateField(null=True, blank=True)
+    overdue_notified_at = models.DateTimeField(null=True, blank=True)
     assigned_to = models.ManyToManyField(Contributor, related_name='tasks', blank=True)
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -55,9 +63,29 @@ class Task(models.Model):
     class Meta:
         ordering = ['-due_date', '-created_at']
         indexes = [
-            models.Index(fields=['title']),
-            models.Index(fields=['is_completed']),
-            models.Index(fields=['due_date']),
+            # Partial rather than (is_completed, due_date): SQLite can't seek
+            # the `NOT is_completed` Django generates on a leading column.
+            # Open tasks by due date: mark_overdue_tasks and the due list.
+            models.Index(fields=['due_date'], condition=Q(is_completed=False), name='task_open_due_idx'),
+            # Flagged tasks only: the overdue list, clearing flags and
+            # pending notifications, without reading the rest of the table.
+            models.Index(fields=['due_date'], condition=Q(is_overdue=True), name='task_overdue_due_idx'),
         ]
     def __str__(self):
         return f"{self.title}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lets the project counter signals diff a save without re-reading the row.
+        instance._counted_state = instance.get_counted_state()
+        return instance
+
+    def get_counted_state(self):
+        """
+        (project_id, is_completed, is_overdue) as far as the project counters
+        are concerned, or None when one of them was deferred.
+        """
+        if self.get_deferred_fields() & {'project_id', 'is_completed', 'is_overdue'}:
+            return None
+        return (self.project_id, self.is_completed, self.is_overdue)
@@ -0,0 +1,313 @@
+"""
+Pluggable search backends behind the `?search=` query parameter.
+
+The active backend is chosen with settings.SEARCH_BACKEND. Full-text
+backends keep an inverted index per model (SQLite FTS5 virtual tables or a
+Postgres tsvector table) in sync through projects.signals, and return
+querysets annotated with `search_rank` and ordered by relevance.
+
+Full-text matching is by word prefix only: "pum" finds "pump", "ump"
+finds nothing. Which matcher runs depends on the search string alone,
+never on the data: plain words use the index, anything else (e-mail
+addresses, "C++") the substring match of IContainsSearchBackend.
+"""
+import re
+
+from django.conf import settings
+from django.db import connection as default_connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+# Indexed document fields per model; mirrors the views' search_fields.
+SEARCH_DOCUMENTS = {
+    'projects.Task': ['title', 'description', 'project__name'],
+    'projects.Project': ['name', 'status', 'location'],
+    'projects.Contributor': ['user__name', 'user__email'],
+}
+
+# Parent model -> (dependent model, lookup to parent, parent fields that
+# feed the dependent's document).
+SEARCH_DEPENDENCIES = {
+    'projects.Project': [('projects.Task', 'project', ['name'])],
+    'accounts.User': [('projects.Contributor', 'user', ['name', 'email'])],
+}
+
+SEARCH_INDEX_BATCH_SIZE = 2000
+
+_TERM_RE = re.compile(r'\w+')
+
+
+def search_terms(search):
+    return _TERM_RE.findall(search or '')
+
+
+def is_word_search(search):
+    """
+    Whether `search` is only words and whitespace, i.e. the index's
+    tokens can answer it.
+    """
+    return all(_TERM_RE.fullmatch(part) for part in (search or '').split())
+
+
+class IContainsSearchBackend:
+    """
+    OR-chain of `__icontains` lookups across the view's search_fields.
+    Needs no index and is the fallback for unindexed models.
+    """
+
+    def filter(self, queryset, search, search_fields):
+        q_obj = Q()
+        for field in search_fields:
+            q_obj |= Q(**{f"{field}__icontains": search})
+        return queryset.filter(q_obj)
+
+    def is_indexed(self, model):
+        return False
+
+    def index_objects(self, model, pks):
+        pass
+
+    def remove_objects(self, model, pks):
+        pass
+
+    def create_index(self, model, connection=None):
+        pass
+
+    def drop_index(self, model, connection=None):
+        pass
+
+    def rebuild(self, model, connection=None):
+        return 0
+
+
+class BaseFullTextSearchBackend(IContainsSearchBackend):
+    vendor = None
+    rank_descending = False
+
+    def is_indexed(self, model):
+        return model._meta.label in SEARCH_DOCUMENTS and default_connection.vendor == self.vendor
+
+    def get_fields(self, model):
+        return SEARCH_DOCUMENTS[model._meta.label]
+
+    def filter(self, queryset, search, search_fields):
+        model = queryset.model
+        columns = [f for f in self.get_fields(model) if f in search_fields] if self.is_indexed(model) else []
+        query = None
+        if columns and is_word_search(search):
+            query = self.build_query(search_terms(search), columns, model)
+        if query is None:
+            return super().filter(queryset, search, search_fields)
+
+        # Join the index table so the match is evaluated once and ranked in
+        # the same pass, instead of a correlated subquery per row. The rank
+        # is an annotation so keyset pagination can order and seek on it.
+        pk_column = f'{self.quote(model._meta.db_table)}.{self.quote(model._meta.pk.column)}'
+        table, where, params, rank_sql, rank_params = self.join_sql(model, query, pk_column)
+        matched = queryset.extra(tables=[table], where=where, params=params).annotate(
+            search_rank=RawSQL(rank_sql, rank_params)
+        )
+        return matched.order_by('-search_rank' if self.rank_descending else 'search_rank', 'pk')
+
+    def index_objects(self, model, pks):
+        if not self.is_indexed(model) or not pks:
+            return
+        fields = self.get_fields(model)
+        rows = model._default_manager.filter(pk__in=pks).values_list('pk', *fields)
+        self.remove_objects(model, pks)
+        self.write_rows(model, rows, default_connection)
+
+    def rebuild(self, model, connection=None):
+        """
+        Drop and repopulate the index for `model` in batches.
+        """
+        connection = connection or default_connection
+        self.drop_index(model, connection)
+        self.create_index(model, connection)
+        fields = self.get_fields(model)
+        rows = model._default_manager.using(connection.alias).order_by().values_list('pk', *fields)
+        batch, total = [], 0
+        for row in rows.iterator(chunk_size=SEARCH_INDEX_BATCH_SIZE):
+            batch.append(row)
+            if len(batch) >= SEARCH_INDEX_BATCH_SIZE:
+                total += self.write_rows(model, batch, connection)
+                batch = []
+        total += self.write_rows(model, batch, connection)
+        return total
+
+    def quote(self, name):
+        return default_connection.ops.quote_name(name)
+
+    def build_query(self, terms, columns, model):
+        raise NotImplementedError
+
+    def join_sql(self, model, query, pk_column):
+        """
+        Return (table, where, params, rank_sql, rank_params) for
+        QuerySet.extra() joining the index to `model`.
+        """
+        raise NotImplementedError
+
+    def write_rows(self, model, rows, connection):
+        raise NotImplementedError
+
+
+class SQLiteFTS5SearchBackend(BaseFullTextSearchBackend):
+    """
+    One FTS5 virtual table per model, `<db_table>_fts`, whose rowid is the
+    object's pk. Ranked with bm25 (lower is better).
+    """
+
+    vendor = 'sqlite'
+
+    def table(self, model):
+        return f'{model._meta.db_table}_fts'
+
+    def create_index(self, model, connection=None):
+        connection = connection or default_connection
+        columns = ', '.join(self.quote(f) for f in self.get_fields(model))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.quote(self.table(model))} "
+                f"USING fts5({columns}, tokenize='unicode61 remove_diacritics 2')"
+            )
+
+    def drop_index(self, model, connection=None):
+        connection = connection or default_connection
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {self.quote(self.table(model))}")
+
+    def build_query(self, terms, columns, model):
+        if not terms:
+            return None
+        match = ' '.join(f'"{term}"*' for term in terms)
+        return f"{{{' '.join(columns)}}} : ({match})"
+
+    def join_sql(self, model, query, pk_column):
+        table = self.table(model)
+        quoted = self.quote(table)
+        where = [f"{quoted}.rowid = {pk_column}", f"{quoted} MATCH %s"]
+        return table, where, [query], f"{quoted}.rank", []
+
+    def remove_objects(self, model, pks):
+        if not self.is_indexed(model) or not pks:
+            return
+        placeholders = ', '.join(['%s'] * len(pks))
+        with default_connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {self.quote(self.table(model))} WHERE rowid IN ({placeholders})", list(pks)
+            )
+
+    def write_rows(self, model, rows, connection):
+        rows = [[pk] + ['' if v is None else str(v) for v in values] for pk, *values in rows]
+        if not rows:
+            return 0
+        columns = ', '.join(self.quote(f) for f in self.get_fields(model))
+        placeholders = ', '.join(['%s'] * (len(rows[0])))
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {self.quote(self.table(model))} (rowid, {columns}) VALUES ({placeholders})",
+                rows,
+            )
+        return len(rows)
+
+
+class PostgresSearchBackend(BaseFullTextSearchBackend):
+    """
+    Shared `projects_search_document` table holding one weighted tsvector
+    per object (field order -> weights A..D) behind a GIN index.
+    """
+
+    vendor = 'postgresql'
+    rank_descending = True
+    config = 'simple'
+    weights = 'ABCD'
+    table = 'projects_search_document'
+
+    def create_index(self, model, connection=None):
+        connection = connection or default_connection
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "model varchar(100) NOT NULL, object_id bigint NOT NULL, "
+                "document tsvector NOT NULL, PRIMARY KEY (model, object_id))"
+            )
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {self.table}_gin "
+                f"ON {self.table} USING gin (document)"
+            )
+
+    def drop_index(self, model, connection=None):
+        connection = connection or default_connection
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT to_regclass(%s)", [self.table])
+            if cursor.fetchone()[0] is not None:
+                cursor.execute(f"DELETE FROM {self.table} WHERE model = %s", [model._meta.label])
+
+    def build_query(self, terms, columns, model):
+        if not terms:
+            return None
+        fields = self.get_fields(model)
+        labels = ''.join(self.weights[fields.index(c)] for c in columns)
+        return ' & '.join(f"{term}:*{labels}" for term in terms)
+
+    def join_sql(self, model, query, pk_column):
+        tsquery = f"to_tsquery('{self.config}', %s)"
+        where = [
+            f"{self.table}.model = %s",
+            f"{self.table}.object_id = {pk_column}",
+            f"{self.table}.document @@ {tsquery}",
+        ]
+        rank_sql = f"ts_rank({self.table}.document, {tsquery})"
+        return self.table, where, [model._meta.label, query], rank_sql, [query]
+
+    def remove_objects(self, model, pks):
+        if not self.is_indexed(model) or not pks:
+            return
+        with default_connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {self.table} WHERE model = %s AND object_id = ANY(%s)",
+                [model._meta.label, list(pks)],
+            )
+
+    def write_rows(self, model, rows, connection):
+        rows = [[model._meta.label, pk] + ['' if v is None else str(v) for v in values] for pk, *values in rows]
+        if not rows:
+            return 0
+        fields = self.get_fields(model)
+        document = ' || '.join(
+            f"setweight(to_tsvector('{self.config}', %s), '{self.weights[i]}')" for i in range(len(fields))
+        )
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {self.table} (model, object_id, document) VALUES (%s, %s, {document}) "
+                "ON CONFLICT (model, object_id) DO UPDATE SET document = EXCLUDED.document",
+                rows,
+            )
+        return len(rows)
+
+
+FULL_TEXT_BACKENDS = {
+    'sqlite': SQLiteFTS5SearchBackend,
+    'postgresql': PostgresSearchBackend,
+}
+
+_backend = None
+
+
+def get_search_backend():
+    global _backend
+    if _backend is None:
+        path = getattr(settings, 'SEARCH_BACKEND', 'projects.search.IContainsSearchBackend')
+        _backend = import_string(path)()
+    return _backend
+
+
+def get_full_text_backend(vendor):
+    """
+    Index-maintaining backend for a database vendor, used by migrations and
+    `rebuild_search_index` regardless of the configured SEARCH_BACKEND.
+    """
+    backend_class = FULL_TEXT_BACKENDS.get(vendor)
+    return backend_class() if backend_class else IContainsSearchBackend()
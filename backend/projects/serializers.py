@@ -1,15 +1,111 @@
 from rest_framework import serializers
+from rest_framework.exceptions import ParseError
 from projects.models import Project, Contributor, Task
 from accounts.models import User
 from django.db import transaction
+from django.db.models import Prefetch
+
+def split_fieldset(name, fields=None, expand=None):
+    """
+    Resolve how relation `name` is rendered for a `fields`/`expand` shape.
+    Returns (included, expanded, child_fields, child_expand); child values
+    are None when the nested serializer should use its full shape.
+    """
+    included = fields is None or any(path.split('.')[0] == name for path in fields)
+    expanded = expand is None or any(path.split('.')[0] == name for path in expand)
+    prefix = f"{name}."
+    child_fields = {p[len(prefix):] for p in fields or () if p.startswith(prefix)} or None
+    child_expand = {p[len(prefix):] for p in expand or () if p.startswith(prefix)} or None
+    return included, expanded, child_fields, child_expand
+
+
+class SparseFieldsetMixin:
+    """
+    Shape the representation with `fields` (dotted paths such as
+    ``project.name``) and `expand` (relations to embed; the others collapse
+    to primary keys). Both default to None, the full representation.
+    Unknown names in `fields` raise ParseError (400).
+    """
+
+    expandable_fields = []
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            keep = {path.split('.')[0] for path in fields}
+            unknown = keep - {name for name, field in self.fields.items() if not field.write_only}
+            if unknown:
+                raise ParseError(f"Unknown field(s) in `fields`: {', '.join(sorted(unknown))}.")
+            for name in set(self.fields) - keep:
+                self.fields.pop(name)
+
+        for name in self.expandable_fields:
+            if name not in self.fields:
+                continue
+            field = self.fields[name]
+            many = isinstance(field, serializers.ListSerializer)
+            _, expanded, child_fields, child_expand = split_fieldset(name, fields, expand)
+            if not expanded:
+                self.fields[name] = serializers.PrimaryKeyRelatedField(read_only=True, many=many)
+            elif child_fields is not None or child_expand is not None:
+                nested_class = field.child.__class__ if many else field.__class__
+                self.fields[name] = nested_class(
+                    read_only=True, many=many, fields=child_fields, expand=child_expand
+                )
+
+    @classmethod
+    def validate_fieldset(cls, fields=None, expand=None):
+        """
+        Raise ParseError for a shape the serializer cannot render, before
+        any rows are read; building it checks every nested level.
+        """
+        cls(fields=fields, expand=expand)
+
+    @classmethod
+    def setup_eager_loading(cls, queryset, fields=None, expand=None):
+        """
+        Add the select_related/prefetch_related needed for this shape.
+        """
+        return queryset
+
+
+class FragmentCacheMixin:
+    """
+    Opt a serializer into the per-object list cache
+    (projects.utils.fragment_cache). The version of a representation is the
+    object's `updated_at`; serializers that embed relations add theirs.
+    """
+
+    @classmethod
+    def get_version_loading(cls, fields=None, expand=None):
+        """
+        (field paths, prefetches) that get_fragment_version() reads.
+        """
+        return ['updated_at'], []
+
+    @classmethod
+    def get_fragment_version(cls, instance, fields=None, expand=None):
+        return (instance.updated_at,)
+
+
+class ProjectSerializer(FragmentCacheMixin, SparseFieldsetMixin, serializers.ModelSerializer):
+    progress = serializers.SerializerMethodField()
 
-class ProjectSerializer(serializers.ModelSerializer):
     class Meta:
         model = Project
         fields = '__all__'
 
+    def get_progress(self, project):
+        """
+        Percent of tasks completed; list views annotate it (annotate_progress).
+        """
+        progress = getattr(project, 'progress', None)
+        if progress is None:
+            progress = round(project.completed_tasks * 100 / project.total_tasks, 1) if project.total_tasks else 0.0
+        return progress
+
 
-class UserSimpleSerializer(serializers.ModelSerializer):
+class UserSimpleSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, required=False)
     email = serializers.EmailField(validators=[])
     
@@ -18,14 +114,37 @@ class UserSimpleSerializer(serializers.ModelSerializer):
         fields = ["id", "name", "email", "password"]
 
 
-class ContributorSerializer(serializers.ModelSerializer):
+class ContributorWorkloadSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """
+    Read-only; expects the counts annotated by ContributorWorkloadAPIView.
+    """
+    name = serializers.CharField(source='user.name', read_only=True)
+    email = serializers.EmailField(source='user.email', read_only=True)
+    open_tasks = serializers.IntegerField(read_only=True)
+    overdue_tasks = serializers.IntegerField(read_only=True)
+    due_this_week = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Contributor
+        fields = ["id", "name", "email", "open_tasks", "overdue_tasks", "due_this_week"]
+
+
+class ContributorSerializer(FragmentCacheMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     user = UserSimpleSerializer()
+    expandable_fields = ['user']
 
     class Meta:
         model = Contributor
         fields = ["id", "user", "skills", "joined_on", "created_at", "updated_at"]
         read_only_fields = ["created_at", "updated_at"]
 
+    @classmethod
+    def setup_eager_loading(cls, queryset, fields=None, expand=None):
+        included, expanded, _, _ = split_fieldset('user', fields, expand)
+        if included and expanded:
+            queryset = queryset.select_related('user')
+        return queryset
+
     @transaction.atomic
     def create(self, validated_data):
         user_data = validated_data.pop("user", None)
@@ -71,9 +190,10 @@ class ContributorSerializer(serializers.ModelSerializer):
 
 
 
-class TaskSerializer(serializers.ModelSerializer):
+class TaskSerializer(FragmentCacheMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     project  =  ProjectSerializer(read_only = True)
     assigned_to = ContributorSerializer(many=True, read_only = True)
+    expandable_fields = ['project', 'assigned_to']
 
     project_id = serializers.PrimaryKeyRelatedField(
         queryset=Project.objects.all(), source='project', write_only=True
@@ -99,5 +219,93 @@ class TaskSerializer(serializers.ModelSerializer):
             'updated_at',
         ]
 
+    @classmethod
+    def setup_eager_loading(cls, queryset, fields=None, expand=None):
+        included, expanded, _, _ = split_fieldset('project', fields, expand)
+        if included and expanded:
+            queryset = queryset.select_related('project')
+
+        included, expanded, child_fields, child_expand = split_fieldset('assigned_to', fields, expand)
+        if included:
+            if expanded:
+                contributors = ContributorSerializer.setup_eager_loading(
+                    Contributor.objects.all(), child_fields, child_expand
+                )
+            else:
+                contributors = Contributor.objects.only('id')
+            queryset = queryset.prefetch_related(Prefetch('assigned_to', queryset=contributors))
+        return queryset
+
+    @classmethod
+    def get_version_loading(cls, fields=None, expand=None):
+        only, prefetches = super().get_version_loading(fields, expand)
+        included, expanded, _, _ = split_fieldset('project', fields, expand)
+        if included and expanded:
+            only.append('project__updated_at')
+        # Assignments do not touch the task's updated_at.
+        if split_fieldset('assigned_to', fields, expand)[0]:
+            prefetches.append(Prefetch('assigned_to', queryset=Contributor.objects.only('id', 'updated_at')))
+        return only, prefetches
+
+    @classmethod
+    def get_fragment_version(cls, task, fields=None, expand=None):
+        version = [task.updated_at]
+        included, expanded, _, _ = split_fieldset('project', fields, expand)
+        if included and expanded:
+            version.append(task.project.updated_at)
+        included, expanded, _, _ = split_fieldset('assigned_to', fields, expand)
+        if included:
+            version.append([(c.pk, c.updated_at if expanded else None) for c in task.assigned_to.all()])
+        return tuple(version)
+
+
+class TaskBulkSerializer(serializers.ModelSerializer):
+    """
+    One item of a bulk task write. Related ids are checked against
+    objects preloaded by the view (context['projects'], context['contributors']
+    and, for updates, context['tasks']) instead of one query per id.
+    """
+    id = serializers.IntegerField(required=False)
+    project_id = serializers.IntegerField()
+    assigned_to_ids = serializers.ListField(child=serializers.IntegerField(), required=False)
+
+    class Meta:
+        model = Task
+        fields = ['id', 'project_id', 'title', 'description', 'due_date', 'is_completed', 'assigned_to_ids']
+
+    def validate_project_id(self, value):
+        if value not in self.context['projects']:
+            raise serializers.ValidationError(f'Invalid pk "{value}" - object does not exist.')
+        return value
+
+    def validate_assigned_to_ids(self, value):
+        missing = [pk for pk in value if pk not in self.context['contributors']]
+        if missing:
+            raise serializers.ValidationError(f'Invalid pk "{missing[0]}" - object does not exist.')
+        return list(dict.fromkeys(value))
+
+    def validate(self, attrs):
+        tasks = self.context.get('tasks')
+        if tasks is not None:
+            if 'id' not in attrs:
+                raise serializers.ValidationError({"id": "This field is required."})
+            if attrs['id'] not in tasks:
+                raise serializers.ValidationError({"id": f'Invalid pk "{attrs["id"]}" - object does not exist.'})
+        else:
+            attrs.pop('id', None)
+        return attrs
+
 
+class ContributorImportSerializer(serializers.Serializer):
+    """
+    One row of a bulk contributor import. Uniqueness of `email` is checked
+    by the importer in one query for the whole file.
+    """
+    name = serializers.CharField(max_length=255)
+    email = serializers.EmailField(max_length=255)
+    password = serializers.CharField()
+    skills = serializers.JSONField(required=False, allow_null=True)
+    joined_on = serializers.DateTimeField(required=False, allow_null=True)
 
+    def validate_email(self, value):
+        return User.objects.normalize_email(value)
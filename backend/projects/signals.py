@@ -1,20 +1,157 @@
-from django.db.models.signals import post_save, post_delete
+from django.apps import apps
+from django.db.backends.signals import connection_created
+from django.db.models import QuerySet
+from django.db.models.signals import m2m_changed, post_save, post_delete, pre_save
 from django.dispatch import receiver
-from projects.models import Task
-from projects.utils.cache_utils import delete_cache_by_pattern
+from django.utils import timezone
+from accounts.models import User
+from projects.db_router import install_replica_guard
+from projects.models import Contributor, Project, Task
+from projects.search import SEARCH_DEPENDENCIES, SEARCH_DOCUMENTS, get_search_backend
+from projects.utils.cache_utils import invalidate_cache_tags
+from projects.utils.counters import apply_counter_deltas, counter_deltas
+from projects.utils.metrics import install_sql_recorder
 import logging
 
 
 logger = logging.getLogger(__name__)
 
-@receiver([post_save, post_delete], sender=Task)
-def clear_due_task_cache(sender, **kwargs):
+# Model -> cache tag bumped on every write. Cached views list the tags
+# they depend on in `cache_tags`.
+MODEL_CACHE_TAGS = {
+    'projects.Task': 'tasks',
+    'projects.Project': 'projects',
+    'projects.Contributor': 'contributors',
+    'accounts.User': 'contributors',
+}
+
+
+def invalidate_model_cache(sender, **kwargs):
     """
-    Automatically clear cached 'due_tasks' data whenever
-    a Task is created, updated, or deleted.
+    Automatically invalidate cached data built on a model whenever
+    an instance is created, updated, or deleted.
     """
+    tag = MODEL_CACHE_TAGS[sender._meta.label]
     try:
-        delete_cache_by_pattern("due_tasks:*")
-        logger.info('[clear_due_task_cache]============== Delete cache ===============')
+        invalidate_cache_tags(tag)
+        logger.info(f'[invalidate_model_cache] Bumped cache generation for "{tag}"')
     except Exception as e:
-        logger.info(f"[clear_due_task_cache] Cache invalidation failed: {e}")
+        logger.info(f"[invalidate_model_cache] Cache invalidation failed: {e}")
+
+
+@receiver(m2m_changed, sender=Task.assigned_to.through)
+def invalidate_task_assignment_cache(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_model_cache(Task)
+
+
+def stored_counted_state(pk, using):
+    return Task.objects.using(using).filter(pk=pk).values_list('project_id', 'is_completed', 'is_overdue').first()
+
+
+@receiver(pre_save, sender=Task)
+def remember_task_counted_state(sender, instance, raw=False, using=None, **kwargs):
+    """
+    Tasks loaded from the database carry their counted state already
+    (Task.from_db); only tasks built by hand need it read back.
+    """
+    if raw or instance.pk is None or getattr(instance, '_counted_state', None) is not None:
+        return
+    instance._counted_state = stored_counted_state(instance.pk, using)
+
+
+@receiver(post_save, sender=Task)
+def count_saved_task(sender, instance, created, raw=False, using=None, **kwargs):
+    """
+    Move the task between its project's counters.
+    """
+    if raw:
+        return
+    after = instance.get_counted_state() or stored_counted_state(instance.pk, using)
+    before = None if created else getattr(instance, '_counted_state', None)
+    if created or before is not None:
+        apply_counter_deltas(counter_deltas([(before, after)]))
+    instance._counted_state = after
+
+
+@receiver(post_delete, sender=Task)
+def count_deleted_task(sender, instance, origin=None, **kwargs):
+    # Tasks cascading from a project delete go away with their counters.
+    if isinstance(origin, Project) or (isinstance(origin, QuerySet) and origin.model is Project):
+        return
+    before = getattr(instance, '_counted_state', None) or instance.get_counted_state()
+    if before is not None:
+        apply_counter_deltas(counter_deltas([(before, None)]))
+
+
+@receiver(post_save, sender=User)
+def touch_contributor(sender, instance, raw=False, update_fields=None, **kwargs):
+    """
+    Contributor representations embed the user's name and email, so their
+    updated_at (the fragment cache version, and the ETag) must move too.
+    """
+    if raw or (update_fields is not None and not {'name', 'email'} & set(update_fields)):
+        return
+    Contributor.objects.filter(user=instance).update(updated_at=timezone.now())
+
+
+def update_search_index(sender, instance, **kwargs):
+    """
+    Re-index a searchable object after it is saved.
+    """
+    get_search_backend().index_objects(sender, [instance.pk])
+
+
+def remove_from_search_index(sender, instance, **kwargs):
+    """
+    Drop a searchable object from the index after it is deleted.
+    """
+    get_search_backend().remove_objects(sender, [instance.pk])
+
+
+def track_search_dependencies(sender, instance, **kwargs):
+    """
+    Remember whether fields copied into dependent documents are changing,
+    e.g. a Project rename must re-index its tasks.
+    """
+    instance._search_dependents_stale = False
+    dependents = SEARCH_DEPENDENCIES[sender._meta.label]
+    backend = get_search_backend()
+    if instance.pk is None or not any(backend.is_indexed(apps.get_model(label)) for label, _, _ in dependents):
+        return
+    fields = {f for _, _, watched in dependents for f in watched}
+    previous = sender._default_manager.filter(pk=instance.pk).values(*fields).first()
+    instance._search_dependents_stale = previous is not None and any(
+        previous[f] != getattr(instance, f) for f in fields
+    )
+
+
+def update_dependent_search_index(sender, instance, **kwargs):
+    if not getattr(instance, '_search_dependents_stale', False):
+        return
+    for label, lookup, _ in SEARCH_DEPENDENCIES[sender._meta.label]:
+        model = apps.get_model(label)
+        pks = list(model._default_manager.filter(**{lookup: instance}).values_list('pk', flat=True))
+        get_search_backend().index_objects(model, pks)
+
+
+for label in SEARCH_DOCUMENTS:
+    model = apps.get_model(label)
+    post_save.connect(update_search_index, sender=model, dispatch_uid=f'search_index_{label}')
+    post_delete.connect(remove_from_search_index, sender=model, dispatch_uid=f'search_remove_{label}')
+
+for label in SEARCH_DEPENDENCIES:
+    model = apps.get_model(label)
+    pre_save.connect(track_search_dependencies, sender=model, dispatch_uid=f'search_track_{label}')
+    post_save.connect(update_dependent_search_index, sender=model, dispatch_uid=f'search_dependents_{label}')
+
+# Lets PerformanceMiddleware count queries on every connection, including
+# the ones async views open in their sync thread.
+connection_created.connect(install_sql_recorder, dispatch_uid='metrics_sql_recorder')
+# Failed replica queries mark the replica down and trigger a primary retry.
+connection_created.connect(install_replica_guard, dispatch_uid='replica_guard')
+
+for label in MODEL_CACHE_TAGS:
+    model = apps.get_model(label)
+    post_save.connect(invalidate_model_cache, sender=model, dispatch_uid=f'cache_tags_save_{label}')
+    post_delete.connect(invalidate_model_cache, sender=model, dispatch_uid=f'cache_tags_delete_{label}')
@@ -0,0 +1,8 @@
+"""
+SQLite backend for several concurrent writers (ENGINE 'projects.sqlite_backend').
+
+Extra DATABASES OPTIONS:
+- `pragmas`: {name: value} applied to every new connection
+- `serialize_writes`: queue this process's write transactions on a lock
+  instead of letting them fail with "database is locked"
+"""
@@ -0,0 +1,114 @@
+import os
+import threading
+
+from django.db.backends.sqlite3 import base
+from django.db.utils import OperationalError
+
+WRITE_STATEMENTS = ("INSERT", "UPDATE", "DELETE", "REPLACE")
+
+_write_locks = {}
+_write_locks_guard = threading.Lock()
+
+
+def get_write_lock(database):
+    """
+    One lock per database file, shared by every connection of this process.
+    """
+    with _write_locks_guard:
+        return _write_locks.setdefault(str(database), threading.Lock())
+
+
+def reset_write_locks():
+    """
+    Give a forked child (Celery prefork, multiprocessing) fresh locks: the
+    parent's may have been held by a thread that does not exist in the child.
+    """
+    global _write_locks, _write_locks_guard
+    _write_locks = {}
+    _write_locks_guard = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=reset_write_locks)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pragmas = {}
+        self.serialize_writes = False
+        # The lock this connection holds, looked up per transaction so a
+        # forked child never waits on a lock copied from its parent.
+        self.write_lock_held = None
+        self.execute_wrappers.append(self.serialize_autocommit_writes)
+
+    def get_connection_params(self):
+        kwargs = super().get_connection_params()
+        self.pragmas = kwargs.pop("pragmas", {})
+        self.serialize_writes = kwargs.pop("serialize_writes", False)
+        return kwargs
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    @property
+    def write_lock_timeout(self):
+        # Wait as long as SQLite itself would for another process's lock.
+        return self.pragmas.get("busy_timeout", 5000) / 1000
+
+    def acquire_write_lock(self):
+        if not self.serialize_writes or self.write_lock_held:
+            return
+        lock = get_write_lock(self.settings_dict["NAME"])
+        if not lock.acquire(timeout=self.write_lock_timeout):
+            raise OperationalError("database is locked (timed out waiting for this process's write lock)")
+        self.write_lock_held = lock
+
+    def release_write_lock(self):
+        lock, self.write_lock_held = self.write_lock_held, None
+        if lock is not None:
+            lock.release()
+
+    # With transaction_mode IMMEDIATE every transaction takes SQLite's write
+    # lock at BEGIN, so this process's lock is held for the same span.
+    def _start_transaction_under_autocommit(self):
+        self.acquire_write_lock()
+        try:
+            super()._start_transaction_under_autocommit()
+        except Exception:
+            self.release_write_lock()
+            raise
+
+    def _commit(self):
+        try:
+            return super()._commit()
+        finally:
+            self.release_write_lock()
+
+    def _rollback(self):
+        try:
+            return super()._rollback()
+        finally:
+            self.release_write_lock()
+
+    def _close(self):
+        try:
+            return super()._close()
+        finally:
+            self.release_write_lock()
+
+    def serialize_autocommit_writes(self, execute, sql, params, many, context):
+        """
+        execute_wrapper holding the write lock around writes made outside a
+        transaction (Model.save(), QuerySet.update()).
+        """
+        if not self.serialize_writes or self.write_lock_held or not sql.lstrip()[:7].upper().startswith(WRITE_STATEMENTS):
+            return execute(sql, params, many, context)
+        self.acquire_write_lock()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.release_write_lock()
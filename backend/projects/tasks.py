@@ -1,49 +1,146 @@
+import logging
+
 from celery import shared_task
 from django.utils import timezone
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage
 from django.conf import settings
-from projects.models import Task
+from django.db import transaction
+from django.db.models import Prefetch, Q
+from projects.models import Contributor, Task
+from projects.utils.cache_utils import invalidate_cache_tags
+from projects.utils.counters import apply_counter_deltas, count_deltas, merge_deltas
+from projects.utils.dashboard import rebuild_dashboard_summary
+from projects.utils.send_mail import send_mass_email
+
+logger = logging.getLogger(__name__)
+
+OVERDUE_DIGEST_CHUNK_SIZE = getattr(settings, "OVERDUE_DIGEST_CHUNK_SIZE", 50)
+OVERDUE_DIGEST_MAX_RETRIES = getattr(settings, "OVERDUE_DIGEST_MAX_RETRIES", 3)
+# Tasks fetched (and their assignees prefetched) per round trip.
+OVERDUE_TASK_FETCH_SIZE = 1000
+
+
+def group_tasks_by_assignee(tasks):
+    """
+    Map each assignee's User to the list of their tasks, in task order.
+    Expects tasks with `assigned_to` (and its user) prefetched.
+    """
+    digests = {}
+    for task in tasks:
+        for contributor in task.assigned_to.all():
+            user = contributor.user
+            if user.email:
+                digests.setdefault(user, []).append(task)
+    return digests
+
+
+def build_overdue_digest(user, tasks):
+    """
+    One email listing every overdue task of a contributor.
+    """
+    lines = "\n".join(
+        f"- '{task.title}' under project '{task.project.name}' (due {task.due_date})"
+        for task in tasks
+    )
+    noun = "task is" if len(tasks) == 1 else "tasks are"
+    return EmailMessage(
+        subject=f"Overdue Task Alert: {len(tasks)} {noun} overdue",
+        body=(
+            f"Dear {user.name},\n\n"
+            f"The following {noun} overdue:\n\n"
+            f"{lines}\n\n"
+            f"Please take necessary action.\n\n"
+            f"Best regards,\nYour Task Management System"
+        ),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[user.email],
+    )
+
+
+def send_overdue_digests(tasks, connection=None):
+    """
+    Send one digest per contributor over a single connection.
+    `tasks` is a queryset; it is read in chunks so the assignee prefetch
+    stays bounded. Returns (sent, failed, failed_task_ids).
+    """
+    tasks = tasks.iterator(chunk_size=OVERDUE_TASK_FETCH_SIZE)
+    digests = group_tasks_by_assignee(tasks)
+    messages, tasks_by_message = [], {}
+    for user, user_tasks in digests.items():
+        message = build_overdue_digest(user, user_tasks)
+        messages.append(message)
+        tasks_by_message[id(message)] = [task.pk for task in user_tasks]
+
+    failed_messages = []
+    sent, failed = send_mass_email(
+        messages,
+        chunk_size=OVERDUE_DIGEST_CHUNK_SIZE,
+        max_retries=OVERDUE_DIGEST_MAX_RETRIES,
+        connection=connection,
+        failed_messages=failed_messages,
+    )
+    failed_task_ids = {pk for message in failed_messages for pk in tasks_by_message[id(message)]}
+    return sent, failed, failed_task_ids
+
 
 @shared_task
 def mark_overdue_tasks():
     """
     Periodic Celery task to mark overdue tasks and notify contributors.
-    Runs daily and marks tasks as overdue if past due_date.
+    Runs hourly; only tasks that became overdue since the last successful
+    notification are mailed, one digest per contributor.
     """
     today = timezone.now().date()
-    
-    overdue_tasks = Task.objects.filter(is_completed=False, due_date__lt=today)
-    updated_count = overdue_tasks.update(is_overdue=True)
 
-    Task.objects.filter(is_completed=True).update(is_overdue=False)
-    Task.objects.filter(due_date__gte=today).update(is_overdue=False)
+    # Only rows whose flag flips are written: the overdue stamps are set
+    # together with is_overdue, so clearing flagged rows clears them all.
+    # The predicates match task_open_due_idx and task_overdue_due_idx.
+    newly_overdue = Task.objects.filter(is_completed=False, due_date__lt=today, is_overdue=False)
+    no_longer_overdue = Task.objects.filter(Q(is_completed=True) | Q(due_date__gte=today), is_overdue=True)
+    with transaction.atomic():
+        # Count the flips per project before making them, so the project
+        # counters move by exactly the rows that change.
+        flag_deltas = count_deltas(newly_overdue, "overdue_tasks")
+        clear_deltas = count_deltas(no_longer_overdue, "overdue_tasks", sign=-1)
+        # Rows matching either transition; the predicates are disjoint on is_overdue.
+        scanned_count = sum(abs(fields["overdue_tasks"]) for deltas in (flag_deltas, clear_deltas)
+                            for fields in deltas.values())
+        overdue_deltas = merge_deltas(flag_deltas, clear_deltas)
+        updated_count = newly_overdue.update(is_overdue=True, overdue_since=today)
+        cleared_count = no_longer_overdue.update(is_overdue=False, overdue_since=None, overdue_notified_at=None)
+        apply_counter_deltas(overdue_deltas)
+    logger.info(
+        f"[mark_overdue_tasks] Scanned {scanned_count} tasks, changed {updated_count + cleared_count} "
+        f"({updated_count} flagged, {cleared_count} cleared)"
+    )
+
+    # QuerySet.update() skips signals and auto_now, so bump the tag by hand
+    # to refresh cached pages and ETags that embed `is_overdue`.
+    if updated_count or cleared_count:
+        invalidate_cache_tags("tasks")
 
-    overdue_tasks = (
-        Task.objects.filter(is_overdue=True)
-        .prefetch_related("assigned_to__user")
+    pending = (
+        Task.objects.filter(is_overdue=True, overdue_notified_at__isnull=True)
+        .prefetch_related(Prefetch("assigned_to", queryset=Contributor.objects.select_related("user")))
         .select_related("project")
+        .order_by("due_date", "id")
     )
+    sent, failed, failed_task_ids = send_overdue_digests(pending)
 
-    notified_emails = set()  
-    for task in overdue_tasks:
-        for contributor in task.assigned_to.all():
-            user = contributor.user
-            if user.email and user.email not in notified_emails:
-                send_mail(
-                    subject=f"Overdue Task Alert: {task.title}",
-                    message=(
-                        f"Dear {user.name},\n\n"
-                        f"The task '{task.title}' under project '{task.project.name}' "
-                        f"is overdue since {task.due_date}.\n"
-                        f"Please take necessary action.\n\n"
-                        f"Best regards,\nYour Task Management System"
-                    ),
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    recipient_list=[user.email],
-                    fail_silently=True,
-                )
-                notified_emails.add(user.email)
-
-    return f"{updated_count} tasks marked overdue on {today}, emails sent to {len(notified_emails)} contributors."
+    # Tasks in a failed digest stay pending and are retried next run.
+    notified_count = pending.exclude(id__in=failed_task_ids).update(overdue_notified_at=timezone.now())
+
+    return (
+        f"{updated_count} tasks newly overdue on {today}, {cleared_count} cleared "
+        f"({scanned_count} scanned), {notified_count} notified; "
+        f"digests sent to {sent} contributors ({failed} failed)."
+    )
 
 
+@shared_task
+def refresh_dashboard_summary():
+    """
+    Recompute the cached dashboard summary after a stale read.
+    """
+    entry = rebuild_dashboard_summary()
+    return f"Dashboard summary refreshed at {entry['computed_at']}."
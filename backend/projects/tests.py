@@ -1,3 +1,1139 @@
-from django.test import TestCase
+import csv
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from datetime import date, datetime, time as dt_time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.core import mail
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.db.utils import OperationalError
+from django.db.models import Q
+from django.http import HttpResponse
+from django.test import AsyncClient, RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from accounts.authentication import tokens_for_user
+from accounts.models import User
+from projects.db_router import ReplicaRouter
+from projects.middleware import PERF_N_PLUS_ONE_THRESHOLD, PerformanceMiddleware
+from projects.models import Contributor, Project, Task
+from projects.renderers import FastJSONRenderer
+from projects.sqlite_backend import base as sqlite_backend
+from projects.tasks import mark_overdue_tasks, refresh_dashboard_summary, send_overdue_digests
+from projects.views import TaskExportAPIView
+from projects.utils.cache_utils import (
+    agenerate_cache_key, generate_cache_key, get_cache_generations, get_or_compute_single_flight,
+    invalidate_cache_tags,
+)
+from projects.utils.counters import reconcile_project_counters
+from projects.utils.query_plans import plan_problems
+
+# Tests run without Redis; every cache user goes through this instead.
+LOCMEM_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'default'},
+    'token_blacklist': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'token_blacklist'},
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class APITestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_superuser('admin@example.com', 'admin', 'password')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+
+class KeysetPaginationTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        project = Project.objects.create(name='Cursor')
+        # Five distinct due dates for 23 tasks, some without one: most sort
+        # keys are shared and only `id` orders the tasks within them.
+        self.ids = [
+            Task.objects.create(
+                project=project,
+                title=f'Task {i % 3}',
+                due_date=date(2024, 1, 1) + timedelta(days=i % 5) if i % 4 else None,
+            ).id
+            for i in range(23)
+        ]
+
+    def walk(self, url):
+        """
+        Follow `next` links from `url`; returns the pages' ids and responses.
+        """
+        ids, pages = [], []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, response.data)
+            self.assertNotIn('count', response.data)
+            pages.append(response.data)
+            ids += [task['id'] for task in response.data['results']]
+            url = response.data['next']
+        return ids, pages
+
+    def test_round_trip_visits_every_row_once(self):
+        for ordering in ['', 'due_date', '-due_date', 'title', '-created_at']:
+            with self.subTest(ordering=ordering):
+                ids, pages = self.walk(f'/api/project/tasks/?cursor=&page_size=4&ordering={ordering}')
+                self.assertEqual(sorted(ids), sorted(self.ids))
+                self.assertEqual(len(pages), 6)
+                self.assertIsNone(pages[0]['previous'])
+
+                # `previous` links walk back through the same pages.
+                back, url = [], pages[-1]['previous']
+                while url:
+                    response = self.client.get(url)
+                    back = [task['id'] for task in response.data['results']] + back
+                    url = response.data['previous']
+                self.assertEqual(back + [task['id'] for task in pages[-1]['results']], ids)
+
+    def test_ties_are_ordered_by_id(self):
+        ids, _ = self.walk('/api/project/tasks/?cursor=&page_size=4&ordering=-due_date')
+        expected = sorted(
+            Task.objects.values_list('due_date', 'id'),
+            # NULLs last; ties follow the key's direction, so ids descend.
+            key=lambda row: (row[0] is None, -(row[0] or date.min).toordinal(), -row[1]),
+        )
+        self.assertEqual(ids, [pk for _, pk in expected])
+
+        ids, _ = self.walk('/api/project/tasks/?cursor=&page_size=4&ordering=title')
+        expected = sorted(Task.objects.values_list('title', 'id'))
+        self.assertEqual(ids, [pk for _, pk in expected])
+
+    def test_rows_added_between_pages_do_not_shift_the_walk(self):
+        first = self.client.get('/api/project/tasks/?cursor=&page_size=5&ordering=due_date').data
+        Task.objects.create(project_id=Task.objects.get(pk=self.ids[0]).project_id,
+                            title='Early', due_date=date(2023, 1, 1))
+        second = self.client.get(first['next']).data
+        seen = {task['id'] for task in first['results']}
+        self.assertFalse(seen & {task['id'] for task in second['results']})
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/project/tasks/?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {'error': 'Invalid cursor'})
+        # A token issued for another ordering is rejected too.
+        token = self.client.get('/api/project/tasks/?cursor=&page_size=2&ordering=title').data['next']
+        response = self.client.get(token.replace('ordering=title', 'ordering=due_date'))
+        self.assertEqual(response.data, {'error': 'Invalid cursor'})
+
+
+class SparseFieldsetTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        project = Project.objects.create(name='Shapes')
+        contributors = [
+            Contributor.objects.create(user=User.objects.create_user(f'dev{i}@example.com', f'Dev {i}', 'password'))
+            for i in range(3)
+        ]
+        for i in range(12):
+            task = Task.objects.create(project=project, title=f'Task {i}')
+            task.assigned_to.add(*contributors[:i % 3 + 1])
+
+    def test_nested_fields(self):
+        response = self.client.get('/api/project/contributors/?fields=id,user.name')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data['results'][0].keys(), {'id', 'user'})
+        self.assertEqual(response.data['results'][0]['user'].keys(), {'name'})
+
+        response = self.client.get('/api/project/tasks/?fields=title,assigned_to.user.email')
+        self.assertEqual(response.data['results'][0].keys(), {'title', 'assigned_to'})
+        self.assertEqual(response.data['results'][0]['assigned_to'][0], {'user': {'email': 'dev0@example.com'}})
+
+    def test_unknown_fields_are_rejected(self):
+        for url in [
+            '/api/project/tasks/?fields=id,bogus',
+            '/api/project/tasks/?fields=id,project_id',
+            '/api/project/contributors/?fields=id,user.bogus',
+            f'/api/project/contributors/{Contributor.objects.first().pk}/?fields=bogus',
+        ]:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('Unknown field(s)', str(response.data))
+
+    def test_query_count_does_not_grow_with_the_page(self):
+        # Validators, count, version read and its prefetch, then the misses
+        # with their prefetch, whatever the page size.
+        for page_size in (2, 6, 12):
+            with self.subTest(page_size=page_size):
+                cache.clear()
+                with self.assertNumQueries(6):
+                    response = self.client.get(
+                        f'/api/project/tasks/?page_size={page_size}&fields=id,project.name,assigned_to.user.name'
+                    )
+                self.assertEqual(len(response.data['results']), page_size)
+
+class ExportTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        project = Project.objects.create(name='Export')
+        contributors = [
+            Contributor.objects.create(user=User.objects.create_user(f'dev{i}@example.com', f'Dev {i}', 'password'))
+            for i in range(2)
+        ]
+        self.tasks = [
+            Task.objects.create(project=project, title='Wire, "panel"', due_date=date(2024, 5, 1)),
+            Task.objects.create(project=project, title='Paint', is_completed=True),
+        ]
+        self.tasks[0].assigned_to.add(*contributors)
+
+    def export(self, query):
+        response = self.client.get(f'/api/project/tasks/export/?ordering=title&{query}')
+        self.assertEqual(response.status_code, 200)
+        return response, b''.join(response.streaming_content).decode()
+
+    def test_csv_header_and_rows(self):
+        response, body = self.export('export_format=csv')
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="tasks.csv"')
+        header, *rows = csv.reader(io.StringIO(body))
+        self.assertEqual(header, TaskExportAPIView.export_fields)
+        self.assertEqual([row[1] for row in rows], ['Paint', 'Wire, "panel"'])
+        wire = dict(zip(header, rows[1]))
+        self.assertEqual(wire['due_date'], '2024-05-01')
+        self.assertEqual(wire['assigned_to'], 'dev0@example.com;dev1@example.com')
+        self.assertEqual(dict(zip(header, rows[0]))['due_date'], '')
+
+    def test_ndjson_lines(self):
+        response, body = self.export('export_format=ndjson&is_completed=false')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = body.splitlines()
+        self.assertEqual(len(lines), 1)
+        row = json.loads(lines[0])
+        self.assertEqual(row['id'], self.tasks[0].pk)
+        self.assertEqual(row['project'], 'Export')
+        self.assertEqual(row['assigned_to'], ['dev0@example.com', 'dev1@example.com'])
+
+    def test_invalid_parameters(self):
+        response = self.client.get('/api/project/tasks/export/?is_completed=maybe')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.data['error'], 'Invalid value for `is_completed`: “maybe” value must be either True or False.'
+        )
+        response = self.client.get('/api/project/tasks/export/?export_format=xml')
+        self.assertEqual(response.status_code, 400)
+
+class ContributorWorkloadTests(APITestCase):
+    url = '/api/project/contributors/workload/'
+
+    def setUp(self):
+        super().setUp()
+        self.project = Project.objects.create(name='Workload')
+        self.busy, self.idle, self.done = [
+            Contributor.objects.create(user=User.objects.create_user(f'{name}@example.com', name, 'password'))
+            for name in ('busy', 'idle', 'done')
+        ]
+        today = date.today()
+        for due_date, is_overdue in [
+            (today - timedelta(days=2), True),
+            (today + timedelta(days=3), False),
+            (today + timedelta(days=30), False),
+        ]:
+            Task.objects.create(project=self.project, title='Open', due_date=due_date,
+                                is_overdue=is_overdue).assigned_to.add(self.busy)
+        Task.objects.create(project=self.project, title='Closed', due_date=today,
+                            is_completed=True).assigned_to.add(self.busy, self.done)
+
+    def counts(self, query=''):
+        response = self.client.get(f'{self.url}?{query}')
+        self.assertEqual(response.status_code, 200, response.data)
+        return [(row['email'], row['open_tasks'], row['overdue_tasks'], row['due_this_week'])
+                for row in response.data['results']]
+
+    def test_counts(self):
+        self.assertEqual(self.counts(), [
+            ('busy@example.com', 3, 1, 1),
+            ('idle@example.com', 0, 0, 0),
+            ('done@example.com', 0, 0, 0),
+        ])
+        self.assertEqual(self.counts('search=busy'), [('busy@example.com', 3, 1, 1)])
+
+    def test_cursor_pages(self):
+        url, emails = f'{self.url}?cursor=&page_size=2&ordering=-open_tasks', []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, response.data)
+            emails += [row['email'] for row in response.data['results']]
+            url = response.data['next']
+        # Ties follow the key's direction, so the newer contributor comes first.
+        self.assertEqual(emails, ['busy@example.com', 'done@example.com', 'idle@example.com'])
+
+    def test_assignment_invalidates_the_cached_page(self):
+        first = self.client.get(self.url)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url).data, first.data)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
+
+        task = Task.objects.create(project=self.project, title='New', due_date=date.today())
+        task.assigned_to.add(self.idle)
+
+        self.assertNotEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
+        self.assertEqual(self.counts()[:2], [('busy@example.com', 3, 1, 1), ('idle@example.com', 1, 0, 1)])
+
+class AsyncViewTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        project = Project.objects.create(name='Async')
+        for i in range(3):
+            Task.objects.create(project=project, title=f'Task {i}', due_date=date(2024, 1, i + 1))
+        self.auth = {'Authorization': f'Bearer {tokens_for_user(self.user).access_token}'}
+
+    def aget(self, url, **headers):
+        return self.async_client.get(url, headers={**self.auth, **headers})
+
+    async def test_same_results_as_the_sync_view(self):
+        response = await self.aget('/api/project/async/tasks/?ordering=due_date&page_size=2')
+        self.assertEqual(response.status_code, 200)
+        sync = await sync_to_async(self.client.get)('/api/project/tasks/?ordering=due_date&page_size=2')
+        self.assertEqual(response.json()['results'], json.loads(sync.content)['results'])
+        self.assertEqual(response.json()['count'], 3)
+
+        etag = response['ETag']
+        response = await self.aget('/api/project/async/tasks/?ordering=due_date&page_size=2',
+                                   **{'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+
+    async def test_cursor_is_rejected(self):
+        for url in ['/api/project/async/tasks/?cursor=', '/api/project/async/tasks/overdue/?cursor=abc']:
+            with self.subTest(url=url):
+                response = await self.aget(url)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('Cursor pagination is not supported', response.json()['detail'])
+
+    async def test_unauthenticated_requests_are_challenged(self):
+        for headers in [{}, {'Authorization': 'Bearer not-a-token'}]:
+            with self.subTest(headers=headers):
+                response = await self.async_client.get('/api/project/async/tasks/?cursor=', headers=headers)
+                self.assertEqual(response.status_code, 401)
+                self.assertTrue(response['WWW-Authenticate'].startswith('Bearer'))
+
+class PerformanceMiddlewareTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.project = Project.objects.create(name='Timed')
+
+    @mock.patch('projects.middleware.PERF_SAMPLE_RATE', 1.0)
+    def test_server_timing_header(self):
+        response = self.client.get('/api/project/projects/')
+        self.assertEqual(response.status_code, 200)
+        self.assertRegex(
+            response['Server-Timing'],
+            r'^db;dur=\d+\.\d;desc="\d+ queries", cache;desc="\d+ hits, \d+ misses", '
+            r'(\w+;dur=\d+\.\d, )*total;dur=\d+\.\d$',
+        )
+        self.assertIn('serialize;dur=', response['Server-Timing'])
+
+    @mock.patch('projects.middleware.PERF_SAMPLE_RATE', 0)
+    def test_unsampled_requests_are_not_instrumented(self):
+        self.assertNotIn('Server-Timing', self.client.get('/api/project/projects/'))
+
+    @mock.patch('projects.middleware.PERF_SAMPLE_RATE', 1.0)
+    def test_repeated_queries_are_logged_as_n_plus_one(self):
+        def n_plus_one(request):
+            for _ in range(PERF_N_PLUS_ONE_THRESHOLD):
+                Project.objects.get(pk=self.project.pk)
+            return HttpResponse()
+
+        request = RequestFactory().get('/loop/')
+        with self.assertLogs('projects.middleware', 'WARNING') as logs:
+            response = PerformanceMiddleware(n_plus_one)(request)
+        self.assertIn(f'desc="{PERF_N_PLUS_ONE_THRESHOLD} queries"', response['Server-Timing'])
+        [warning] = logs.output
+        self.assertIn(f'Possible N+1 on GET /loop/: {PERF_N_PLUS_ONE_THRESHOLD}x SELECT', warning)
+
+        def below_threshold(request):
+            for _ in range(PERF_N_PLUS_ONE_THRESHOLD - 1):
+                Project.objects.get(pk=self.project.pk)
+            return HttpResponse()
+
+        with self.assertNoLogs('projects.middleware', 'WARNING'):
+            PerformanceMiddleware(below_threshold)(request)
+
+class SearchTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        project = Project.objects.create(name='Irrigation')
+        for title, description in [
+            ('Water pump', 'Replace the pump seal'),
+            ('Pumpkin harvest', ''),
+            ('Pump house roof', 'pump pump'),
+            ('Solar panel', 'Contact ops@example.com'),
+        ]:
+            Task.objects.create(project=project, title=title, description=description)
+
+    def titles(self, query):
+        response = self.client.get(f'/api/project/tasks/?{query}')
+        self.assertEqual(response.status_code, 200, response.data)
+        return [task['title'] for task in response.data['results']]
+
+    def test_word_prefixes_use_the_index(self):
+        self.assertEqual(set(self.titles('search=pum')), {'Water pump', 'Pumpkin harvest', 'Pump house roof'})
+        self.assertEqual(self.titles('search=solar panel'), ['Solar panel'])
+
+    def test_words_match_prefixes_only(self):
+        # Whether or not other rows match a prefix, substrings never do.
+        self.assertEqual(self.titles('search=ump'), [])
+        self.assertEqual(self.titles('search=ouse'), [])
+        self.assertEqual(self.titles('search=nothing'), [])
+        # No probe for matches before the page query.
+        with CaptureQueriesContext(connection) as queries:
+            self.titles('search=ump')
+        self.assertFalse([q['sql'] for q in queries if 'EXISTS' in q['sql'].upper()])
+
+    def test_non_words_use_icontains(self):
+        self.assertEqual(self.titles('search=ops@example'), ['Solar panel'])
+
+    def test_cursor_pages_keep_relevance_order(self):
+        ranked = self.titles('search=pump&page_size=10')
+        walked, url = [], '/api/project/tasks/?search=pump&cursor=&page_size=1'
+        while url:
+            response = self.client.get(url)
+            walked += [task['title'] for task in response.data['results']]
+            url = response.data['next']
+        self.assertEqual(walked, ranked)
+        self.assertEqual(ranked[0], 'Pump house roof')
+
+
+class TaskBulkTests(APITestCase):
+    url = '/api/project/tasks/bulk/'
+
+    def setUp(self):
+        super().setUp()
+        self.project = Project.objects.create(name='Bulk')
+        self.contributor = Contributor.objects.create(
+            user=User.objects.create_user('bulk@example.com', 'Bulk', 'password')
+        )
+
+    def test_create_reports_invalid_items_by_index(self):
+        items = [
+            {'project_id': self.project.pk, 'title': 'First', 'assigned_to_ids': [self.contributor.pk]},
+            {'project_id': 9999, 'title': 'Unknown project'},
+            {'title': ''},
+            {'project_id': self.project.pk, 'title': 'Unknown assignee', 'assigned_to_ids': [9999]},
+            {'project_id': self.project.pk, 'title': 'Second'},
+        ]
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, items, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['message'], '2 tasks created, 3 failed')
+        self.assertEqual([item['index'] for item in response.data['data']], [0, 4])
+        self.assertEqual([error['index'] for error in response.data['errors']], [1, 2, 3])
+        self.assertIn('project_id', response.data['errors'][0]['errors'])
+        self.assertIn('assigned_to_ids', response.data['errors'][2]['errors'])
+
+        first = Task.objects.get(pk=response.data['data'][0]['id'])
+        self.assertEqual(list(first.assigned_to.all()), [self.contributor])
+        self.assertEqual(sorted(Task.objects.values_list('title', flat=True)), ['First', 'Second'])
+
+    def test_update_reports_invalid_items_by_index(self):
+        task = Task.objects.create(project=self.project, title='Before')
+        items = [
+            {'id': task.pk, 'title': 'After', 'is_completed': True},
+            {'title': 'No id'},
+            {'id': 9999, 'title': 'Unknown task'},
+        ]
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(self.url, items, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data'], [{'index': 0, 'id': task.pk}])
+        self.assertEqual([error['index'] for error in response.data['errors']], [1, 2])
+        task.refresh_from_db()
+        self.assertEqual((task.title, task.is_completed), ('After', True))
+
+    def test_nothing_valid_is_a_bad_request(self):
+        response = self.client.post(self.url, [{'title': ''}], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['errors'][0]['index'], 0)
+        self.assertFalse(Task.objects.exists())
+
+        self.assertEqual(self.client.post(self.url, {}, format='json').status_code, 400)
+        self.assertEqual(self.client.post(self.url, [], format='json').status_code, 400)
+
+
+class CacheTagTests(APITestCase):
+    def request(self, **params):
+        return Request(APIRequestFactory().get('/', params))
+
+    def test_generated_keys_follow_their_tags(self):
+        request = self.request(page=2)
+        key = generate_cache_key('listing', request, ['tasks', 'projects'])
+        self.assertEqual(generate_cache_key('listing', request, ['tasks', 'projects']), key)
+        self.assertEqual(async_to_sync(agenerate_cache_key)('listing', request, ['tasks', 'projects']), key)
+        self.assertNotEqual(generate_cache_key('listing', self.request(page=3), ['tasks', 'projects']), key)
+
+        invalidate_cache_tags('contributors')
+        self.assertEqual(generate_cache_key('listing', request, ['tasks', 'projects']), key)
+        invalidate_cache_tags('tasks')
+        bumped = generate_cache_key('listing', request, ['tasks', 'projects'])
+        self.assertNotEqual(bumped, key)
+        self.assertEqual(generate_cache_key('listing', request), 'listing:0:*/*:page=2')
+
+        # An evicted counter restarts from the clock, past every old value.
+        before = get_cache_generations(['tasks'])['tasks']
+        cache.delete('generation:tasks')
+        with mock.patch('projects.utils.cache_utils.time.time', return_value=time.time() + 1):
+            self.assertGreater(get_cache_generations(['tasks'])['tasks'], before)
+        self.assertNotIn(generate_cache_key('listing', request, ['tasks', 'projects']), (key, bumped))
+
+    def test_writes_invalidate_cached_pages(self):
+        task = Task.objects.create(project=Project.objects.create(name='Tags'), title='Late',
+                                   due_date=date.today() - timedelta(days=1), is_overdue=True)
+        url = '/api/project/tasks/overdue/?fields=id,title'
+        self.assertEqual(self.client.get(url).data['results'], [{'id': task.pk, 'title': 'Late'}])
+        with self.assertNumQueries(0):
+            self.client.get(url)
+
+        task.title = 'Later'
+        task.save()
+        self.assertEqual(self.client.get(url).data['results'], [{'id': task.pk, 'title': 'Later'}])
+
+    def test_cached_pages_are_kept_per_media_type(self):
+        request = self.request(page=2)
+        request.accepted_media_type = 'application/json'
+        key = generate_cache_key('listing', request, ['tasks'])
+        request.accepted_media_type = 'application/json; indent=4'
+        self.assertNotEqual(generate_cache_key('listing', request, ['tasks']), key)
+        self.assertEqual(async_to_sync(agenerate_cache_key)('listing', request, ['tasks']),
+                         generate_cache_key('listing', request, ['tasks']))
+
+        Task.objects.create(project=Project.objects.create(name='Media'), title='Late',
+                            due_date=date.today() - timedelta(days=1), is_overdue=True)
+        url = '/api/project/tasks/overdue/'
+        etag = self.client.get(url, HTTP_ACCEPT='application/json')['ETag']
+        indented = self.client.get(url, HTTP_ACCEPT='application/json; indent=4')
+        self.assertNotEqual(indented['ETag'], etag)
+        self.assertEqual(self.client.get(url, HTTP_ACCEPT='application/json', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+@mock.patch('projects.tasks.refresh_dashboard_summary.delay')
+class DashboardTests(APITestCase):
+    url = '/api/project/dashboard/'
+
+    def setUp(self):
+        super().setUp()
+        Project.objects.create(name='First')
+
+    def summary(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_stale_reads_are_served_and_refreshed_in_the_background(self, delay):
+        self.assertEqual(self.summary()['freshness'], {'age': 0.0, 'stale': False})
+        with self.assertNumQueries(0):
+            self.assertFalse(self.summary()['freshness']['stale'])
+
+        Project.objects.create(name='Second')
+        stale = self.summary()
+        self.assertEqual((stale['projects']['total'], stale['freshness']['stale']), (1, True))
+        delay.assert_called_once_with()
+        # One refresh is queued however many stale reads arrive.
+        self.assertTrue(self.summary()['freshness']['stale'])
+        delay.assert_called_once_with()
+
+        refresh_dashboard_summary()
+        fresh = self.summary()
+        self.assertEqual((fresh['projects']['total'], fresh['freshness']['stale']), (2, False))
+
+    @mock.patch('projects.utils.dashboard.DASHBOARD_FRESH_SECONDS', -1)
+    def test_old_entries_are_stale(self, delay):
+        self.summary()
+        self.assertTrue(self.summary()['freshness']['stale'])
+        delay.assert_called_once_with()
+
+    def test_failed_queueing_releases_the_refresh(self, delay):
+        delay.side_effect = ConnectionError('broker down')
+        self.summary()
+        invalidate_cache_tags('projects')
+        self.assertTrue(self.summary()['freshness']['stale'])
+        self.assertTrue(self.summary()['freshness']['stale'])
+        self.assertEqual(delay.call_count, 2)
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class SingleFlightTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_unreachable_cache_computes_without_waiting(self):
+        # django-redis with IGNORE_EXCEPTIONS answers add() with None.
+        with mock.patch.object(cache, 'add', return_value=None):
+            started = time.monotonic()
+            result = get_or_compute_single_flight('single-flight', lambda: [1], wait=2.0)
+        self.assertEqual(result, ([1], 'db'))
+        self.assertLess(time.monotonic() - started, 1.0)
+
+    def test_held_lock_serves_stale_value(self):
+        cache.add('single-flight:lock', 1)
+        cache.set('single-flight:stale', ['old'])
+        compute = mock.Mock(return_value=['new'])
+        result = get_or_compute_single_flight('single-flight', compute, stale_key='single-flight:stale')
+        self.assertEqual(result, (['old'], 'stale'))
+        compute.assert_not_called()
+
+
+class ConditionalGetTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.project = Project.objects.create(name='Conditional')
+        self.task = Task.objects.create(project=self.project, title='Cached')
+
+    def assertNotModified(self, url, **headers):
+        self.assertEqual(self.client.get(url, **headers).status_code, 304)
+
+    def test_lists_are_validated_by_etag_only(self):
+        response = self.client.get('/api/project/tasks/')
+        self.assertNotIn('Last-Modified', response)
+        etag = response['ETag']
+        self.assertNotModified('/api/project/tasks/', HTTP_IF_NONE_MATCH=etag)
+
+        # MAX(updated_at) is unchanged by this delete; the ETag is not.
+        Task.objects.create(project=self.project, title='Removed')
+        etag = self.client.get('/api/project/tasks/')['ETag']
+        Task.objects.get(title='Removed').delete()
+        response = self.client.get('/api/project/tasks/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        # A timestamp alone never yields a 304 for a list.
+        response = self.client.get('/api/project/tasks/', HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2100 00:00:00 GMT')
+        self.assertEqual(response.status_code, 200)
+
+    def test_cursor_pages_are_validated_without_counting(self):
+        url = '/api/project/tasks/?cursor=&page_size=1'
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([q['sql'] for q in queries if 'COUNT(' in q['sql'].upper()])
+        etag = response['ETag']
+        self.assertNotModified(url, HTTP_IF_NONE_MATCH=etag)
+
+        # Rows outside the page only matter through the page's neighbours.
+        Task.objects.create(project=self.project, title='Next page')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNotNone(response.data['next'])
+        etag = response['ETag']
+        self.task.title = 'Edited'
+        self.task.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_task_detail_ignores_if_modified_since(self):
+        url = f'/api/project/tasks/{self.task.pk}/'
+        response = self.client.get(url)
+        self.assertNotIn('Last-Modified', response)
+        etag = response['ETag']
+        self.project.name = 'Renamed'
+        self.project.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['project']['name'], 'Renamed')
+
+    def test_project_detail_keeps_last_modified(self):
+        url = f'/api/project/projects/{self.project.pk}/'
+        response = self.client.get(url)
+        self.assertNotModified(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertNotModified(url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+
+class ReplicaRouterWriteTests(TestCase):
+    def instance_from(self, alias):
+        project = Project(name='Routed')
+        project._state.db = alias
+        return project
+
+    @mock.patch('projects.db_router.REPLICA_DATABASES', ['replica'])
+    def test_objects_read_from_a_replica_are_written_to_the_primary(self):
+        router = ReplicaRouter()
+        self.assertEqual(router.db_for_write(Project, instance=self.instance_from('replica')), 'default')
+        # Other aliases (e.g. a benchmark's scratch database) keep their own.
+        self.assertIsNone(router.db_for_write(Project, instance=self.instance_from('bench')))
+        self.assertIsNone(router.db_for_write(Project))
+
+
+@skipUnless(connection.vendor == 'sqlite', 'SQLite backend')
+class TunedSQLiteProfileTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'tuned.sqlite3')
+        self.tuned = settings.SQLITE_PROFILES['tuned']
+        self.holder = self.connect()
+        self.addCleanup(self.holder.close)
+        self.holder.cursor().execute('CREATE TABLE item (id INTEGER PRIMARY KEY, name TEXT)')
+
+    def connect(self, **options):
+        profile = {**self.tuned, 'NAME': self.path, 'OPTIONS': {**self.tuned['OPTIONS'], **options}}
+        settings_dict = connections.configure_settings({DEFAULT_DB_ALIAS: profile})[DEFAULT_DB_ALIAS]
+        return sqlite_backend.DatabaseWrapper(settings_dict, alias='tuned')
+
+    def insert_in_thread(self, **options):
+        """
+        INSERT from another thread's connection; returns the thread, an event
+        set once the row is written and a list collecting its error.
+        """
+        done, errors = threading.Event(), []
+
+        def insert():
+            writer = self.connect(**options)
+            try:
+                writer.cursor().execute("INSERT INTO item (name) VALUES ('other')")
+                done.set()
+            except OperationalError as e:
+                errors.append(e)
+            finally:
+                writer.close()
+
+        thread = threading.Thread(target=insert)
+        thread.start()
+        return thread, done, errors
+
+    def test_stock_profile_is_the_default(self):
+        self.assertEqual(settings.SQLITE_PROFILES['stock']['ENGINE'], 'django.db.backends.sqlite3')
+        if 'SQLITE_PROFILE' not in os.environ:
+            self.assertEqual(settings.SQLITE_PROFILE, 'stock')
+
+    def test_pragmas_are_applied_to_new_connections(self):
+        cursor = self.holder.cursor()
+        cursor.execute('PRAGMA busy_timeout')
+        self.assertEqual(cursor.fetchone()[0], 20000)
+        cursor.execute('PRAGMA journal_mode')
+        self.assertEqual(cursor.fetchone()[0], 'wal')
+
+    def test_lock_timeout_follows_busy_timeout(self):
+        self.assertEqual(self.holder.write_lock_timeout, 20)
+
+    def test_writes_wait_for_an_open_write_transaction(self):
+        holder = self.holder
+        holder._start_transaction_under_autocommit()
+        holder.cursor().execute("INSERT INTO item (name) VALUES ('first')")
+        self.assertIsNotNone(holder.write_lock_held)
+
+        thread, done, errors = self.insert_in_thread()
+        # Queued on the process lock rather than failing with "database is locked".
+        self.assertFalse(done.wait(0.3))
+        holder.commit()
+        self.assertIsNone(holder.write_lock_held)
+        thread.join(5)
+        self.assertTrue(done.is_set(), errors)
+
+        cursor = holder.cursor()
+        cursor.execute('SELECT name FROM item ORDER BY id')
+        self.assertEqual([row[0] for row in cursor.fetchall()], ['first', 'other'])
+
+    def test_waiting_writer_times_out_after_busy_timeout(self):
+        holder = self.holder
+        holder._start_transaction_under_autocommit()
+
+        thread, done, errors = self.insert_in_thread(pragmas={**self.tuned['OPTIONS']['pragmas'], 'busy_timeout': 100})
+        thread.join(5)
+        holder.rollback()
+        self.assertFalse(done.is_set())
+        self.assertIn("this process's write lock", str(errors[0]))
+
+    def test_autocommit_writes_release_the_lock(self):
+        self.holder.cursor().execute("INSERT INTO item (name) VALUES ('first')")
+        self.assertIsNone(self.holder.write_lock_held)
+        lock = sqlite_backend.get_write_lock(self.path)
+        self.assertTrue(lock.acquire(blocking=False))
+        lock.release()
+
+
+class ProjectCounterTests(TestCase):
+    def setUp(self):
+        self.alpha = Project.objects.create(name='Alpha')
+        self.beta = Project.objects.create(name='Beta')
+
+    def assertCounters(self, project, total, completed, overdue):
+        project.refresh_from_db()
+        self.assertEqual(
+            (project.total_tasks, project.completed_tasks, project.overdue_tasks), (total, completed, overdue)
+        )
+        # Incremental counts agree with a full recount.
+        self.assertEqual(reconcile_project_counters(dry_run=True), [])
+
+    def test_save_moves_counters(self):
+        task = Task.objects.create(project=self.alpha, title='One')
+        Task.objects.create(project=self.alpha, title='Two', is_completed=True)
+        self.assertCounters(self.alpha, 2, 1, 0)
+
+        task.is_completed = True
+        task.is_overdue = True
+        task.save()
+        self.assertCounters(self.alpha, 2, 2, 1)
+
+        # A hand-built instance reads its previous state back.
+        Task(pk=task.pk, project=self.alpha, title='One', created_at=task.created_at,
+             is_completed=False, is_overdue=True).save()
+        self.assertCounters(self.alpha, 2, 1, 1)
+
+    def test_reassigning_a_task_moves_it_between_projects(self):
+        task = Task.objects.create(project=self.alpha, title='Moving', is_completed=True, is_overdue=True)
+        task.project = self.beta
+        task.save()
+        self.assertCounters(self.alpha, 0, 0, 0)
+        self.assertCounters(self.beta, 1, 1, 1)
+
+    def test_delete_and_queryset_delete(self):
+        tasks = [
+            Task.objects.create(project=project, title=str(i), is_completed=i % 2 == 0, is_overdue=i % 3 == 0)
+            for i, project in enumerate([self.alpha, self.beta] * 4)
+        ]
+        tasks[0].delete()
+        self.assertCounters(self.alpha, 3, 3, 1)
+
+        Task.objects.filter(is_completed=True).delete()
+        self.assertCounters(self.alpha, 0, 0, 0)
+        self.assertCounters(self.beta, 4, 0, 1)
+
+        # Tasks deleted with their project take no counter updates.
+        self.beta.delete()
+        self.assertEqual(reconcile_project_counters(dry_run=True), [])
+
+    def test_reconcile_repairs_drift(self):
+        Task.objects.create(project=self.alpha, title='Counted', is_completed=True)
+        Project.objects.filter(pk=self.alpha.pk).update(total_tasks=5, completed_tasks=0)
+        self.assertEqual(reconcile_project_counters(), [
+            (self.alpha.pk, {'total_tasks': (5, 1), 'completed_tasks': (0, 1)}),
+        ])
+        self.assertCounters(self.alpha, 1, 1, 0)
+
+
+class FragmentCacheTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.project = Project.objects.create(name='Fragments')
+        self.contributor = Contributor.objects.create(
+            user=User.objects.create_user('old@example.com', 'Old name', 'password'), skills='python'
+        )
+        self.task = Task.objects.create(project=self.project, title='Embedded')
+        self.task.assigned_to.add(self.contributor)
+        # The async views authenticate the header themselves.
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {tokens_for_user(self.user).access_token}')
+
+    def get(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()['results']
+
+    def names(self):
+        """
+        The contributor's name as rendered by the sync and async contributor
+        and task lists.
+        """
+        return [
+            self.get(url)[0]['user']['name']
+            for url in ['/api/project/contributors/', '/api/project/async/contributors/']
+        ] + [
+            self.get(url)[0]['assigned_to'][0]['user']['name']
+            for url in ['/api/project/tasks/?expand=assigned_to', '/api/project/async/tasks/?expand=assigned_to']
+        ]
+
+    def test_warm_pages_are_served_from_the_cache(self):
+        self.names()
+        with mock.patch('projects.utils.fragment_cache.render_misses') as render_misses:
+            self.assertEqual(self.names(), ['Old name'] * 4)
+        render_misses.assert_not_called()
+
+    def test_user_rename_reaches_contributor_and_task_fragments(self):
+        self.assertEqual(self.names(), ['Old name'] * 4)
+        user = User.objects.get(pk=self.contributor.user_id)
+        user.name = 'New name'
+        user.save()
+        self.assertEqual(self.names(), ['New name'] * 4)
+
+    def test_contributor_update_reaches_task_fragments(self):
+        self.names()
+        response = self.client.put(
+            f'/api/project/contributors/{self.contributor.pk}/',
+            {'user': {'email': 'old@example.com', 'name': 'Via API'}, 'skills': 'python'}, format='json',
+        )
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(self.names(), ['Via API'] * 4)
+
+
+class FastJSONRendererTests(TestCase):
+    def test_output_matches_the_stock_renderer(self):
+        data = {
+            'aware': datetime(2024, 1, 2, 3, 4, 5, 123456, tzinfo=dt_timezone.utc),
+            'offset': datetime(2024, 1, 2, 3, 4, 5, tzinfo=dt_timezone(timedelta(hours=5, minutes=30))),
+            'naive': datetime(2024, 1, 2, 3, 4, 5, 999),
+            'date': date(2024, 1, 2),
+            'time': dt_time(3, 4, 5, 600),
+            'duration': timedelta(days=1, seconds=5),
+            'decimal': Decimal('1.50'),
+            'uuid': uuid.UUID(int=1),
+            'lazy': gettext_lazy('Token is blacklisted'),
+            'text': 'é   "quoted"',
+            'nested': [{1: None, 'tuple': (1.5, True)}],
+        }
+        expected = JSONRenderer().render(data)
+        with mock.patch('projects.renderers.json.dumps', side_effect=AssertionError('fell back')):
+            self.assertEqual(FastJSONRenderer().render(data), expected)
+        # Integers orjson rejects go through the stdlib encoder.
+        self.assertEqual(FastJSONRenderer().render({'big': 2 ** 70}), JSONRenderer().render({'big': 2 ** 70}))
+
+
+class OverdueIndexTests(TestCase):
+    def setUp(self):
+        self.project = Project.objects.create(name='Overdue')
+        today = date.today()
+        self.past, self.future = today - timedelta(days=3), today + timedelta(days=3)
+
+    def assertUsesIndex(self, queryset, index):
+        plan = queryset.explain()
+        self.assertIn(index, plan)
+        self.assertNotIn('full scan', [problem for problem, _, _ in plan_problems(connection.vendor, plan)], plan)
+
+    @skipUnless(connection.vendor == 'sqlite', 'plans checked against SQLite')
+    def test_overdue_queries_read_the_partial_indexes(self):
+        today = date.today()
+        open_due = Task.objects.filter(is_completed=False, due_date__lt=today)
+        self.assertUsesIndex(open_due.filter(is_overdue=False).order_by(), 'task_open_due_idx')
+        self.assertUsesIndex(open_due.order_by('due_date'), 'task_open_due_idx')
+        flagged = Task.objects.filter(is_overdue=True)
+        self.assertUsesIndex(flagged.filter(Q(is_completed=True) | Q(due_date__gte=today)).order_by(),
+                             'task_overdue_due_idx')
+        self.assertUsesIndex(flagged.order_by('due_date'), 'task_overdue_due_idx')
+
+    def test_mark_overdue_tasks_writes_only_flipped_rows(self):
+        stale = Task.objects.create(project=self.project, title='Stale', due_date=self.past)
+        flagged = Task.objects.create(project=self.project, title='Flagged', due_date=self.past, is_overdue=True)
+        done = Task.objects.create(project=self.project, title='Done', due_date=self.past,
+                                   is_completed=True, is_overdue=True)
+        moved = Task.objects.create(project=self.project, title='Moved', due_date=self.future, is_overdue=True)
+        Task.objects.create(project=self.project, title='Later', due_date=self.future)
+        before = dict(Task.objects.values_list('pk', 'updated_at'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            result = mark_overdue_tasks()
+
+        self.assertTrue(result.startswith(f'1 tasks newly overdue on {date.today()}, 2 cleared (3 scanned)'), result)
+        self.assertEqual(set(Task.objects.filter(is_overdue=True).values_list('pk', flat=True)),
+                         {stale.pk, flagged.pk})
+        for task in Task.objects.filter(pk__in=[done.pk, moved.pk]):
+            self.assertEqual((task.overdue_since, task.overdue_notified_at), (None, None))
+        self.assertEqual(Task.objects.get(pk=stale.pk).overdue_since, date.today())
+        # QuerySet.update() leaves updated_at alone, so it shows no row was saved.
+        self.assertEqual(dict(Task.objects.values_list('pk', 'updated_at')), before)
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.overdue_tasks, 2)
+        self.assertEqual(reconcile_project_counters(dry_run=True), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertTrue(mark_overdue_tasks().startswith(
+                f'0 tasks newly overdue on {date.today()}, 0 cleared (0 scanned)'
+            ))
+
+    def test_notified_tasks_are_not_mailed_again(self):
+        user = User.objects.create_user('dev@example.com', 'Dev', 'password')
+        task = Task.objects.create(project=self.project, title='Late', due_date=self.past)
+        task.assigned_to.add(Contributor.objects.create(user=user))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertIn('1 notified', mark_overdue_tasks())
+        self.assertEqual([message.to for message in mail.outbox], [['dev@example.com']])
+        notified_at = Task.objects.get(pk=task.pk).overdue_notified_at
+        self.assertIsNotNone(notified_at)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertIn('0 notified', mark_overdue_tasks())
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(Task.objects.get(pk=task.pk).overdue_notified_at, notified_at)
+
+        # Once it stops being overdue the stamps are cleared, so a later
+        # miss is a new notification.
+        Task.objects.filter(pk=task.pk).update(due_date=self.future)
+        with self.captureOnCommitCallbacks(execute=True):
+            mark_overdue_tasks()
+        task.refresh_from_db()
+        self.assertEqual((task.is_overdue, task.overdue_since, task.overdue_notified_at), (False, None, None))
+        Task.objects.filter(pk=task.pk).update(due_date=self.past)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertIn('1 notified', mark_overdue_tasks())
+        self.assertEqual(len(mail.outbox), 2)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+@mock.patch('projects.utils.send_mail.time.sleep')
+class OverdueDigestTests(TestCase):
+    def setUp(self):
+        project = Project.objects.create(name='Digest')
+        past = date.today() - timedelta(days=2)
+        self.contributors = [
+            Contributor.objects.create(user=User.objects.create_user(f'dev{i}@example.com', f'Dev {i}', 'password'))
+            for i in range(3)
+        ]
+        for i in range(4):
+            task = Task.objects.create(project=project, title=f'Late {i}', due_date=past, is_overdue=True)
+            task.assigned_to.add(self.contributors[i % 3])
+
+    def pending(self):
+        return (Task.objects.filter(is_overdue=True, overdue_notified_at__isnull=True)
+                .prefetch_related('assigned_to__user').select_related('project').order_by('id'))
+
+    def flaky_connection(self, failures):
+        """
+        Locmem connection whose sends to the given addresses raise, once
+        per entry in `failures`.
+        """
+        connection = mail.get_connection()
+        send_messages, failures = connection.send_messages, list(failures)
+
+        def send(messages):
+            if messages[0].to[0] in failures:
+                failures.remove(messages[0].to[0])
+                raise ConnectionError('dropped')
+            return send_messages(messages)
+        connection.send_messages = send
+        return connection
+
+    def test_one_digest_per_contributor(self, sleep):
+        self.assertEqual(send_overdue_digests(self.pending()), (3, 0, set()))
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox),
+                         ['dev0@example.com', 'dev1@example.com', 'dev2@example.com'])
+        digest = next(message for message in mail.outbox if message.to == ['dev0@example.com'])
+        self.assertEqual(digest.subject, 'Overdue Task Alert: 2 tasks are overdue')
+        self.assertIn("'Late 0'", digest.body)
+        self.assertIn("'Late 3'", digest.body)
+
+    @mock.patch('projects.tasks.OVERDUE_DIGEST_CHUNK_SIZE', 2)
+    def test_failed_chunk_resumes_without_resending(self, sleep):
+        # The second message of the first chunk fails once.
+        connection = self.flaky_connection(['dev1@example.com'])
+        self.assertEqual(send_overdue_digests(self.pending(), connection), (3, 0, set()))
+        self.assertEqual([message.to[0] for message in mail.outbox],
+                         ['dev0@example.com', 'dev1@example.com', 'dev2@example.com'])
+        sleep.assert_called_once()
+
+    @mock.patch('projects.tasks.OVERDUE_DIGEST_CHUNK_SIZE', 2)
+    def test_exhausted_retries_leave_tasks_pending(self, sleep):
+        connection = self.flaky_connection(['dev2@example.com'] * 3)
+        sent, failed, failed_task_ids = send_overdue_digests(self.pending(), connection)
+        self.assertEqual((sent, failed), (2, 1))
+        self.assertEqual(failed_task_ids, set(self.contributors[2].tasks.values_list('pk', flat=True)))
+        self.assertEqual(len(mail.outbox), 2)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ImportContributorsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        User.objects.create_user('taken@example.com', 'Taken', 'password')
+
+    def write(self, suffix, content):
+        fh = tempfile.NamedTemporaryFile('w', suffix=suffix, delete=False)
+        self.addCleanup(os.remove, fh.name)
+        with fh:
+            fh.write(content)
+        return fh.name
+
+    def run_import(self, path, *args):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        call_command('import_contributors', path, '--workers=1', *args, stdout=stdout, stderr=stderr)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_rows_are_reported_individually(self):
+        path = self.write('.csv', (
+            'name,email,password,skills\n'
+            'Ada,ada@example.com,secret,python;sql\n'
+            'Ada again,ada@example.com,secret,\n'
+            'Taken,taken@example.com,secret,\n'
+            ',not-an-email,secret,\n'
+            'Bob,bob@example.com,secret,"[""go""]"\n'
+        ))
+        stdout, stderr = self.run_import(path)
+
+        self.assertIn('Created 2 of 5 contributors', stdout)
+        self.assertIn('3 rows failed', stdout)
+        self.assertEqual(
+            [line.split(':')[0] for line in stderr.splitlines()], ['row 2', 'row 3', 'row 4']
+        )
+        self.assertIn('Duplicate of row 1.', stderr)
+        self.assertIn('User with this email already exists.', stderr)
+        ada = Contributor.objects.select_related('user').get(user__email='ada@example.com')
+        self.assertEqual((ada.user.name, ada.skills), ('Ada', ['python', 'sql']))
+        self.assertTrue(ada.user.check_password('secret'))
+        self.assertEqual(Contributor.objects.get(user__email='bob@example.com').skills, ['go'])
+
+    def test_report_file(self):
+        path = self.write('.ndjson', '\n'.join(json.dumps(row) for row in [
+            {'name': 'Cy', 'email': 'cy@example.com', 'password': 'secret'},
+            {'name': 'Cy', 'email': 'cy@EXAMPLE.com', 'password': 'secret'},
+        ]))
+        report = self.write('.json', '')
+        stdout, stderr = self.run_import(path, f'--report={report}')
+        self.assertEqual(stderr, '')
+        with open(report) as fh:
+            self.assertEqual(json.load(fh), [{'row': 2, 'errors': {'email': ['Duplicate of row 1.']}}])
+
+    def test_conflicting_batch_falls_back_to_rows(self):
+        rows = [{'name': f'Dev {i}', 'email': f'dev{i}@example.com', 'password': 'secret'} for i in range(4)]
+        path = self.write('.json', json.dumps(rows))
+
+        def hash_and_race(passwords, workers=None):
+            # Another writer takes one email between validation and insert.
+            User.objects.create_user('dev2@example.com', 'Racer', 'password')
+            return [f'hashed:{password}' for password in passwords]
+
+        with mock.patch('projects.utils.contributor_import.hash_passwords', side_effect=hash_and_race):
+            stdout, stderr = self.run_import(path, '--chunk-size=4')
+        self.assertIn('Created 3 of 4 contributors', stdout)
+        self.assertTrue(stderr.startswith('row 3: {"non_field_errors"'), stderr)
+        self.assertEqual(Contributor.objects.count(), 3)
+
+
+@skipUnless(connection.vendor == 'sqlite', 'plans checked against SQLite')
+class IndexAdvisorTests(TestCase):
+    def advise(self, *args):
+        out = io.StringIO()
+        call_command('index_advisor', *args, stdout=out, no_color=True)
+        output = out.getvalue()
+        suggestions = output.split('Suggested indexes\n', 1)[1].splitlines()
+        # (definition, example combination) per suggestion.
+        return output, list(zip(suggestions[::2], suggestions[1::2]))
+
+    def test_suggestions(self):
+        output, suggestions = self.advise()
+        self.assertIn('projects_task.projects_task_is_completed_c2fcd6b3: boolean is_completed', output)
+        self.assertIn(
+            ("  projects.Project: models.Index(fields=['status', 'name'], name='project_status_name_idx')",
+             '    serves 1 combination(s), e.g. project_list_create filter status=ACTIVE, ordering name'),
+            suggestions,
+        )
+        for definition, served in suggestions:
+            with self.subTest(definition=definition):
+                # Sorts on annotations can't come from an index.
+                self.assertNotIn('ordering progress', served)
+                # The due list only holds open tasks.
+                if 'e.g. due_task_list ' in served:
+                    self.assertIn('condition=Q(is_completed=False)', definition)
+        due_list = output.split('\ndue_task_list (', 1)[1].split('\nover_due_task_list (', 1)[0]
+        self.assertNotIn('is_completed', due_list)
+
+    def test_single_view(self):
+        output, suggestions = self.advise('--views', 'due_task_list')
+        self.assertNotIn('task_list_create', output)
+        self.assertIn(
+            ("  projects.Task: models.Index(fields=['title'], condition=Q(is_completed=False), "
+             "name='task_title_not_is_com_c440_idx')",
+             '    serves 1 combination(s), e.g. due_task_list filter -, ordering title'),
+            suggestions,
+        )
+        with self.assertRaisesMessage(CommandError, 'Unknown list view(s): nope'):
+            self.advise('--views', 'nope')
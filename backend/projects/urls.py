@@ -1,14 +1,19 @@
 from django.urls import path
-from projects import views
+from projects import async_views, views
 
 urlpatterns = [
     path('projects/', views.ProjectListCreateAPIView.as_view(), name='project_list_create'),
+    path('projects/export/', views.ProjectExportAPIView.as_view(), name='project_export'),
     path('projects/<int:pk>/', views.ProjectDetailAPIView.as_view(), name='project_detail'),
 
     path('contributors/', views.ContributorListCreateAPIView.as_view(), name='contributor_list_create'),
+    path('contributors/export/', views.ContributorExportAPIView.as_view(), name='contributor_export'),
+    path('contributors/workload/', views.ContributorWorkloadAPIView.as_view(), name='contributor_workload'),
     path('contributors/<int:pk>/', views.ContributorDetailAPIView.as_view(), name='contributor_detail'),
 
     path('tasks/', views.TaskListCreateAPIView.as_view(), name='task_list_create'),
+    path('tasks/bulk/', views.TaskBulkAPIView.as_view(), name='task_bulk'),
+    path('tasks/export/', views.TaskExportAPIView.as_view(), name='task_export'),
     path('tasks/<int:pk>/', views.TaskDetailAPIView.as_view(), name='task_detail'),
 
     path("projects/<int:project_id>/tasks/", views.ProjectTasksAPIView.as_view(), name="project_tasks"),
@@ -16,5 +21,13 @@ urlpatterns = [
     path('tasks/overdue/', views.OverDueTaskListAPIView.as_view(), name='over_due_task_list'),
     path('dashboard/', views.DashboardSummaryAPIView.as_view(), name='dashboard_summary'),
 
+    # Async read-only variants for ASGI servers
+    path('async/projects/', async_views.AsyncProjectListAPIView.as_view(), name='async_project_list'),
+    path('async/contributors/', async_views.AsyncContributorListAPIView.as_view(), name='async_contributor_list'),
+    path('async/tasks/', async_views.AsyncTaskListAPIView.as_view(), name='async_task_list'),
+    path('async/tasks/due/', async_views.AsyncDueTaskListAPIView.as_view(), name='async_due_task_list'),
+    path('async/tasks/overdue/', async_views.AsyncOverDueTaskListAPIView.as_view(), name='async_over_due_task_list'),
+    path('async/dashboard/', async_views.AsyncDashboardSummaryAPIView.as_view(), name='async_dashboard_summary'),
+
 
 ]
\ No newline at end of file
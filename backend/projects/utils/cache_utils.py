@@ -1,18 +1,100 @@
+import asyncio
+import time
+
 from django.core.cache import cache
 from django.conf import settings
 
+from projects.utils.metrics import record_cache
+
 CACHE_TTL = getattr(settings, "CACHE_TTL", 60 * 5)
 
+GENERATION_KEY_PREFIX = "generation"
+
+_MISSING = object()
+
+
+def _generation_key(tag: str):
+    return f"{GENERATION_KEY_PREFIX}:{tag}"
+
+
+def _initial_generation():
+    """
+    Seed generations from the clock so an evicted counter never restarts
+    at a value that older cache entries were written under.
+    """
+    return int(time.time() * 1000)
+
+
+def get_cache_generations(tags):
+    """
+    Return {tag: generation} for the given tags in one round trip,
+    initialising any counter that does not exist yet.
+    """
+    keys = {tag: _generation_key(tag) for tag in tags}
+    found = cache.get_many(list(keys.values()))
+    generations = {}
+    for tag, key in keys.items():
+        record_cache(key, key in found)
+        if key not in found:
+            cache.add(key, _initial_generation(), timeout=None)
+            found[key] = cache.get(key)
+        generations[tag] = found[key]
+    return generations
+
+
+async def aget_cache_generations(tags):
+    """
+    Async version of get_cache_generations().
+    """
+    keys = {tag: _generation_key(tag) for tag in tags}
+    found = await cache.aget_many(list(keys.values()))
+    generations = {}
+    for tag, key in keys.items():
+        record_cache(key, key in found)
+        if key not in found:
+            await cache.aadd(key, _initial_generation(), timeout=None)
+            found[key] = await cache.aget(key)
+        generations[tag] = found[key]
+    return generations
+
+
+def invalidate_cache_tags(*tags):
+    """
+    Invalidate every cache entry built on the given tags with one
+    atomic INCR per tag. Stale entries simply expire via their TTL.
+    """
+    for tag in tags:
+        key = _generation_key(tag)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, _initial_generation(), timeout=None)
 
-def generate_cache_key(prefix: str, request):
+
+def generate_cache_key(prefix: str, request, tags=()):
     """
     Generate a unique cache key based on query parameters.
     Ensures that different filter/search/order combos produce unique cache entries.
+    The current generation of each tag is embedded, so bumping a tag
+    orphans every key that depends on it. So is the negotiated media type:
+    cached pages carry validators computed for it.
     """
-    params = request.query_params.urlencode() or "default"
-    return f"{prefix}:{params}"
+    return _build_cache_key(prefix, request, tags, get_cache_generations(tags))
 
 
+async def agenerate_cache_key(prefix: str, request, tags=()):
+    """
+    Async version of generate_cache_key(); produces the same keys.
+    """
+    return _build_cache_key(prefix, request, tags, await aget_cache_generations(tags))
+
+
+def _build_cache_key(prefix, request, tags, generations):
+    params = request.query_params.urlencode() or "default"
+    versions = ",".join(f"{tag}.{generations[tag]}" for tag in sorted(tags)) or "0"
+    # Requests that were never negotiated (e.g. built in a shell) share "*/*".
+    media_type = (getattr(request, "accepted_media_type", None) or "*/*").replace(" ", "")
+    return f"{prefix}:{versions}:{media_type}:{params}"
 
 
 def get_cached_data(cache_key: str):
@@ -20,7 +102,9 @@ def get_cached_data(cache_key: str):
     Retrieve data from Redis cache.
     Returns None if not found or Redis is unavailable.
     """
-    return cache.get(cache_key)
+    data = cache.get(cache_key)
+    record_cache(cache_key, data is not None)
+    return data
 
 
 def set_cached_data(cache_key: str, data, timeout=CACHE_TTL):
@@ -30,10 +114,149 @@ def set_cached_data(cache_key: str, data, timeout=CACHE_TTL):
     cache.set(cache_key, data, timeout)
 
 
+def set_swr_data(cache_key: str, data, generations, timeout=CACHE_TTL):
+    """
+    Store data for stale-while-revalidate reads, stamped with when it was
+    computed and the tag generations read *before* computing it.
+    """
+    entry = {
+        "data": data,
+        "computed_at": time.time(),
+        "generations": generations,
+    }
+    cache.set(cache_key, entry, timeout)
+    return entry
+
+
+def get_swr_data(cache_key: str, tags=(), max_age=CACHE_TTL):
+    """
+    Return (data, age_seconds, is_stale) or None on a miss. An entry is
+    stale once older than max_age or once any of its tags was invalidated.
+    """
+    entry = cache.get(cache_key)
+    record_cache(cache_key, entry is not None)
+    if entry is None:
+        return None
+    age = max(0.0, time.time() - entry["computed_at"])
+    stale = age > max_age or entry["generations"] != get_cache_generations(tags)
+    return entry["data"], age, stale
+
+
+async def aget_swr_data(cache_key: str, tags=(), max_age=CACHE_TTL):
+    """
+    Async version of get_swr_data().
+    """
+    entry = await cache.aget(cache_key)
+    record_cache(cache_key, entry is not None)
+    if entry is None:
+        return None
+    age = max(0.0, time.time() - entry["computed_at"])
+    stale = age > max_age or entry["generations"] != await aget_cache_generations(tags)
+    return entry["data"], age, stale
+
+
+def claim_refresh(cache_key: str, timeout=60):
+    """
+    Atomically claim the right to refresh `cache_key`; only the first
+    caller within `timeout` seconds gets True.
+    """
+    return cache.add(f"{cache_key}:refresh", 1, timeout)
+
+
+def release_refresh(cache_key: str):
+    cache.delete(f"{cache_key}:refresh")
+
+
+def get_or_compute_single_flight(cache_key: str, compute, stale_key=None, timeout=CACHE_TTL,
+                                 stale_timeout=None, lock_timeout=30, wait=2.0, poll_interval=0.05):
+    """
+    Read-through cache with stampede protection. Returns (data, source)
+    where source is "cache", "db" or "stale".
+
+    On a miss only the caller that wins the lock runs compute(); the
+    others serve the last value under `stale_key` if there is one, or
+    poll for up to `wait` seconds before computing themselves. Falsy
+    results (e.g. an empty list) are cached like any other value. When
+    the cache is unreachable everyone computes right away.
+    """
+    data = cache.get(cache_key, _MISSING)
+    record_cache(cache_key, data is not _MISSING)
+    if data is not _MISSING:
+        return data, "cache"
+
+    lock_key = f"{cache_key}:lock"
+    locked = cache.add(lock_key, 1, lock_timeout)
+    # add() is False when the lock is held, and None when django-redis
+    # swallowed a connection error (IGNORE_EXCEPTIONS): nobody can hold
+    # the lock or fill the cache then, so waiting would only add latency.
+    if locked is None:
+        return compute(), "db"
+    if not locked:
+        if stale_key is not None:
+            data = cache.get(stale_key, _MISSING)
+            if data is not _MISSING:
+                return data, "stale"
+        deadline = time.monotonic() + wait
+        while time.monotonic() < deadline:
+            time.sleep(poll_interval)
+            data = cache.get(cache_key, _MISSING)
+            if data is not _MISSING:
+                return data, "cache"
+
+    try:
+        data = compute()
+        cache.set(cache_key, data, timeout)
+        if stale_key is not None:
+            cache.set(stale_key, data, stale_timeout or timeout * 12)
+    finally:
+        if locked:
+            cache.delete(lock_key)
+    return data, "db"
+
+
+async def aget_or_compute_single_flight(cache_key: str, compute, stale_key=None, timeout=CACHE_TTL,
+                                        stale_timeout=None, lock_timeout=30, wait=2.0, poll_interval=0.05):
+    """
+    Async version of get_or_compute_single_flight(); `compute` is a
+    coroutine function. Shares keys and locks with the sync version.
+    """
+    data = await cache.aget(cache_key, _MISSING)
+    record_cache(cache_key, data is not _MISSING)
+    if data is not _MISSING:
+        return data, "cache"
+
+    lock_key = f"{cache_key}:lock"
+    locked = await cache.aadd(lock_key, 1, lock_timeout)
+    if locked is None:
+        return await compute(), "db"
+    if not locked:
+        if stale_key is not None:
+            data = await cache.aget(stale_key, _MISSING)
+            if data is not _MISSING:
+                return data, "stale"
+        deadline = time.monotonic() + wait
+        while time.monotonic() < deadline:
+            await asyncio.sleep(poll_interval)
+            data = await cache.aget(cache_key, _MISSING)
+            if data is not _MISSING:
+                return data, "cache"
+
+    try:
+        data = await compute()
+        await cache.aset(cache_key, data, timeout)
+        if stale_key is not None:
+            await cache.aset(stale_key, data, stale_timeout or timeout * 12)
+    finally:
+        if locked:
+            await cache.adelete(lock_key)
+    return data, "db"
+
+
 def delete_cache_by_pattern(pattern: str):
     """
     Delete all cache keys matching a given pattern.
     Example: delete_cache_by_pattern("due_tasks:*")
+    Runs a KEYS scan; prefer invalidate_cache_tags() on hot paths.
     """
     keys = cache.keys(pattern)
     if keys:
@@ -41,6 +264,7 @@ def delete_cache_by_pattern(pattern: str):
 
 def clear_all_cache():
     """
-    Completely clear all Redis cache (use carefully!).
+    Completely clear all Redis cache (use carefully!). Only the default
+    alias: revoked tokens live in their own store and are never cleared.
     """
     cache.clear()
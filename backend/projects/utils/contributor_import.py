@@ -0,0 +1,115 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
+
+from accounts.models import User
+from projects.models import Contributor
+from projects.search import get_search_backend
+from projects.serializers import ContributorImportSerializer
+from projects.utils.cache_utils import invalidate_cache_tags
+
+
+def _setup_worker(settings_module):
+    """
+    Process pool initializer; needed when workers are spawned rather than forked.
+    """
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    django.setup()
+
+
+def hash_passwords(passwords, workers=None):
+    """
+    Hash passwords with the configured hasher, spread over a process pool.
+    - workers: pool size (defaults to os.cpu_count()); 1 hashes inline
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(passwords) < 2:
+        return [make_password(password) for password in passwords]
+
+    chunksize = max(1, len(passwords) // (workers * 4))
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_setup_worker,
+        initargs=(os.environ.get("DJANGO_SETTINGS_MODULE", "backend.settings"),),
+    ) as pool:
+        return list(pool.map(make_password, passwords, chunksize=chunksize))
+
+
+def validate_rows(rows):
+    """
+    Validate rows and drop duplicate emails, both within the file and
+    against existing users (one query). Returns (valid, errors) where
+    valid is a list of (row_number, validated_data).
+    """
+    valid, errors = [], []
+    seen = {}
+    for number, row in enumerate(rows, start=1):
+        serializer = ContributorImportSerializer(data=row)
+        if not serializer.is_valid():
+            errors.append({"row": number, "errors": serializer.errors})
+            continue
+        email = serializer.validated_data["email"]
+        if email in seen:
+            errors.append({"row": number, "errors": {"email": [f"Duplicate of row {seen[email]}."]}})
+            continue
+        seen[email] = number
+        valid.append((number, serializer.validated_data))
+
+    existing = set(User.objects.filter(email__in=list(seen)).values_list("email", flat=True))
+    if existing:
+        errors.extend(
+            {"row": number, "errors": {"email": ["User with this email already exists."]}}
+            for number, data in valid if data["email"] in existing
+        )
+        valid = [(number, data) for number, data in valid if data["email"] not in existing]
+    return valid, errors
+
+
+def _create_chunk(chunk):
+    users = User.objects.bulk_create(
+        User(email=data["email"], name=data["name"], password=password)
+        for _, data, password in chunk
+    )
+    contributors = Contributor.objects.bulk_create(
+        Contributor(user=user, skills=data.get("skills"), joined_on=data.get("joined_on"))
+        for user, (_, data, _) in zip(users, chunk)
+    )
+    return [contributor.pk for contributor in contributors]
+
+
+def import_contributors(rows, chunk_size=500, workers=None):
+    """
+    Create Users and Contributors from dict rows (name, email, password,
+    skills, joined_on). Passwords are hashed in parallel, rows are written
+    with bulk_create in one transaction per chunk, and a chunk that hits
+    an IntegrityError is retried row by row so only the offending rows fail.
+    Returns {"created": int, "errors": [{"row": n, "errors": {...}}]}.
+    """
+    valid, errors = validate_rows(rows)
+    hashed = hash_passwords([data["password"] for _, data in valid], workers=workers)
+    prepared = [(number, data, password) for (number, data), password in zip(valid, hashed)]
+
+    created = []
+    for start in range(0, len(prepared), chunk_size):
+        chunk = prepared[start:start + chunk_size]
+        try:
+            with transaction.atomic():
+                created.extend(_create_chunk(chunk))
+        except IntegrityError:
+            for item in chunk:
+                try:
+                    with transaction.atomic():
+                        created.extend(_create_chunk([item]))
+                except IntegrityError as e:
+                    errors.append({"row": item[0], "errors": {"non_field_errors": [str(e)]}})
+
+    if created:
+        # bulk_create skips model signals.
+        invalidate_cache_tags("contributors")
+        get_search_backend().index_objects(Contributor, created)
+
+    errors.sort(key=lambda error: error["row"])
+    return {"created": len(created), "errors": errors}
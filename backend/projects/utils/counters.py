@@ -0,0 +1,144 @@
+"""
+Project.total_tasks / completed_tasks / overdue_tasks, maintained
+incrementally: every write path works out how many tasks each project
+gains or loses and applies it with one `F()` UPDATE per distinct delta, so
+concurrent writers never overwrite each other's counts.
+
+A task's counted state is (project_id, is_completed, is_overdue); see
+Task.get_counted_state(). Drift (raw SQL, failed transactions on other
+paths) is repaired by reconcile_project_counters().
+"""
+import logging
+from collections import Counter, defaultdict
+
+from django.db.models import Case, Count, F, FloatField, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Cast, Coalesce, Round
+from django.utils import timezone
+
+from projects.models import Project, Task
+
+logger = logging.getLogger(__name__)
+
+# Counter field -> Task flag it counts (None: every task).
+COUNTER_FIELDS = {
+    'total_tasks': None,
+    'completed_tasks': 'is_completed',
+    'overdue_tasks': 'is_overdue',
+}
+
+
+def counter_deltas(changes):
+    """
+    {project_id: {counter: delta}} for an iterable of (before, after)
+    counted states, None standing for "no task" (created or deleted).
+    """
+    deltas = defaultdict(Counter)
+    for before, after in changes:
+        for state, sign in ((before, -1), (after, 1)):
+            if state is None:
+                continue
+            project_id, is_completed, is_overdue = state
+            deltas[project_id]['total_tasks'] += sign
+            deltas[project_id]['completed_tasks'] += sign * is_completed
+            deltas[project_id]['overdue_tasks'] += sign * is_overdue
+    return {
+        project_id: {field: delta for field, delta in fields.items() if delta}
+        for project_id, fields in deltas.items()
+        if any(fields.values())
+    }
+
+
+def count_deltas(queryset, field, sign=1):
+    """
+    {project_id: {field: sign * n}} for the tasks in `queryset`; used
+    before a QuerySet.update() flips their flags. Counted here rather than
+    with GROUP BY, which SQLite answers by walking the whole project_id
+    index instead of the (partial) index matching the filter.
+    """
+    counts = Counter(queryset.order_by().values_list('project_id', flat=True))
+    return {project_id: {field: sign * n} for project_id, n in counts.items()}
+
+
+def merge_deltas(*deltas):
+    merged = defaultdict(Counter)
+    for batch in deltas:
+        for project_id, fields in batch.items():
+            merged[project_id].update(fields)
+    return {
+        project_id: {field: delta for field, delta in fields.items() if delta}
+        for project_id, fields in merged.items()
+        if any(fields.values())
+    }
+
+
+def apply_counter_deltas(deltas):
+    """
+    Apply {project_id: {counter: delta}} with `F()` updates, one UPDATE per
+    distinct delta so a bulk change touching many projects stays cheap.
+    Returns the number of UPDATEs issued.
+    """
+    groups = defaultdict(list)
+    for project_id, fields in deltas.items():
+        groups[frozenset(fields.items())].append(project_id)
+
+    now = timezone.now()
+    for fields, project_ids in groups.items():
+        Project.objects.filter(pk__in=project_ids).update(
+            updated_at=now, **{field: F(field) + delta for field, delta in fields}
+        )
+    return len(groups)
+
+
+def annotate_progress(queryset):
+    """
+    Add `progress`: percent of a project's tasks completed, to one decimal,
+    0 for projects without tasks. Sortable and filterable like a column.
+    """
+    return queryset.annotate(
+        progress=Case(
+            When(total_tasks=0, then=Value(0.0)),
+            default=Round(Cast('completed_tasks', FloatField()) * 100 / F('total_tasks'), 1),
+            output_field=FloatField(),
+        )
+    )
+
+
+def actual_count(flag=None):
+    """
+    Correlated subquery counting a project's tasks (with `flag` set).
+    """
+    tasks = Task.objects.filter(project=OuterRef('pk'), **({flag: True} if flag else {}))
+    counts = tasks.order_by().values('project').annotate(n=Count('pk')).values('n')
+    return Coalesce(Subquery(counts), 0)
+
+
+def reconcile_project_counters(queryset=None, dry_run=False):
+    """
+    Recount tasks for every project in `queryset` (default: all) and
+    overwrite counters that drifted. Returns a list of
+    (project_id, {counter: (stored, actual)}) for the drifted ones.
+    """
+    queryset = Project.objects.all() if queryset is None else queryset
+    actual = {f'actual_{field}': actual_count(flag) for field, flag in COUNTER_FIELDS.items()}
+    drift = Q()
+    for field in COUNTER_FIELDS:
+        drift |= ~Q(**{field: F(f'actual_{field}')})
+
+    rows = queryset.annotate(**actual).filter(drift).order_by('pk').values('pk', *COUNTER_FIELDS, *actual)
+    report = [
+        (row['pk'], {
+            field: (row[field], row[f'actual_{field}'])
+            for field in COUNTER_FIELDS
+            if row[field] != row[f'actual_{field}']
+        })
+        for row in rows
+    ]
+
+    if report and not dry_run:
+        # Recounted inside the UPDATE so tasks written since the scan are included.
+        Project.objects.filter(pk__in=[pk for pk, _ in report]).update(
+            updated_at=timezone.now(),
+            **{field: actual_count(flag) for field, flag in COUNTER_FIELDS.items()},
+        )
+        logger.info(f"[reconcile_project_counters] Repaired counters of {len(report)} projects")
+    return report
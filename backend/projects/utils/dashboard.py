@@ -0,0 +1,114 @@
+import logging
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce
+
+from projects.models import Contributor, Project, ProjectStatus
+from projects.utils.cache_utils import (
+    aget_swr_data,
+    claim_refresh,
+    get_cache_generations,
+    get_swr_data,
+    release_refresh,
+    set_swr_data,
+)
+
+logger = logging.getLogger(__name__)
+
+DASHBOARD_CACHE_KEY = "dashboard_summary"
+DASHBOARD_CACHE_TAGS = ["tasks", "projects", "contributors"]
+# Served without a refresh while younger than this many seconds.
+DASHBOARD_FRESH_SECONDS = getattr(settings, "DASHBOARD_FRESH_SECONDS", 60)
+# Stale copies are still served (and refreshed) until this expires.
+DASHBOARD_CACHE_TTL = getattr(settings, "DASHBOARD_CACHE_TTL", 60 * 60 * 24)
+
+
+def compute_dashboard_summary():
+    """
+    Build the dashboard payload from one aggregate over projects; task
+    totals come from the denormalized counters (projects.utils.counters).
+    """
+    projects = Project.objects.aggregate(
+        total=Count("id"),
+        active=Count("id", filter=Q(status=ProjectStatus.ACTIVE)),
+        completed=Count("id", filter=Q(status=ProjectStatus.COMPLETED)),
+        on_hold=Count("id", filter=Q(status=ProjectStatus.ON_HOLD)),
+        tasks_total=Coalesce(Sum("total_tasks"), 0),
+        tasks_completed=Coalesce(Sum("completed_tasks"), 0),
+        tasks_overdue=Coalesce(Sum("overdue_tasks"), 0),
+    )
+    tasks = {
+        "total": projects.pop("tasks_total"),
+        "completed": projects.pop("tasks_completed"),
+        "overdue": projects.pop("tasks_overdue"),
+    }
+    tasks["pending"] = tasks["total"] - tasks["completed"]
+
+    recent_projects = list(
+        Project.objects
+        .values('id', 'name', 'status', 'total_tasks', 'completed_tasks', 'overdue_tasks')
+        .order_by('-created_at')[:5]
+    )
+    return {
+        "projects": projects,
+        "tasks": {
+            "total": tasks["total"],
+            "completed": tasks["completed"],
+            "pending": tasks["pending"],
+            "overdue": tasks["overdue"],
+        },
+        "contributors": {
+            "total": Contributor.objects.count(),
+        },
+        "recent_projects": recent_projects,
+    }
+
+
+def rebuild_dashboard_summary():
+    """
+    Recompute and store the dashboard summary. Returns the cache entry.
+    """
+    generations = get_cache_generations(DASHBOARD_CACHE_TAGS)
+    try:
+        return set_swr_data(
+            DASHBOARD_CACHE_KEY, compute_dashboard_summary(), generations, timeout=DASHBOARD_CACHE_TTL
+        )
+    finally:
+        release_refresh(DASHBOARD_CACHE_KEY)
+
+
+def get_dashboard_summary():
+    """
+    Stale-while-revalidate read: return (data, age_seconds, is_stale).
+    A stale hit is served as-is while a Celery task refreshes it; only a
+    cold miss computes inline.
+    """
+    cached = get_swr_data(DASHBOARD_CACHE_KEY, DASHBOARD_CACHE_TAGS, max_age=DASHBOARD_FRESH_SECONDS)
+    if cached is None:
+        entry = rebuild_dashboard_summary()
+        return entry["data"], 0.0, False
+
+    data, age, stale = cached
+    if stale and claim_refresh(DASHBOARD_CACHE_KEY):
+        from projects.tasks import refresh_dashboard_summary
+
+        try:
+            refresh_dashboard_summary.delay()
+        except Exception as e:
+            release_refresh(DASHBOARD_CACHE_KEY)
+            logger.info(f"[get_dashboard_summary] Could not queue refresh: {e}")
+    return data, age, stale
+
+
+async def aget_dashboard_summary():
+    """
+    Async version of get_dashboard_summary(). A fresh hit never leaves the
+    event loop; misses and stale hits (rare, and they may compute or queue
+    a refresh) fall back to the sync path in a thread.
+    """
+    cached = await aget_swr_data(DASHBOARD_CACHE_KEY, DASHBOARD_CACHE_TAGS, max_age=DASHBOARD_FRESH_SECONDS)
+    if cached is not None and not cached[2]:
+        return cached
+    return await sync_to_async(get_dashboard_summary)()
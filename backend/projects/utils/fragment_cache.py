@@ -0,0 +1,130 @@
+"""
+Per-object representation cache for list pages.
+
+A serializer with FragmentCacheMixin (projects.serializers) describes the
+version of each object's representation: its own `updated_at` plus that of
+the relations it embeds for the requested fields/expand shape. The page is
+read with just those columns, every object's fragment is fetched with one
+cache.get_many(), and only the misses are loaded in full and serialized.
+
+Keys embed the version, so a write makes exactly that object's fragments
+unreachable; nothing is deleted and old versions expire after
+FRAGMENT_CACHE_TTL.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist
+
+from projects.utils.metrics import record_cache
+
+FRAGMENT_CACHE_TTL = getattr(settings, "FRAGMENT_CACHE_TTL", 60 * 60)
+FRAGMENT_KEY_PREFIX = "fragment"
+
+
+def fragment_key(serializer_class, obj, fields=None, expand=None):
+    shape = (
+        sorted(fields) if fields is not None else None,
+        sorted(expand) if expand is not None else None,
+    )
+    version = serializer_class.get_fragment_version(obj, fields, expand)
+    digest = hashlib.md5(repr((shape, version)).encode()).hexdigest()
+    return f"{FRAGMENT_KEY_PREFIX}:{serializer_class.__name__}:{obj.pk}:{digest}"
+
+
+def ordering_paths(queryset):
+    """
+    Model field paths in the queryset's ordering (annotations and
+    expressions skipped), so pagination can read them without a query.
+    """
+    paths = []
+    for item in queryset.query.order_by or queryset.model._meta.ordering:
+        if not isinstance(item, str):
+            continue
+        path = item.lstrip('-')
+        model = queryset.model
+        try:
+            *relations, name = path.split('__')
+            for part in relations:
+                field = model._meta.get_field(part)
+                if not (field.many_to_one or field.one_to_one) or field.auto_created:
+                    raise FieldDoesNotExist(part)
+                model = field.related_model
+            if not model._meta.get_field(name).concrete:
+                continue
+        except FieldDoesNotExist:
+            continue
+        paths.append(path)
+    return paths
+
+
+def version_queryset(serializer_class, queryset, fields=None, expand=None):
+    """
+    `queryset` reduced to primary keys, the columns get_fragment_version()
+    reads and the ordering columns; the view's select/prefetch_related are
+    dropped since only misses are loaded in full.
+    """
+    only, prefetches = serializer_class.get_version_loading(fields, expand)
+    only = [queryset.model._meta.pk.name, *only, *ordering_paths(queryset)]
+    related = sorted({path.rsplit('__', 1)[0] for path in only if '__' in path})
+    return (
+        queryset.select_related(None).prefetch_related(None)
+        .select_related(*related).prefetch_related(*prefetches)
+        .only(*related, *only)
+    )
+
+
+def render_misses(serializer_class, objects, fields, expand):
+    data = serializer_class(objects, many=True, fields=fields, expand=expand).data
+    return {
+        obj.pk: (fragment_key(serializer_class, obj, fields, expand), item)
+        for obj, item in zip(objects, data)
+    }
+
+
+def assemble(page, keys, hits, fresh):
+    # Objects deleted since the page was read are left out.
+    results = []
+    for obj, key in zip(page, keys):
+        if key in hits:
+            results.append(hits[key])
+        elif obj.pk in fresh:
+            results.append(fresh[obj.pk][1])
+    return results
+
+
+def serialize_page(serializer_class, page, queryset, fields=None, expand=None):
+    """
+    Representations of `page` (objects from version_queryset()), in order.
+    Misses are re-read through `queryset`, so its annotations and eager
+    loading apply to them.
+    """
+    keys = [fragment_key(serializer_class, obj, fields, expand) for obj in page]
+    hits = cache.get_many(keys)
+    for key in keys:
+        record_cache(key, key in hits)
+    missing = [obj.pk for obj, key in zip(page, keys) if key not in hits]
+    fresh = {}
+    if missing:
+        objects = list(queryset.filter(pk__in=missing).order_by())
+        fresh = render_misses(serializer_class, objects, fields, expand)
+        cache.set_many(dict(fresh.values()), FRAGMENT_CACHE_TTL)
+    return assemble(page, keys, hits, fresh)
+
+
+async def aserialize_page(serializer_class, page, queryset, fields=None, expand=None):
+    """
+    Async version of serialize_page(); misses are read with async iteration.
+    """
+    keys = [fragment_key(serializer_class, obj, fields, expand) for obj in page]
+    hits = await cache.aget_many(keys)
+    for key in keys:
+        record_cache(key, key in hits)
+    missing = [obj.pk for obj, key in zip(page, keys) if key not in hits]
+    fresh = {}
+    if missing:
+        objects = [obj async for obj in queryset.filter(pk__in=missing).order_by()]
+        fresh = render_misses(serializer_class, objects, fields, expand)
+        await cache.aset_many(dict(fresh.values()), FRAGMENT_CACHE_TTL)
+    return assemble(page, keys, hits, fresh)
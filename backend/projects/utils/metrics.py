@@ -0,0 +1,104 @@
+"""
+Per-request performance counters collected by projects.middleware.
+
+A RequestMetrics object is bound to a context variable for sampled
+requests only, so the hooks below cost one ContextVar lookup otherwise.
+Context variables follow sync_to_async, so async views are covered too.
+"""
+import re
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_current = ContextVar("request_metrics", default=None)
+
+_IN_LIST_RE = re.compile(r"IN \((?:%s, )*%s\)")
+_VALUES_RE = re.compile(r"VALUES (?:\((?:%s, )*%s\), )*\((?:%s, )*%s\)")
+
+
+def sql_shape(sql):
+    """
+    Collapse variable-length IN (...) / VALUES lists so queries that differ
+    only in how many parameters they bind share a shape.
+    """
+    return _VALUES_RE.sub("VALUES (...)", _IN_LIST_RE.sub("IN (...)", sql))
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.query_count = 0
+        self.query_time = 0.0
+        self.query_shapes = Counter()
+        self.cache = defaultdict(lambda: {"hits": 0, "misses": 0})
+        self.timings = defaultdict(float)
+
+    def add_query(self, sql, duration):
+        self.query_count += 1
+        self.query_time += duration
+        self.query_shapes[sql_shape(sql)] += 1
+
+    def add_cache(self, key, hit):
+        self.cache[str(key).split(":", 1)[0]]["hits" if hit else "misses"] += 1
+
+    def repeated_queries(self, threshold):
+        return [(shape, count) for shape, count in self.query_shapes.most_common() if count >= threshold]
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+
+def start_request_metrics():
+    """
+    Bind a fresh RequestMetrics to the current context; returns (metrics, token).
+    """
+    metrics = RequestMetrics()
+    return metrics, _current.set(metrics)
+
+
+def stop_request_metrics(token):
+    _current.reset(token)
+
+
+def record_sql(execute, sql, params, many, context):
+    """
+    connection.execute_wrapper hook; installed on every connection by
+    install_sql_recorder() and a no-op outside sampled requests.
+    """
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.add_query(sql, time.perf_counter() - started)
+
+
+def install_sql_recorder(connection, **kwargs):
+    if record_sql not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_sql)
+
+
+def record_cache(key, hit):
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.add_cache(key, hit)
+
+
+@contextmanager
+def timer(name):
+    """
+    Add the time spent in the block to the request's `name` timing.
+    """
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.timings[name] += time.perf_counter() - started
@@ -0,0 +1,201 @@
+"""
+Query-plan helpers behind the `index_advisor` command: problems in an
+EXPLAIN plan per database vendor, the indexes a table actually has, which
+of them are redundant, and the index that would serve a filter + ordering.
+"""
+import hashlib
+import re
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import BooleanField, Q
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.expressions import Col
+from django.db.models.lookups import Exact
+from django.db.models.sql.where import AND
+
+# (pattern, problem) matched against each line of QuerySet.explain().
+PLAN_PROBLEMS = {
+    'sqlite': [
+        # "SCAN projects_task" without "USING INDEX": every row is read.
+        (re.compile(r'\bSCAN (?:TABLE )?(\w+)$'), 'full scan'),
+        (re.compile(r'USE TEMP B-TREE FOR (?:RIGHT PART OF |LAST TERM OF )?ORDER BY'), 'temp sort'),
+    ],
+    'postgresql': [
+        (re.compile(r'\bSeq Scan on (\w+)'), 'full scan'),
+        (re.compile(r'->\s+(?:Incremental )?Sort\b|^(?:Incremental )?Sort\b'), 'temp sort'),
+    ],
+}
+
+
+def plan_problems(vendor, plan):
+    """
+    [(problem, table or None, plan line)] for a plan from QuerySet.explain().
+    """
+    problems = []
+    for line in plan.splitlines():
+        for pattern, problem in PLAN_PROBLEMS.get(vendor, []):
+            match = pattern.search(line.strip())
+            if match:
+                problems.append((problem, match.group(1) if match.groups() else None, line.strip()))
+    return problems
+
+
+def resolve_field(model, path):
+    """
+    The model field `path` (e.g. 'project' or 'user__email') ends on and
+    whether it is a column of `model` itself.
+    """
+    *relations, name = path.split(LOOKUP_SEP)
+    for part in relations:
+        model = model._meta.get_field(part).related_model
+    return model._meta.get_field(name), not relations
+
+
+def equality_filters(queryset):
+    """
+    {field name: value} for the `field=value` conditions ANDed into
+    `queryset` on its own columns, such as a view's base filter.
+    """
+    where = queryset.query.where
+    if where.connector != AND or where.negated:
+        return {}
+    filters = {}
+    for child in where.children:
+        if (
+            isinstance(child, Exact)
+            and isinstance(child.lhs, Col)
+            and child.lhs.alias == queryset.query.get_initial_alias()
+            and not hasattr(child.rhs, 'resolve_expression')
+        ):
+            filters[child.lhs.target.name] = child.rhs
+    return filters
+
+
+def partial_conditions(model):
+    return {
+        index.name: index.condition
+        for index in [*model._meta.indexes, *model._meta.constraints]
+        if getattr(index, 'condition', None) is not None
+    }
+
+
+def table_indexes(connection, model):
+    """
+    {name: {'columns', 'unique', 'primary_key', 'condition'}} for the
+    indexes on `model`'s table; conditions of partial indexes come from the
+    model's Meta since introspection does not report them.
+    """
+    conditions = partial_conditions(model)
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, model._meta.db_table)
+    return {
+        name: {
+            'columns': info['columns'],
+            'unique': info['unique'],
+            'primary_key': info['primary_key'],
+            'condition': conditions.get(name),
+        }
+        for name, info in constraints.items()
+        if info['index'] or info['unique'] or info['primary_key']
+    }
+
+
+def redundant_indexes(connection, model):
+    """
+    [(index name, reason)] for plain indexes that another index makes
+    unnecessary, or (on SQLite) that queries built by the ORM cannot use.
+    """
+    indexes = table_indexes(connection, model)
+    boolean_columns = {
+        field.column for field in model._meta.concrete_fields if isinstance(field, BooleanField)
+    }
+    report = []
+    for name, index in sorted(indexes.items()):
+        if index['unique'] or index['primary_key'] or index['condition'] is not None:
+            continue
+        columns = index['columns']
+        for other_name, other in sorted(indexes.items()):
+            if other_name == name or other['condition'] is not None:
+                continue
+            covers = other['columns'][:len(columns)] == columns
+            # Of two identical plain indexes, the second name is reported.
+            if covers and (len(other['columns']) > len(columns) or other['unique']
+                           or other['primary_key'] or other_name < name):
+                report.append((name, f"covered by {other_name} ({', '.join(other['columns'])})"))
+                break
+        else:
+            if connection.vendor == 'sqlite' and columns[0] in boolean_columns:
+                report.append((
+                    name,
+                    f"boolean {columns[0]}: Django filters it as a bare `{columns[0]}` / "
+                    f"`NOT {columns[0]}`, which SQLite cannot seek; use a partial index instead",
+                ))
+    return report
+
+
+def suggest_index(connection, model, filters, ordering):
+    """
+    (fields, condition) of an index on `model` serving equality `filters`
+    ({field path: value}) followed by `ordering` (field paths, '-' for
+    descending), or None when nothing local can be indexed. On SQLite
+    boolean filters become the condition of a partial index. A sort that
+    starts on an annotation or a related column gets None too: no index
+    on `model` can serve it.
+    """
+    fields, condition = [], {}
+    for path, value in filters.items():
+        field, local = resolve_field(model, path)
+        if not local:
+            return None
+        if isinstance(field, BooleanField) and connection.vendor == 'sqlite':
+            condition[field.name] = value
+        else:
+            fields.append(field.name)
+    sort = []
+    for item in ordering:
+        try:
+            field, local = resolve_field(model, item.lstrip('-'))
+        except FieldDoesNotExist:
+            field, local = None, False  # an annotation
+        if not local or not field.concrete:
+            if not sort:
+                return None
+            break  # only the columns before it can come from an index
+        sort.append(f"-{field.name}" if item.startswith('-') else field.name)
+    # An index is read backwards when every column is descending.
+    if all(item.startswith('-') for item in sort):
+        sort = [item.lstrip('-') for item in sort]
+    fields += sort
+    if not fields:
+        return None
+    return tuple(fields), tuple(sorted(condition.items()))
+
+
+def index_exists(connection, model, fields, condition):
+    """
+    Whether an index with the same condition already starts with `fields`.
+    """
+    columns = [model._meta.get_field(name.lstrip('-')).column for name in fields]
+    wanted = Q(**dict(condition)) if condition else None
+    return any(
+        index['columns'][:len(columns)] == columns and index['condition'] == wanted
+        for index in table_indexes(connection, model).values()
+    )
+
+
+def index_definition(model, fields, condition):
+    """
+    A models.Index(...) line for Task.Meta.indexes and the like.
+    """
+    parts = [f"fields={list(fields)!r}"]
+    if condition:
+        parts.append(f"condition=Q({', '.join(f'{name}={value!r}' for name, value in condition)})")
+    label = '_'.join(
+        [name.lstrip('-') for name in fields]
+        + [name if value else f"not_{name}" for name, value in condition]
+    )
+    name = f"{model._meta.model_name}_{label}"
+    if len(name) > 26:
+        name = f"{name[:21]}_{hashlib.md5(name.encode()).hexdigest()[:4]}"
+    parts.append(f"name='{name}_idx'")
+    return f"models.Index({', '.join(parts)})"
@@ -1,6 +1,11 @@
-from django.core.mail import send_mail
+from django.core.mail import get_connection, send_mail
 from django.conf import settings
+from contextlib import suppress
+import logging
 import threading
+import time
+
+logger = logging.getLogger(__name__)
 
 
 def send_email(subject, message, recipient_list, from_email=None, async_send=True):
@@ -27,3 +32,47 @@ def send_email(subject, message, recipient_list, from_email=None, async_send=Tru
         threading.Thread(target=_send).start()
     else:
         _send()
+
+
+def send_mass_email(messages, chunk_size=50, max_retries=3, retry_delay=1, connection=None,
+                    failed_messages=None):
+    """
+    Send EmailMessage objects over a single reused connection.
+    - messages: list of EmailMessage
+    - chunk_size: messages sent per batch before the next retry checkpoint
+    - max_retries: attempts per chunk; a failed chunk resumes from the first unsent message
+    - connection: optional backend connection (defaults to get_connection())
+    - failed_messages: optional list that collects messages given up on
+    Returns (sent, failed) counts.
+    """
+    connection = connection or get_connection(fail_silently=False)
+    sent = failed = 0
+
+    try:
+        for start in range(0, len(messages), chunk_size):
+            chunk = messages[start:start + chunk_size]
+            position, attempt = 0, 0
+            while position < len(chunk):
+                try:
+                    connection.open()
+                    for message in chunk[position:]:
+                        connection.send_messages([message])
+                        position += 1
+                        sent += 1
+                except Exception as e:
+                    attempt += 1
+                    logger.warning(
+                        f"[send_mass_email] Chunk at {start} failed (attempt {attempt}/{max_retries}): {e}"
+                    )
+                    with suppress(Exception):
+                        connection.close()
+                    if attempt >= max_retries:
+                        failed += len(chunk) - position
+                        if failed_messages is not None:
+                            failed_messages.extend(chunk[position:])
+                        break
+                    time.sleep(retry_delay * attempt)
+    finally:
+        with suppress(Exception):
+            connection.close()
+    return sent, failed
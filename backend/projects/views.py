@@ -2,37 +2,61 @@ from django.shortcuts import get_object_or_404
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from datetime import date
-from django.db.models import Count, Q
+from datetime import date, timedelta
 from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Prefetch, Q
+from django.utils import timezone
 import logging
 from projects.utils.cache_utils import (
     generate_cache_key,
-    get_cached_data,
-    set_cached_data,
+    get_or_compute_single_flight,
+    invalidate_cache_tags,
+)
+from projects.utils.counters import annotate_progress, apply_counter_deltas, counter_deltas
+from projects.utils.dashboard import get_dashboard_summary
+from projects.utils.metrics import timer
+from projects.mixins import (
+    ConditionalGetMixin,
+    ReplicaReadMixin,
+    SearchFilterOrderingMixin,
+    SparseFieldsetViewMixin,
+    StreamingExportMixin,
 )
-from projects.mixins import SearchFilterOrderingMixin
 from projects.models import Project, Contributor, Task
-from projects.serializers import ProjectSerializer, ContributorSerializer, TaskSerializer
+from projects.search import get_search_backend
+from projects.serializers import (
+    ContributorSerializer,
+    ContributorWorkloadSerializer,
+    ProjectSerializer,
+    TaskBulkSerializer,
+    TaskSerializer,
+)
 
 logger = logging.getLogger(__name__)
 
 
 # Project CRUD
-class ProjectListCreateAPIView(APIView, SearchFilterOrderingMixin):
+class ProjectListCreateAPIView(ReplicaReadMixin, APIView, SearchFilterOrderingMixin, ConditionalGetMixin):
 
     search_fields = ['name', 'status', 'location']
     filter_fields = ['status', 'location']
-    ordering_fields = ['name', 'created_at', 'status']
+    range_filter_fields = ['progress', 'total_tasks', 'completed_tasks', 'overdue_tasks']
+    ordering_fields = ['name', 'created_at', 'status', 'progress', 'total_tasks', 'completed_tasks', 'overdue_tasks']
+    etag_tags = ['projects']
 
     def get_queryset(self):
-        return Project.objects.all()
+        return annotate_progress(Project.objects.all())
 
     def get(self, request):
         try:
             queryset = self.get_queryset()
             queryset = self.apply_search_filter_ordering(queryset, request)
-            return self.paginate(queryset, request, ProjectSerializer)
+            return self.conditional_get(
+                request,
+                self.get_list_validators(queryset),
+                lambda: self.paginate(queryset, request, ProjectSerializer),
+            )
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -51,14 +75,35 @@ class ProjectListCreateAPIView(APIView, SearchFilterOrderingMixin):
 
 
 
-class ProjectDetailAPIView(APIView):
+class ProjectExportAPIView(StreamingExportMixin, ProjectListCreateAPIView):
+    export_filename = 'projects'
+    export_fields = [
+        'id', 'name', 'description', 'location', 'status',
+        'total_tasks', 'completed_tasks', 'overdue_tasks', 'progress', 'created_at', 'updated_at',
+    ]
+
+    def get_export_row(self, project):
+        return {field: getattr(project, field) for field in self.export_fields}
+
+
+
+class ProjectDetailAPIView(APIView, SparseFieldsetViewMixin, ConditionalGetMixin):
+    etag_tags = ['projects']
+
     def get_object(self, pk):
         return get_object_or_404(Project, pk=pk)
 
     def get(self, request, pk):
-        project = self.get_object(pk)
-        serializer = ProjectSerializer(project)
-        return Response(serializer.data)
+        def build_response():
+            project = self.get_object(pk)
+            serializer = ProjectSerializer(project, **self.get_fieldset(request))
+            with timer('serialize'):
+                data = serializer.data
+            return Response(data)
+
+        return self.conditional_get(
+            request, self.get_object_validators(Project.objects.all(), pk), build_response
+        )
 
     def put(self, request, pk):
         project = self.get_object(pk)
@@ -76,20 +121,27 @@ class ProjectDetailAPIView(APIView):
 
 
 # Contributor CRUD
-class ContributorListCreateAPIView(APIView, SearchFilterOrderingMixin):
+class ContributorListCreateAPIView(ReplicaReadMixin, APIView, SearchFilterOrderingMixin, ConditionalGetMixin):
 
     search_fields = ['user__name', 'user__email']
     filter_fields = ['user__name', 'user__email']
     ordering_fields = ['user__name', 'user__email']
+    etag_tags = ['contributors']
 
     def get_queryset(self):
-        return Contributor.objects.select_related('user').all()
+        return ContributorSerializer.setup_eager_loading(
+            Contributor.objects.all(), **self.get_fieldset(self.request)
+        )
 
     def get(self, request):
         try:
             queryset = self.get_queryset()
             queryset = self.apply_search_filter_ordering(queryset, request)
-            return self.paginate(queryset, request, ContributorSerializer)
+            return self.conditional_get(
+                request,
+                self.get_list_validators(queryset),
+                lambda: self.paginate(queryset, request, ContributorSerializer),
+            )
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -108,14 +160,104 @@ class ContributorListCreateAPIView(APIView, SearchFilterOrderingMixin):
 
 
 
-class ContributorDetailAPIView(APIView):
+class ContributorExportAPIView(StreamingExportMixin, ContributorListCreateAPIView):
+    export_filename = 'contributors'
+    export_fields = ['id', 'name', 'email', 'skills', 'joined_on', 'created_at', 'updated_at']
+
+    def get_export_queryset(self):
+        return Contributor.objects.select_related('user')
+
+    def get_export_row(self, contributor):
+        return {
+            'id': contributor.id,
+            'name': contributor.user.name,
+            'email': contributor.user.email,
+            'skills': contributor.skills,
+            'joined_on': contributor.joined_on,
+            'created_at': contributor.created_at,
+            'updated_at': contributor.updated_at,
+        }
+
+
+
+# Contributor workload
+class ContributorWorkloadAPIView(ReplicaReadMixin, APIView, SearchFilterOrderingMixin, ConditionalGetMixin):
+    """
+    Open, overdue and due-this-week task counts per contributor, from one
+    grouped aggregate over the task assignments. Busiest first by default.
+    """
+    search_fields = ContributorListCreateAPIView.search_fields
+    filter_fields = ContributorListCreateAPIView.filter_fields
+    ordering_fields = ContributorListCreateAPIView.ordering_fields + ['open_tasks', 'overdue_tasks', 'due_this_week']
+    CACHE_KEY_PREFIX = "contributor_workload"
+    # Task edits, bulk writes, (un)assignments and mark_overdue_tasks all bump "tasks".
+    cache_tags = ['tasks', 'contributors']
+    etag_tags = cache_tags
+    due_soon_days = 7
+
+    def get_queryset(self):
+        today = date.today()
+        is_open = Q(tasks__is_completed=False)
+        due_soon = Q(tasks__due_date__range=(today, today + timedelta(days=self.due_soon_days - 1)))
+        return (
+            Contributor.objects.select_related('user')
+            .annotate(
+                open_tasks=Count('tasks', filter=is_open),
+                overdue_tasks=Count('tasks', filter=is_open & Q(tasks__is_overdue=True)),
+                due_this_week=Count('tasks', filter=is_open & due_soon),
+            )
+            .order_by('-open_tasks', 'id')
+        )
+
+    def get(self, request):
+        try:
+            # "Due this week" moves with the date, so each day gets its own keys.
+            prefix = f"{self.CACHE_KEY_PREFIX}:{date.today().isoformat()}"
+            cache_key = generate_cache_key(prefix, request, self.cache_tags)
+            stale_key = generate_cache_key(f"{prefix}:stale", request)
+
+            # Validators come from the page itself, like the dashboard's:
+            # a MAX/COUNT fingerprint would repeat the grouped join.
+            def compute_page():
+                queryset = self.get_queryset()
+                queryset = self.apply_search_filter_ordering(queryset, request)
+                data = self.paginate(queryset, request, ContributorWorkloadSerializer, conditional=False).data
+                return {"validators": self.build_validators(None, data), "data": data}
+
+            page, source = get_or_compute_single_flight(
+                cache_key, compute_page, stale_key=stale_key, timeout=CACHE_TTL
+            )
+            logger.info(f"[ContributorWorkloadAPIView] ******* From {source} *******")
+            return self.conditional_get(
+                request,
+                page["validators"],
+                lambda: Response(page["data"], status=status.HTTP_200_OK),
+            )
+
+        except Exception as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+
+class ContributorDetailAPIView(APIView, SparseFieldsetViewMixin, ConditionalGetMixin):
+    etag_tags = ['contributors']
+
     def get_object(self, pk):
         return get_object_or_404(Contributor, pk=pk)
 
     def get(self, request, pk):
-        contributor = self.get_object(pk)
-        serializer = ContributorSerializer(contributor)
-        return Response(serializer.data)
+        def build_response():
+            fieldset = self.get_fieldset(request)
+            queryset = ContributorSerializer.setup_eager_loading(Contributor.objects.all(), **fieldset)
+            contributor = get_object_or_404(queryset, pk=pk)
+            serializer = ContributorSerializer(contributor, **fieldset)
+            with timer('serialize'):
+                data = serializer.data
+            return Response(data)
+
+        return self.conditional_get(
+            request, self.get_object_validators(Contributor.objects.all(), pk), build_response
+        )
 
     def put(self, request, pk):
         contributor = self.get_object(pk)
@@ -133,20 +275,25 @@ class ContributorDetailAPIView(APIView):
 
 
 # Task CRUD
-class TaskListCreateAPIView(APIView, SearchFilterOrderingMixin):
+class TaskListCreateAPIView(ReplicaReadMixin, APIView, SearchFilterOrderingMixin, ConditionalGetMixin):
 
     search_fields = ['title', 'description', 'project__name']
     filter_fields = ['is_completed', 'project', 'is_overdue']
     ordering_fields = ['title', 'due_date', 'created_at']
+    etag_tags = ['tasks', 'projects', 'contributors']
 
     def get_queryset(self):
-        return Task.objects.select_related('project').prefetch_related('assigned_to').all()
+        return TaskSerializer.setup_eager_loading(Task.objects.all(), **self.get_fieldset(self.request))
 
     def get(self, request):
         try:
             queryset = self.get_queryset()
             queryset = self.apply_search_filter_ordering(queryset, request)
-            return self.paginate(queryset, request, TaskSerializer)
+            return self.conditional_get(
+                request,
+                self.get_list_validators(queryset),
+                lambda: self.paginate(queryset, request, TaskSerializer),
+            )
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -161,15 +308,192 @@ class TaskListCreateAPIView(APIView, SearchFilterOrderingMixin):
         return Response({"errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
 
 
-class TaskDetailAPIView(APIView):
+class TaskExportAPIView(StreamingExportMixin, TaskListCreateAPIView):
+    export_filename = 'tasks'
+    export_fields = [
+        'id', 'title', 'description', 'project_id', 'project', 'due_date',
+        'is_completed', 'is_overdue', 'assigned_to', 'created_at', 'updated_at',
+    ]
+
+    def get_export_queryset(self):
+        return Task.objects.select_related('project').prefetch_related(
+            Prefetch('assigned_to', queryset=Contributor.objects.select_related('user'))
+        )
+
+    def get_export_row(self, task):
+        return {
+            'id': task.id,
+            'title': task.title,
+            'description': task.description,
+            'project_id': task.project_id,
+            'project': task.project.name,
+            'due_date': task.due_date,
+            'is_completed': task.is_completed,
+            'is_overdue': task.is_overdue,
+            'assigned_to': [contributor.user.email for contributor in task.assigned_to.all()],
+            'created_at': task.created_at,
+            'updated_at': task.updated_at,
+        }
+
+
+class TaskBulkAPIView(APIView):
+    """
+    POST a list of tasks to create them, or PATCH a list of partial tasks
+    (each with an `id`) to update them. Referenced projects, contributors
+    and tasks are loaded with one IN query each; valid items are written
+    with bulk_create/bulk_update and invalid ones reported by index.
+    """
+    max_items = getattr(settings, 'TASK_BULK_MAX_ITEMS', 2000)
+    batch_size = 500
+    update_fields = ['project_id', 'title', 'description', 'due_date', 'is_completed']
+
+    def post(self, request):
+        return self.bulk_write(request, partial=False)
+
+    def patch(self, request):
+        return self.bulk_write(request, partial=True)
+
+    def bulk_write(self, request, partial):
+        items = request.data
+        if not isinstance(items, list) or not items:
+            return Response({"error": "Expected a non-empty list of tasks."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > self.max_items:
+            return Response(
+                {"error": f"At most {self.max_items} tasks per request."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        context = self.get_serializer_context(items, partial)
+        valid, errors = [], []
+        for index, item in enumerate(items):
+            serializer = TaskBulkSerializer(data=item, partial=partial, context=context)
+            if serializer.is_valid():
+                valid.append((index, serializer.validated_data))
+            else:
+                errors.append({"index": index, "errors": serializer.errors})
+
+        with transaction.atomic():
+            if partial:
+                written = self.bulk_update(valid, context['tasks'])
+            else:
+                written = self.bulk_create(valid)
+
+        if written:
+            transaction.on_commit(lambda: self.after_write([pk for _, pk in written]))
+
+        verb = "updated" if partial else "created"
+        success_status = status.HTTP_200_OK if partial else status.HTTP_201_CREATED
+        return Response(
+            {
+                "message": f"{len(written)} tasks {verb}, {len(errors)} failed",
+                "data": [{"index": index, "id": pk} for index, pk in written],
+                "errors": errors,
+            },
+            status=success_status if written else status.HTTP_400_BAD_REQUEST,
+        )
+
+    def get_serializer_context(self, items, partial):
+        project_ids = set(self.collect_ids(items, 'project_id'))
+        contributor_ids = set(self.collect_ids(items, 'assigned_to_ids', many=True))
+        context = {
+            'projects': set(Project.objects.filter(pk__in=project_ids).values_list('pk', flat=True)),
+            'contributors': set(Contributor.objects.filter(pk__in=contributor_ids).values_list('pk', flat=True)),
+        }
+        if partial:
+            context['tasks'] = Task.objects.in_bulk(set(self.collect_ids(items, 'id')))
+        return context
+
+    @staticmethod
+    def collect_ids(items, key, many=False):
+        for item in items:
+            if not isinstance(item, dict) or key not in item:
+                continue
+            values = item[key] if many and isinstance(item[key], list) else [item[key]]
+            for value in values:
+                try:
+                    yield int(value)
+                except (TypeError, ValueError):
+                    continue
+
+    def bulk_create(self, valid):
+        tasks = [
+            Task(**{k: v for k, v in data.items() if k != 'assigned_to_ids'})
+            for _, data in valid
+        ]
+        Task.objects.bulk_create(tasks, batch_size=self.batch_size)
+        apply_counter_deltas(counter_deltas((None, task.get_counted_state()) for task in tasks))
+        self.set_assignees([
+            (task.pk, data['assigned_to_ids']) for task, (_, data) in zip(tasks, valid)
+            if data.get('assigned_to_ids')
+        ], replace=False)
+        return [(index, task.pk) for task, (index, _) in zip(tasks, valid)]
+
+    def bulk_update(self, valid, existing):
+        now = timezone.now()
+        tasks, fields = {}, {'updated_at'}
+        for _, data in valid:
+            task = tasks.setdefault(data['id'], existing[data['id']])
+            for field in self.update_fields:
+                if field in data:
+                    setattr(task, field, data[field])
+                    fields.add(field)
+            task.updated_at = now
+        Task.objects.bulk_update(tasks.values(), sorted(fields), batch_size=self.batch_size)
+        # `_counted_state` is still the loaded state (Task.from_db).
+        apply_counter_deltas(counter_deltas(
+            (task._counted_state, task.get_counted_state()) for task in tasks.values()
+        ))
+        for task in tasks.values():
+            task._counted_state = task.get_counted_state()
+        self.set_assignees(
+            [(data['id'], data['assigned_to_ids']) for _, data in valid if 'assigned_to_ids' in data],
+            replace=True,
+        )
+        return [(index, data['id']) for index, data in valid]
+
+    def set_assignees(self, assignments, replace):
+        through = Task.assigned_to.through
+        if replace and assignments:
+            through.objects.filter(task_id__in={task_id for task_id, _ in assignments}).delete()
+        rows = {
+            (task_id, contributor_id)
+            for task_id, contributor_ids in assignments
+            for contributor_id in contributor_ids
+        }
+        through.objects.bulk_create(
+            [through(task_id=task_id, contributor_id=contributor_id) for task_id, contributor_id in rows],
+            batch_size=self.batch_size,
+        )
+
+    def after_write(self, task_ids):
+        """
+        bulk_create/bulk_update skip model signals, so invalidate caches and
+        re-index once for the whole batch.
+        """
+        invalidate_cache_tags('tasks')
+        get_search_backend().index_objects(Task, task_ids)
+
+
+class TaskDetailAPIView(APIView, SparseFieldsetViewMixin, ConditionalGetMixin):
+    etag_tags = ['tasks', 'projects', 'contributors']
+    # Project renames and assignments leave the task's updated_at alone.
+    use_last_modified = False
 
     def get_object(self, pk):
         return get_object_or_404(Task, pk=pk)
 
     def get(self, request, pk):
-        task = self.get_object(pk)
-        serializer = TaskSerializer(task)
-        return Response(serializer.data)
+        def build_response():
+            fieldset = self.get_fieldset(request)
+            task = get_object_or_404(TaskSerializer.setup_eager_loading(Task.objects.all(), **fieldset), pk=pk)
+            serializer = TaskSerializer(task, **fieldset)
+            with timer('serialize'):
+                data = serializer.data
+            return Response(data)
+
+        return self.conditional_get(
+            request, self.get_object_validators(Task.objects.all(), pk), build_response
+        )
 
     def put(self, request, pk):
         task = self.get_object(pk)
@@ -187,66 +511,43 @@ class TaskDetailAPIView(APIView):
 
 
 # Contributor Dashboard Summary
-class DashboardSummaryAPIView(APIView):
+class DashboardSummaryAPIView(ReplicaReadMixin, APIView, ConditionalGetMixin):
     def get(self, request):
         try:
-            total_projects = Project.objects.count()
-            active_projects = Project.objects.filter(status="ACTIVE").count()
-            completed_projects = Project.objects.filter(status="COMPLETED").count()
-            on_hold_projects = Project.objects.filter(status="ON_HOLD").count()
-
-            total_tasks = Task.objects.count()
-            completed_tasks = Task.objects.filter(is_completed=True).count()
-            overdue_tasks = Task.objects.filter(is_overdue=True).count()
-            pending_tasks = total_tasks - completed_tasks
-
-            total_contributors = Contributor.objects.count()
-
-            project_summary = list(
-                Project.objects.annotate(
-                    total_tasks=Count('tasks'),
-                    completed_tasks=Count('tasks', filter=Q(tasks__is_completed=True)),
-                    overdue_tasks=Count('tasks', filter=Q(tasks__is_overdue=True)),
-                )
-                .values('id', 'name', 'status', 'total_tasks', 'completed_tasks', 'overdue_tasks')
-                .order_by('-created_at')[:5]
+            data, age, stale = get_dashboard_summary()
+            # The summary is already in hand, so the ETag hashes it; a 304
+            # only saves the transfer. `freshness` is left out on purpose.
+            response = self.conditional_get(
+                request,
+                self.build_validators(None, data),
+                lambda: Response(
+                    {**data, "freshness": {"age": round(age, 1), "stale": stale}},
+                    status=status.HTTP_200_OK,
+                ),
             )
-            data = {
-                "projects": {
-                    "total": total_projects,
-                    "active": active_projects,
-                    "completed": completed_projects,
-                    "on_hold": on_hold_projects,
-                },
-                "tasks": {
-                    "total": total_tasks,
-                    "completed": completed_tasks,
-                    "pending": pending_tasks,
-                    "overdue": overdue_tasks,
-                },
-                "contributors": {
-                    "total": total_contributors,
-                },
-                "recent_projects": project_summary,
-            }
-
-            return Response(data, status=status.HTTP_200_OK)
+            response["Age"] = str(int(age))
+            return response
 
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
 # Get all tasks under a single project
-class ProjectTasksAPIView(APIView):
+class ProjectTasksAPIView(APIView, SparseFieldsetViewMixin):
     def get(self, request, project_id):
         project = get_object_or_404(Project, pk=project_id)
-        tasks = Task.objects.filter(project=project).order_by("-created_at")
-        serializer = TaskSerializer(tasks, many=True)
+        fieldset = self.get_fieldset(request)
+        tasks = TaskSerializer.setup_eager_loading(
+            Task.objects.filter(project=project), **fieldset
+        ).order_by("-created_at")
+        serializer = TaskSerializer(tasks, many=True, **fieldset)
+        with timer('serialize'):
+            data = serializer.data
         return Response(
             {
                 "project": project.name,
                 "count": tasks.count(),
-                "tasks": serializer.data,
+                "tasks": data,
             },
             status=status.HTTP_200_OK,
         )
@@ -254,20 +555,28 @@ class ProjectTasksAPIView(APIView):
 
 
 # Due Task Task 
-class DueTaskListAPIView(APIView, SearchFilterOrderingMixin):
+class DueTaskListAPIView(ReplicaReadMixin, APIView, SearchFilterOrderingMixin, ConditionalGetMixin):
 
     search_fields = ['title', 'description', 'project__name']
     filter_fields = ['is_completed', 'project']
     ordering_fields = ['title', 'due_date', 'created_at']
+    etag_tags = ['tasks', 'projects', 'contributors']
 
     def get_queryset(self):
-        return Task.objects.filter(is_completed=False, due_date__lte=date.today()).select_related('project').prefetch_related('assigned_to').all()
+        return TaskSerializer.setup_eager_loading(
+            Task.objects.filter(is_completed=False, due_date__lte=date.today()),
+            **self.get_fieldset(self.request),
+        )
 
     def get(self, request):
         try:
             queryset = self.get_queryset()
             queryset = self.apply_search_filter_ordering(queryset, request)
-            return self.paginate(queryset, request, TaskSerializer)
+            return self.conditional_get(
+                request,
+                self.get_list_validators(queryset),
+                lambda: self.paginate(queryset, request, TaskSerializer),
+            )
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -278,33 +587,41 @@ class DueTaskListAPIView(APIView, SearchFilterOrderingMixin):
 CACHE_TTL = getattr(settings, 'CACHE_TTL', 300)
 
 # Over Due Task List
-class OverDueTaskListAPIView(APIView, SearchFilterOrderingMixin):
+class OverDueTaskListAPIView(ReplicaReadMixin, APIView, SearchFilterOrderingMixin, ConditionalGetMixin):
     search_fields = ['title', 'description', 'project__name']
     filter_fields = ['is_completed', 'project']
     ordering_fields = ['title', 'due_date', 'created_at']
-    CACHE_KEY_PREFIX = "due_tasks"
+    CACHE_KEY_PREFIX = "overdue_tasks"
+    cache_tags = ['tasks', 'projects', 'contributors']
+    etag_tags = cache_tags
 
     def get_queryset(self):
-        return (
-            Task.objects.filter(is_overdue=True)
-            .select_related('project')
-            .prefetch_related('assigned_to')
+        return TaskSerializer.setup_eager_loading(
+            Task.objects.filter(is_overdue=True), **self.get_fieldset(self.request)
         )
+
     def get(self, request):
         try:
-            cache_key = generate_cache_key(self.CACHE_KEY_PREFIX, request)
-            cached_data = get_cached_data(cache_key)
-            if cached_data:
-                logger.info("[OverDueTaskListAPIView] ******* From cache *******")
-                return Response(cached_data, status=status.HTTP_200_OK)
-            
-            queryset = self.get_queryset()
-            queryset = self.apply_search_filter_ordering(queryset, request)
-            serializer = TaskSerializer(queryset, many=True)
-            response_data = serializer.data
-            set_cached_data(cache_key, response_data, timeout=CACHE_TTL)
-            logger.info('[OverDueTaskListAPIView] ******* From DB *******')
-            return Response(response_data, status=status.HTTP_200_OK)
+            cache_key = generate_cache_key(self.CACHE_KEY_PREFIX, request, self.cache_tags)
+            stale_key = generate_cache_key(f"{self.CACHE_KEY_PREFIX}:stale", request)
+
+            # Validators are cached with the page, so a 304 costs no queries.
+            def compute_page():
+                queryset = self.get_queryset()
+                queryset = self.apply_search_filter_ordering(queryset, request)
+                validators = self.get_list_validators(queryset)
+                data = self.paginate(queryset, request, TaskSerializer, conditional=False).data
+                return {"validators": validators or self.page_validators, "data": data}
+
+            page, source = get_or_compute_single_flight(
+                cache_key, compute_page, stale_key=stale_key, timeout=CACHE_TTL
+            )
+            logger.info(f"[OverDueTaskListAPIView] ******* From {source} *******")
+            return self.conditional_get(
+                request,
+                page["validators"],
+                lambda: Response(page["data"], status=status.HTTP_200_OK),
+            )
 
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)